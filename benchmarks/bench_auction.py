@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Load test the auction bidding engine.
+
+Seeds a league in a scratch database, nominates one driver and fires
+thousands of concurrent bids at that single lot from a thread pool, each
+thread with its own session. Reports throughput and latency, then checks
+that optimistic locking kept the lot consistent: every accepted bid beat
+the one before it and the lot holds the highest of them.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from flask import Flask
+
+# Add the project directory to Python path
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from f1_fantasy.models import db, User, League, Team, Driver, AuctionLot, AuctionBid
+from f1_fantasy.utils.auction import nominate, place_bid
+from f1_fantasy.utils.draft import DraftError, start_draft
+
+
+def make_app(database_uri):
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=database_uri, SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    if database_uri.startswith('sqlite'):
+        # Writers queue on SQLite's database lock instead of failing fast
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 60}}
+    db.init_app(app)
+    return app
+
+
+def seed_auction(n_teams, budget, lot_seconds):
+    """Create a league with ``n_teams`` teams and open one lot; returns (lot id, team ids)."""
+    users = [User(username=f'manager{i}', email=f'manager{i}@example.com', password='x',
+                  fs_uniquifier=f'bench-auction-{i}') for i in range(n_teams)]
+    db.session.add_all(users)
+    db.session.flush()
+    league = League(name='Auction Bench', owner_id=users[0].id, commissioner_id=users[0].id,
+                    draft_type='auction', max_teams=n_teams)
+    db.session.add(league)
+    db.session.flush()
+    db.session.add_all(Team(name=f'Team {i}', owner_id=user.id, league_id=league.id)
+                       for i, user in enumerate(users))
+    db.session.add_all(Driver(season=2025, driver_number=number, first_name='Driver', last_name=str(number),
+                              nationality='GBR', constructor=f'Team {number // 2}')
+                       for number in range(1, 21))
+    db.session.commit()
+
+    draft = start_draft(league, rounds=1, season=2025, seed=1, budget=budget)
+    team_ids = list(draft.pick_order)
+    driver_id = Driver.query.filter_by(season=2025).first().id
+    lot = nominate(draft, team_ids[0], driver_id, lot_seconds=lot_seconds)
+    return lot.id, team_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bids', type=int, default=5000, help='Bids to fire at the lot')
+    parser.add_argument('--threads', type=int, default=32, help='Concurrent bidders')
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--database', help='SQLAlchemy database URI (default: scratch SQLite file)')
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        app = make_app(args.database or f'sqlite:///{os.path.join(scratch, "bench.db")}')
+        with app.app_context():
+            db.create_all()
+            lot_id, team_ids = seed_auction(args.teams, budget=10 * args.bids, lot_seconds=24 * 3600)
+
+        outcomes = {'accepted': 0, 'rejected': 0}
+        latencies = []
+        lock = threading.Lock()
+        rng = random.Random(args.seed)
+
+        def bid(_):
+            # Each thread works in its own app context, and so its own session
+            with app.app_context():
+                team_id = rng.choice(team_ids)
+                high = db.session.get(AuctionLot, lot_id).high_bid
+                start = time.perf_counter()
+                try:
+                    place_bid(lot_id, team_id, high + rng.randint(1, 3))
+                    outcome = 'accepted'
+                except DraftError:
+                    outcome = 'rejected'
+                elapsed = time.perf_counter() - start
+                db.session.remove()
+            with lock:
+                outcomes[outcome] += 1
+                latencies.append(elapsed)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(bid, range(args.bids)))
+        seconds = time.perf_counter() - start
+
+        with app.app_context():
+            lot = db.session.get(AuctionLot, lot_id)
+            amounts = [amount for (amount,) in db.session.query(AuctionBid.amount)
+                       .filter_by(lot_id=lot_id).order_by(AuctionBid.id)]
+            consistent = (all(b > a for a, b in zip(amounts, amounts[1:]))
+                          and lot.high_bid == amounts[-1]
+                          and lot.bids == len(amounts) == outcomes['accepted'] + 1)
+            high_bid, version = lot.high_bid, lot.version
+
+    latencies = np.array(latencies) * 1000
+    print(f'{args.bids} bids from {args.threads} threads on one lot ({args.teams} teams)')
+    print('-' * 50)
+    print(f'Accepted:   {outcomes["accepted"]:8}   Rejected: {outcomes["rejected"]:8}')
+    print(f'Throughput: {args.bids / seconds:8.0f} bids/s ({seconds:.2f} s)')
+    print(f'Latency:    p50 {np.percentile(latencies, 50):7.1f} ms   p95 {np.percentile(latencies, 95):7.1f} ms   '
+          f'p99 {np.percentile(latencies, 99):7.1f} ms')
+    print(f'Final lot:  high bid {high_bid}, version {version}')
+    print(f'Consistent: {"yes" if consistent else "NO"}')
+    if not consistent:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Simulate draft night: many draft rooms at once, every manager picking.
+
+Seeds leagues (one user per team) with started snake drafts, then runs one
+thread per simulated manager. Managers log in, poll their room's state and
+pick the first available driver whenever their team is on the clock; a
+pick only counts once the room's state shows it, and a manager that gives
+up stops the rest of its room rather than leaving it waiting. Each
+step adds more simultaneous rooms and reports pick latency (p50/p95/p99)
+and database lock waits, so capacity is planned from numbers.
+
+By default requests go through the Flask test client in this process. Pass
+``--url`` to drive a running server (e.g. gunicorn) instead; it must use
+the same database, so export the same DATABASE_URL for both.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+from sqlalchemy import event, text
+
+# Add the project directory to Python path
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from f1_fantasy.models import db, User, League, Team, Driver, DraftPick
+from f1_fantasy.utils.draft import start_draft
+
+BENCH_SEASON = 2999  # Drivers are seeded into a season of their own
+PASSWORD = 'draft-night-benchmark'
+CSRF_TOKEN = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+MAX_ERRORS = 50  # Consecutive failed requests before a manager gives up
+
+
+def make_app(database_uri):
+    os.environ['DATABASE_URL'] = database_uri
+    from f1_fantasy.app import create_app
+    return create_app()
+
+
+class TestClientTransport:
+    """Requests through the Flask test client, in this process."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.get_data(as_text=True)
+
+    def post(self, path, data):
+        return self.client.post(path, data=data).status_code
+
+
+class HttpTransport:
+    """Requests to a running server over HTTP."""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.session = requests.Session()
+
+    def get(self, path):
+        response = self.session.get(self.url + path, allow_redirects=False)
+        return response.status_code, response.text
+
+    def post(self, path, data):
+        return self.session.post(self.url + path, data=data, allow_redirects=False).status_code
+
+
+class Manager:
+    """A simulated team owner following one draft room."""
+
+    def __init__(self, transport, email, league_id, team_id, abort):
+        self.transport = transport
+        self.email = email
+        self.league_id = league_id
+        self.team_id = team_id
+        self.abort = abort  # Shared by the room: set when a manager gives up
+        self.latencies = []
+        self.errors = 0
+        self.failures = 0
+
+    def csrf_token(self, path):
+        status, body = self.transport.get(path)
+        if status != 200:
+            raise RuntimeError(f'Could not load {path} for {self.email} (HTTP {status})')
+        match = CSRF_TOKEN.search(body)
+        return match.group(1) if match else ''
+
+    def login(self):
+        token = self.csrf_token('/auth/login')
+        status = self.transport.post('/auth/login', {'email': self.email, 'password': PASSWORD,
+                                                     'csrf_token': token})
+        if status != 302:
+            raise RuntimeError(f'Login failed for {self.email} (HTTP {status})')
+
+    def failed(self, think):
+        self.failures += 1
+        if self.failures >= MAX_ERRORS:
+            # Counted by run(), like a failed login
+            raise RuntimeError(f'{self.email} gave up after {MAX_ERRORS} failed requests in a row')
+        self.errors += 1
+        time.sleep(think)
+
+    def run(self, think):
+        try:
+            self.draft(think)
+        except RuntimeError:
+            # The rest of the room would wait on this team forever
+            self.errors += 1
+            self.abort.set()
+            raise
+
+    def roster_size(self, state):
+        return len(state['rosters'].get(str(self.team_id), []))
+
+    def draft(self, think):
+        self.login()
+        token = self.csrf_token(f'/draft/{self.league_id}')
+        pending = None  # (roster size before, latency) of a pick awaiting confirmation
+        while not self.abort.is_set():
+            status, body = self.transport.get(f'/draft/{self.league_id}/state')
+            if status != 200:
+                self.failed(think)
+                continue
+            state = json.loads(body)
+            if pending:
+                # The pick view redirects whether or not the pick was made, so check the roster
+                roster_size, latency = pending
+                pending = None
+                if self.roster_size(state) > roster_size:
+                    self.latencies.append(latency)
+                    self.failures = 0
+                else:
+                    self.failed(think)
+            if state['complete']:
+                return
+            if state['on_clock'] != self.team_id:
+                time.sleep(think)
+                continue
+            start = time.perf_counter()
+            status = self.transport.post(f'/draft/{self.league_id}/pick',
+                                         {'driver_id': state['available'][0], 'csrf_token': token})
+            if status != 302:
+                self.failed(think)
+            else:
+                pending = (self.roster_size(state), time.perf_counter() - start)
+
+class LockWaits:
+    """Times write statements in this process; slow ones were waiting on a lock."""
+
+    def __init__(self, engine, threshold):
+        self.threshold = threshold
+        self.times = []
+        self._lock = threading.Lock()
+        event.listen(engine, 'before_cursor_execute', self.before)
+        event.listen(engine, 'after_cursor_execute', self.after)
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['bench_started'] = time.perf_counter()
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip()[:6].upper() in ('INSERT', 'UPDATE', 'DELETE'):
+            elapsed = time.perf_counter() - conn.info.pop('bench_started', time.perf_counter())
+            with self._lock:
+                self.times.append(elapsed)
+
+    def take(self):
+        with self._lock:
+            times, self.times = self.times, []
+        waits = [t for t in times if t >= self.threshold]
+        return len(waits), sum(waits)
+
+
+class PgLockSampler(threading.Thread):
+    """Samples ungranted PostgreSQL locks, which includes those held by a remote server."""
+
+    def __init__(self, app, interval=0.05):
+        super().__init__(daemon=True)
+        self.app = app
+        self.interval = interval
+        self.samples = []
+        self.running = True
+
+    def run(self):
+        with self.app.app_context():
+            while self.running:
+                self.samples.append(db.session.execute(
+                    text('SELECT count(*) FROM pg_locks WHERE NOT granted')).scalar())
+                db.session.rollback()
+                time.sleep(self.interval)
+
+    def stop(self):
+        self.running = False
+        self.join()
+        return max(self.samples, default=0)
+
+
+def seed_leagues(run, step, n_leagues, n_teams, rounds, password_hash):
+    """Create leagues whose drafts have started; returns [(league id, [(email, team id)])]."""
+    needed = n_teams * rounds
+    existing = Driver.query.filter_by(season=BENCH_SEASON).count()
+    db.session.add_all(Driver(season=BENCH_SEASON, driver_number=number, first_name='Driver',
+                              last_name=str(number), nationality='GBR', constructor=f'Team {number // 2}')
+                       for number in range(existing + 1, needed + 1))
+
+    leagues = []
+    for index in range(n_leagues):
+        names = [f'bench{run}_{step}_{index}_{i}' for i in range(n_teams)]
+        users = [User(username=name, email=f'{name}@example.com', password=password_hash, active=True,
+                      fs_uniquifier=name) for name in names]
+        db.session.add_all(users)
+        db.session.flush()
+        league = League(name=f'Draft Night {step}.{index}', owner_id=users[0].id, commissioner_id=users[0].id,
+                        max_teams=n_teams, draft_type='snake')
+        db.session.add(league)
+        db.session.flush()
+        teams = [Team(name=f'Team {i}', owner_id=user.id, league_id=league.id) for i, user in enumerate(users)]
+        db.session.add_all(teams)
+        db.session.commit()
+        start_draft(league, rounds=rounds, season=BENCH_SEASON)
+        leagues.append((league.id, [(user.email, team.id) for user, team in zip(users, teams)]))
+    return leagues
+
+
+def run_step(app, url, leagues, think):
+    managers = []
+    for league_id, owners in leagues:
+        abort = threading.Event()
+        for email, team_id in owners:
+            transport = HttpTransport(url) if url else TestClientTransport(app)
+            managers.append(Manager(transport, email, league_id, team_id, abort))
+
+    threads = [threading.Thread(target=manager.run, args=(think,)) for manager in managers]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    latencies = np.array([latency for manager in managers for latency in manager.latencies]) * 1000
+    return {
+        'managers': len(managers),
+        'picks': len(latencies),
+        'errors': sum(manager.errors for manager in managers),
+        'seconds': seconds,
+        'p50': np.percentile(latencies, 50) if len(latencies) else 0.0,
+        'p95': np.percentile(latencies, 95) if len(latencies) else 0.0,
+        'p99': np.percentile(latencies, 99) if len(latencies) else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rooms', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Simultaneous draft rooms per step')
+    parser.add_argument('--teams', type=int, default=10, help='Teams (managers) per room')
+    parser.add_argument('--rounds', type=int, default=2, help='Drivers drafted per team')
+    parser.add_argument('--think', type=float, default=0.05, help='Seconds between state polls')
+    parser.add_argument('--url', help='Base URL of a running server (default: Flask test client)')
+    parser.add_argument('--database', help='SQLAlchemy database URI (default: DATABASE_URL or a scratch SQLite file)')
+    parser.add_argument('--lock-threshold', type=float, default=10.0,
+                        help='Milliseconds after which a write counts as a lock wait')
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    database = args.database or os.getenv('DATABASE_URL') or f'sqlite:///{os.path.join(scratch, "bench.db")}'
+    app = make_app(database)
+    postgres = database.startswith('postgres')
+
+    with app.app_context():
+        from flask_security.utils import hash_password
+        password_hash = hash_password(PASSWORD)
+        lock_waits = LockWaits(db.engine, args.lock_threshold / 1000)
+
+    mode = args.url or 'Flask test client'
+    print(f'Draft night: {args.teams} teams x {args.rounds} rounds per room via {mode}')
+    print(f'{"Rooms":>5} {"Managers":>8} {"Picks":>6} {"Errors":>6} {"Picks/s":>8} '
+          f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"Lock waits":>10} {"Waited s":>9}'
+          + (f' {"Max blocked":>11}' if postgres else ''))
+    print('-' * (88 + (12 if postgres else 0)))
+
+    run = int(time.time())  # Keeps seeded users unique when re-running against the same --database
+    for step, rooms in enumerate(args.rooms):
+        with app.app_context():
+            leagues = seed_leagues(run, step, rooms, args.teams, args.rounds, password_hash)
+            lock_waits.take()
+        sampler = PgLockSampler(app) if postgres else None
+        if sampler:
+            sampler.start()
+
+        stats = run_step(app, args.url, leagues, args.think)
+        blocked = sampler.stop() if sampler else None
+        waits, waited = lock_waits.take()
+
+        with app.app_context():
+            expected = rooms * args.teams * args.rounds
+            drafted = DraftPick.query.filter(
+                DraftPick.draft_id.in_([League.query.get(league_id).draft.id for league_id, _ in leagues])).count()
+        if drafted != expected:
+            print(f'  warning: {drafted} of {expected} picks were recorded')
+
+        print(f'{rooms:5} {stats["managers"]:8} {stats["picks"]:6} {stats["errors"]:6} '
+              f'{stats["picks"] / stats["seconds"]:8.1f} {stats["p50"]:8.1f} {stats["p95"]:8.1f} '
+              f'{stats["p99"]:8.1f} {waits:10} {waited:9.2f}'
+              + (f' {blocked:11}' if postgres else ''))
+
+    if args.url:
+        print('Lock waits are only seen in this process; use PostgreSQL for server-side blocked locks.')
+
+
+if __name__ == '__main__':
+    main()
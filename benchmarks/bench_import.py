@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark the F1 data import path end to end without network access.
+
+Replays fixtures recorded with ``flask record-f1-fixtures`` (or, by default,
+synthetic fixtures in the same format) through F1DataManager into a scratch
+database, timing ``import_season_data`` and the race results ingestion.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+# Add the project directory to Python path
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from f1_fantasy.models import db, Race, Driver, RaceResult
+from f1_fantasy.utils.data_sources import ReplaySource
+from f1_fantasy.utils.jolpica_api import F1DataManager, import_race_results, peak_memory_mb
+
+
+def write_synthetic_fixtures(root, seasons, n_rounds, n_drivers, seed):
+    """Record schedules, drivers and results shaped like FastF1's frames."""
+    rng = np.random.default_rng(seed)
+    replay = ReplaySource(root)
+    numbers = np.arange(1, n_drivers + 1)
+    drivers = pd.DataFrame({
+        'DriverNumber': numbers.astype(str),
+        'Abbreviation': [f'D{number:02d}' for number in numbers],
+        'FirstName': [f'First{number}' for number in numbers],
+        'LastName': [f'Last{number}' for number in numbers],
+        'CountryCode': 'GBR',
+        'TeamName': [f'Team {(number - 1) // 2}' for number in numbers],
+    })
+    for season in seasons:
+        dates = pd.date_range(f'{season}-03-01', periods=n_rounds, freq='7D')
+        replay.write_frame(season, 'schedule', pd.DataFrame({
+            'RoundNumber': np.arange(1, n_rounds + 1),
+            'EventName': [f'Grand Prix {r}' for r in range(1, n_rounds + 1)],
+            'Country': 'Country',
+            'Location': [f'City {r}' for r in range(1, n_rounds + 1)],
+            'EventDate': dates,
+            'Session5DateUtc': dates + pd.Timedelta(hours=14),
+        }))
+        replay.write_frame(season, 'drivers', drivers)
+        for round in range(1, n_rounds + 1):
+            order = rng.permutation(n_drivers)
+            classified = [str(position + 1) for position in range(n_drivers)]
+            classified[-1] = 'R'
+            results = drivers.iloc[order].assign(
+                GridPosition=rng.permutation(n_drivers) + 1.0,
+                ClassifiedPosition=classified,
+                Status=['Finished'] * (n_drivers - 1) + ['Retired'],
+            )
+            replay.write_frame(season, f'results_{round}', results)
+            replay.write_fastest_laps(season, round, {int(numbers[order[0]])})
+
+
+def make_app(database_uri):
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=database_uri, SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+    return app
+
+
+def run_import(fixtures, seasons):
+    """Import seasons then their results once; return (season secs, results secs)."""
+    manager = F1DataManager(source=ReplaySource(fixtures))
+    start = time.perf_counter()
+    for season in seasons:
+        manager.import_season_data(season)
+    season_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for season in seasons:
+        import_race_results(season=season, replay_dir=fixtures)
+    results_seconds = time.perf_counter() - start
+    return season_seconds, results_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixtures', help='Directory recorded with record-f1-fixtures (default: synthetic)')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2023, 2024, 2025])
+    parser.add_argument('--rounds', type=int, default=24, help='Rounds per synthetic season')
+    parser.add_argument('--drivers', type=int, default=20, help='Drivers per synthetic season')
+    parser.add_argument('--database', help='SQLAlchemy database URI (default: scratch SQLite file)')
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        fixtures = args.fixtures
+        if not fixtures:
+            fixtures = os.path.join(scratch, 'fixtures')
+            write_synthetic_fixtures(fixtures, args.seasons, args.rounds, args.drivers, args.seed)
+
+        app = make_app(args.database or f'sqlite:///{os.path.join(scratch, "bench.db")}')
+        with app.app_context():
+            db.create_all()
+            runs = [run_import(fixtures, args.seasons) for _ in range(2)]
+            counts = (Race.query.count(), Driver.query.count(), RaceResult.query.count())
+
+    races, drivers, results = counts
+    print(f'Imported {len(args.seasons)} seasons: {races} races, {drivers} drivers, {results} results')
+    print('-' * 50)
+    for label, (season_seconds, results_seconds) in zip(('First import', 'Re-import'), runs):
+        print(f'{label:13} seasons {season_seconds:7.3f} s   results {results_seconds:7.3f} s '
+              f'({results / results_seconds:,.0f} rows/s)')
+    print(f'Peak memory:  {peak_memory_mb():.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
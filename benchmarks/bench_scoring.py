@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call vs batched scoring of race results.
+
+Scores every driver for every league after a race, first one position at a
+time through League.get_points_for_position, then as a single batched
+lookup through the scoring engine.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project directory to Python path
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from f1_fantasy.models import League
+from f1_fantasy.utils.scoring import POINT_SYSTEMS, DNF, DNS, DSQ, score_batch
+
+STATUS_NAMES = {DNF: 'DNF', DNS: 'DNS', DSQ: 'DSQ'}
+
+
+def make_results(n_leagues, n_drivers, seed):
+    """Build random result codes with ~10% non-finishers per league."""
+    rng = np.random.default_rng(seed)
+    codes = np.argsort(rng.random((n_leagues, n_drivers)), axis=1).astype(np.int16) + 1
+    non_finishers = rng.random((n_leagues, n_drivers)) < 0.1
+    codes[non_finishers] = rng.choice([DNF, DNS, DSQ], size=int(non_finishers.sum()))
+    systems = rng.integers(0, len(POINT_SYSTEMS), size=n_leagues)
+    return systems, codes
+
+
+def bench_per_call(systems, codes):
+    leagues = [League(point_system=POINT_SYSTEMS[s]) for s in systems]
+    # Mirror what callers pass today: ints for finishers, strings for statuses
+    results = [[STATUS_NAMES.get(int(c), int(c)) for c in row] for row in codes]
+    start = time.perf_counter()
+    totals = np.array([[league.get_points_for_position(p) for p in row]
+                       for league, row in zip(leagues, results)])
+    return time.perf_counter() - start, totals
+
+
+def bench_batched(systems, codes):
+    start = time.perf_counter()
+    totals = score_batch(systems, codes)
+    return time.perf_counter() - start, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--leagues', type=int, default=10_000)
+    parser.add_argument('--drivers', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    systems, codes = make_results(args.leagues, args.drivers, args.seed)
+    # Warm the compiled tables so both runs measure scoring only
+    score_batch(systems[:1], codes[:1])
+
+    per_call_time, per_call = bench_per_call(systems, codes)
+    batched_time, batched = bench_batched(systems, codes)
+
+    if not np.array_equal(per_call, batched):
+        print('Per-call and batched scores differ!')
+        sys.exit(1)
+
+    n = args.leagues * args.drivers
+    print(f'Scored {args.leagues} leagues x {args.drivers} drivers ({n} results)')
+    print('-' * 50)
+    print(f'Per-call: {per_call_time * 1000:10.2f} ms  ({n / per_call_time:,.0f} results/s)')
+    print(f'Batched:  {batched_time * 1000:10.2f} ms  ({n / batched_time:,.0f} results/s)')
+    print(f'Speedup:  {per_call_time / batched_time:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
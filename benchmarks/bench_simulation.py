@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Monte Carlo championship-odds simulator.
+
+Simulates the rest of a season for a synthetic league and checks that two
+runs with the same seed produce identical odds.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project directory to Python path
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from f1_fantasy.utils.scoring import POINT_SYSTEMS, compile_point_system
+from f1_fantasy.utils.simulation import simulate_season
+
+
+def make_league(n_teams, n_drivers, seed):
+    """Build starting totals, an even driver split and descending strengths."""
+    rng = np.random.default_rng(seed)
+    totals = rng.integers(0, 150, size=n_teams)
+    rosters = np.zeros((n_drivers, n_teams), dtype=np.int64)
+    rosters[np.arange(n_drivers), np.arange(n_drivers) % n_teams] = 1
+    strengths = np.linspace(3.0, 1.0, n_drivers)
+    return totals, rosters, strengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--simulations', type=int, default=50_000)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--drivers', type=int, default=20)
+    parser.add_argument('--races', type=int, default=18)
+    parser.add_argument('--point-system', choices=POINT_SYSTEMS, default='f1_default')
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    totals, rosters, strengths = make_league(args.teams, args.drivers, args.seed)
+    table = compile_point_system(args.point_system)
+
+    runs = []
+    for _ in range(2):
+        start = time.perf_counter()
+        result = simulate_season(totals, rosters, strengths, table, args.races,
+                                 n_sims=args.simulations, seed=args.seed)
+        runs.append((time.perf_counter() - start, result))
+
+    deterministic = all(np.array_equal(runs[0][1][key], runs[1][1][key]) for key in runs[0][1])
+    elapsed = min(run[0] for run in runs)
+    race_sims = args.simulations * args.races
+
+    print(f'Simulated {args.simulations} continuations x {args.races} races '
+          f'({args.teams} teams, {args.drivers} drivers)')
+    print('-' * 50)
+    print(f'Best time:     {elapsed:8.3f} s  ({race_sims / elapsed:,.0f} races/s)')
+    print(f'Deterministic: {"yes" if deterministic else "NO"}')
+    print('-' * 50)
+    for team, (start, p_first, p_top3) in enumerate(zip(totals, runs[0][1]['p_first'],
+                                                          runs[0][1]['p_top3'])):
+        print(f'Team {team:2d}  start {start:4d}  P(1st) {p_first:6.3f}  P(top 3) {p_top3:6.3f}')
+
+    if not deterministic:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,10 +8,13 @@ backlog = 2048
 
 # Worker processes - Reduced for test environment
 workers = max(2, multiprocessing.cpu_count())
-worker_class = "sync"
+# gevent workers hold each live draft room stream (and long-poll) on a
+# greenlet, so hundreds of watchers cost open connections, not workers
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
 worker_connections = 1000
 timeout = 30
-keepalive = 2
+# Long enough for browsers to reuse the connection between draft long-polls
+keepalive = 30
 
 # Restart workers after this many requests to prevent memory leaks
 max_requests = 1000
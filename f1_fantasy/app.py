@@ -6,6 +6,17 @@ from f1_fantasy.models import db, User, Role, Settings, League, Team, LeagueMemb
 from f1_fantasy.security import init_security, create_default_roles, security, user_datastore
 from f1_fantasy.setup import init_setup
 from f1_fantasy.management.import_f1_data import init_app as init_import_f1_data
+from f1_fantasy.management.simulate_odds import init_app as init_simulate_odds
+from f1_fantasy.management.rescore import init_app as init_rescore
+from f1_fantasy.management.import_results import init_app as init_import_results
+from f1_fantasy.management.apply_results import init_app as init_apply_results
+from f1_fantasy.management.record_fixtures import init_app as init_record_fixtures
+from f1_fantasy.management.extract_laps import init_app as init_extract_laps
+from f1_fantasy.management.snapshots import init_app as init_snapshots
+from f1_fantasy.management.import_worker import init_app as init_import_worker
+from f1_fantasy.management.fastf1_cache import init_app as init_fastf1_cache
+from f1_fantasy.management.draft_clock import init_app as init_draft_clock
+from f1_fantasy.management.cache import init_app as init_cache_commands
 import os
 import logging
 from f1_fantasy.views.main import bp as main_bp
@@ -13,8 +24,9 @@ from f1_fantasy.views.auth import bp as auth_bp
 from f1_fantasy.views.admin import bp as admin_bp
 from f1_fantasy.views.league import bp as league_bp
 from f1_fantasy.views.team import bp as team_bp
+from f1_fantasy.views.draft import bp as draft_bp
 import click
-from f1_fantasy.extensions import mail
+from f1_fantasy.extensions import mail, cache
 
 # Initialize Flask-Migrate
 migrate = Migrate()
@@ -32,7 +44,22 @@ def create_app(config_name=None):
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
         SECRET_KEY=os.getenv('SECRET_KEY', 'dev-key'),
         SECURITY_PASSWORD_SALT=os.getenv('SECURITY_PASSWORD_SALT', 'dev-salt'),
+        LAP_STORE_DIR=os.getenv('LAP_STORE_DIR', os.path.join(app.instance_path, 'laps')),
+        SNAPSHOT_DIR=os.getenv('SNAPSHOT_DIR', os.path.join(app.instance_path, 'snapshots')),
+        DRAFT_EVENTS_POLL_INTERVAL=float(os.getenv('DRAFT_EVENTS_POLL_INTERVAL', '1.0')),
+        SETTINGS_VERSION_FILE=os.getenv('SETTINGS_VERSION_FILE', os.path.join(app.instance_path, 'settings.version')),
+        CACHE_TYPE=os.getenv('CACHE_TYPE', 'simple'),
+        CACHE_DEFAULT_TIMEOUT=int(os.getenv('CACHE_DEFAULT_TIMEOUT', '300')),
+        CACHE_THRESHOLD=int(os.getenv('CACHE_THRESHOLD', '500')),
+        CACHE_DIR=os.getenv('CACHE_DIR'),
+        CACHE_SQLITE_PATH=os.getenv('CACHE_SQLITE_PATH'),
     )
+    # Deploy configs (deploy/production.py, deploy/test.py) are passed in as a
+    # mapping; only their cache settings are read, as defaults for the ones the
+    # environment (deploy/environment.env) leaves unset
+    if isinstance(config_name, dict):
+        app.config.update({key: value for key, value in config_name.items()
+                           if key.startswith('CACHE_') and key not in os.environ})
     
     # Configure logging
     logging.basicConfig(level=logging.DEBUG)
@@ -60,6 +87,7 @@ def create_app(config_name=None):
     db.init_app(app)
     migrate.init_app(app, db)  # Initialize Flask-Migrate
     mail.init_app(app)
+    cache.init_app(app)
     # Initialize CSRF protection
     csrf = CSRFProtect(app)
     # Set up security config and hooks
@@ -77,6 +105,17 @@ def create_app(config_name=None):
     
     # Initialize management commands
     init_import_f1_data(app)
+    init_simulate_odds(app)
+    init_rescore(app)
+    init_import_results(app)
+    init_apply_results(app)
+    init_record_fixtures(app)
+    init_extract_laps(app)
+    init_snapshots(app)
+    init_import_worker(app)
+    init_fastf1_cache(app)
+    init_draft_clock(app)
+    init_cache_commands(app)
     
     # Register blueprints
     app.register_blueprint(main_bp)
@@ -84,6 +123,7 @@ def create_app(config_name=None):
     app.register_blueprint(admin_bp)
     app.register_blueprint(league_bp)
     app.register_blueprint(team_bp)
+    app.register_blueprint(draft_bp)
     
     # Add CLI commands
     @app.cli.command('check-roles')
@@ -1,3 +1,5 @@
 from flask_mail import Mail
+from f1_fantasy.utils.cache import Cache
 
-mail = Mail() 
\ No newline at end of file
+mail = Mail()
+cache = Cache()
\ No newline at end of file
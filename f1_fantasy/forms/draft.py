@@ -0,0 +1,44 @@
+from flask_wtf import FlaskForm
+from wtforms import BooleanField, HiddenField, IntegerField, SelectField, StringField, SubmitField
+from wtforms.validators import DataRequired, Length, NumberRange, Optional
+
+class DraftStartForm(FlaskForm):
+    """Form for starting a league's draft."""
+    rounds = IntegerField('Drivers per Team', default=2, validators=[
+        DataRequired(),
+        NumberRange(min=1, max=10, message='Each team must draft between 1 and 10 drivers')
+    ])
+    budget = IntegerField('Budget per Team', default=100, validators=[
+        DataRequired(),
+        NumberRange(min=1, max=10000, message='Budget must be between 1 and 10000')
+    ], description='Auction drafts only')
+    pick_seconds = IntegerField('Pick Timer (seconds)', validators=[
+        Optional(),
+        NumberRange(min=10, max=86400, message='The pick timer must be between 10 seconds and a day')
+    ], description='Teams are autodrafted when it runs out; leave empty for no timer')
+    submit = SubmitField('Start Draft')
+
+class DraftPickForm(FlaskForm):
+    """Form for making a draft pick."""
+    driver_id = SelectField('Driver', coerce=int, validators=[DataRequired()])
+    submit = SubmitField('Draft Driver')
+
+class NominateForm(FlaskForm):
+    """Form for nominating a driver in an auction draft."""
+    driver_id = SelectField('Driver', coerce=int, validators=[DataRequired()])
+    amount = IntegerField('Opening Bid', default=1, validators=[DataRequired(), NumberRange(min=1)])
+    submit = SubmitField('Nominate')
+
+class BidForm(FlaskForm):
+    """Form for bidding on the open auction lot."""
+    lot_id = HiddenField(validators=[DataRequired()])
+    amount = IntegerField('Bid', validators=[DataRequired(), NumberRange(min=1)])
+    submit = SubmitField('Bid')
+
+class DraftRankingForm(FlaskForm):
+    """Form for a team's personal autodraft ranking."""
+    ranking = StringField('My Driver Ranking', validators=[
+        Length(max=500, message='Ranking cannot exceed 500 characters')
+    ], description='Comma-separated driver numbers, best first')
+    autodraft = BooleanField('Autodraft my picks')
+    submit = SubmitField('Save Ranking')
@@ -2,6 +2,8 @@ from datetime import datetime
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, BooleanField, IntegerField, FloatField, DateTimeField, SelectField, SubmitField
 from wtforms.validators import DataRequired, Optional, NumberRange, Length, ValidationError, Email
+from f1_fantasy.models.scoring_rule import DEFAULT_POSITION_POINTS
+from f1_fantasy.utils.scoring import parse_position_points
 
 class LeagueForm(FlaskForm):
     """Form for creating and editing leagues."""
@@ -21,14 +23,32 @@ class LeagueForm(FlaskForm):
         NumberRange(min=2, max=20, message='League must have between 2 and 20 teams')
     ], default=10)
     
-    draft_type = SelectField('Draft Type', choices=[('snake', 'Snake'), ('random', 'Random')], default='snake', validators=[DataRequired()])
+    draft_type = SelectField('Draft Type', choices=[('snake', 'Snake'), ('random', 'Random'), ('auction', 'Auction')], default='snake', validators=[DataRequired()])
     
     point_system = SelectField('Point System', choices=[
         ('f1_default', 'F1 Default Scoring'),
         ('simple', 'Simple Scoring (1st = 20, 2nd = 19, etc.)'),
-        ('points_race', 'Points Race (10th = 10, 9th/11th = 9, etc.)')
+        ('points_race', 'Points Race (10th = 10, 9th/11th = 9, etc.)'),
+        ('custom', 'Custom Scoring')
     ], validators=[DataRequired()])
     
+    # Custom scoring rules (only used when point_system is 'custom')
+    position_points = StringField('Position Points', default=DEFAULT_POSITION_POINTS, validators=[
+        Length(max=200, message='Position points cannot exceed 200 characters')
+    ], description='Comma-separated points for 1st, 2nd, 3rd, ...')
+    fastest_lap_bonus = IntegerField('Fastest Lap Bonus', default=0, validators=[
+        Optional(),
+        NumberRange(min=0, max=50, message='Fastest lap bonus must be between 0 and 50')
+    ])
+    positions_gained_bonus = IntegerField('Positions Gained Bonus', default=0, validators=[
+        Optional(),
+        NumberRange(min=0, max=10, message='Positions gained bonus must be between 0 and 10')
+    ], description='Points per position gained from the starting grid')
+    dnf_penalty = IntegerField('DNF Penalty', default=0, validators=[
+        Optional(),
+        NumberRange(min=0, max=50, message='DNF penalty must be between 0 and 50')
+    ], description='Points deducted when a driver does not finish')
+    
     status = SelectField('League Status', choices=[
         ('setup', 'Setup'),
         ('active', 'Active'),
@@ -49,6 +69,15 @@ class LeagueForm(FlaskForm):
         if league and (not hasattr(self, 'league') or league.id != self.league.id):
             raise ValidationError('This league name is already taken. Please choose another.')
 
+    def validate_position_points(self, field):
+        """Validate the custom points list when custom scoring is selected."""
+        if self.point_system.data != 'custom':
+            return
+        try:
+            parse_position_points(field.data)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
     def validate_draft_date(self, field):
         """Validate that draft date is in the future."""
         if field.data and field.data < datetime.now():
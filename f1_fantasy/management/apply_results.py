@@ -0,0 +1,27 @@
+import click
+from datetime import datetime
+from flask.cli import with_appcontext
+from ..utils.standings import apply_season_results
+
+@click.command('apply-results')
+@click.option('--season', type=int, default=lambda: datetime.utcnow().year,
+              help='Season to apply results for (defaults to the current year)')
+@click.option('--round', 'rounds', type=int, multiple=True,
+              help='Round to apply (repeatable, defaults to every completed race of the season)')
+@with_appcontext
+def apply_results(season: int, rounds):
+    """Apply imported race results to the standings of every drafted league."""
+    click.echo(f'Applying {season} race results to league standings...')
+    
+    def report(round, round_stats):
+        click.echo(f'  Round {round}: {round_stats["applied"]} league(s) updated'
+                   + (f', {round_stats["skipped"]} skipped (later rounds applied; rescore instead)'
+                      if round_stats['skipped'] else ''))
+    
+    stats = apply_season_results(season, rounds=list(rounds) or None, progress=report)
+    if not stats:
+        click.echo('No completed races found; run import-race-results for this season first.')
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(apply_results)
@@ -0,0 +1,26 @@
+import click
+from flask.cli import with_appcontext
+from ..extensions import cache
+
+@click.command('cache-stats')
+@with_appcontext
+def cache_stats():
+    """Show the configured cache backend and how many entries it holds.
+    
+    Hit and miss counts are per worker; see /admin/cache/stats on a running server.
+    """
+    stats = cache.stats()
+    click.echo(f'Backend: {stats["backend"]}')
+    click.echo(f'Entries: {stats["entries"]}')
+
+@click.command('cache-clear')
+@with_appcontext
+def cache_clear():
+    """Drop every cached entry (shared backends: for all workers)."""
+    cache.clear()
+    click.echo('Cache cleared')
+
+def init_app(app):
+    """Register the commands with the Flask application."""
+    app.cli.add_command(cache_stats)
+    app.cli.add_command(cache_clear)
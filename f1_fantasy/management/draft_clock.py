@@ -0,0 +1,30 @@
+import click
+import time
+from flask.cli import with_appcontext
+from ..models import db
+from ..utils.auction import close_expired_lots
+from ..utils.autodraft import run_all_due_autopicks
+
+@click.command('draft-clock')
+@click.option('--once', is_flag=True, help='Run the clocks once and exit instead of looping')
+@click.option('--interval', default=1.0, type=float, help='Seconds between checks')
+@with_appcontext
+def draft_clock(once: bool = False, interval: float = 1.0):
+    """Close expired auction lots and autodraft teams whose pick timer ran out.
+    
+    Draft rooms with watchers run their own clocks; this keeps drafts
+    moving when nobody has the room open.
+    """
+    while True:
+        sold = close_expired_lots()
+        picked = run_all_due_autopicks()
+        if sold or picked:
+            click.echo(f'Closed {sold} lot(s), made {picked} autopick(s)')
+        db.session.remove()
+        if once:
+            break
+        time.sleep(interval)
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(draft_clock)
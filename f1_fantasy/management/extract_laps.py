@@ -0,0 +1,44 @@
+import click
+from datetime import datetime
+from flask import current_app
+from flask.cli import with_appcontext
+from ..utils.jolpica_api import extract_season_laps
+import os
+
+@click.command('extract-laps')
+@click.option('--season', type=int, default=lambda: datetime.utcnow().year,
+              help='Season to extract (defaults to the current year)')
+@click.option('--round', 'rounds', type=int, multiple=True,
+              help='Round to extract (repeatable, defaults to every imported race of the season)')
+@click.option('--store-dir', help='Lap store directory (defaults to LAP_STORE_DIR)')
+@click.option('--force', is_flag=True, help='Re-extract races that are already in the store')
+@click.option('--cache-dir', help='Directory to store Fast-F1 cache (defaults to ~/.fastf1)')
+@click.option('--replay-dir', type=click.Path(exists=True, file_okay=False),
+              help='Read fixtures recorded with record-f1-fixtures instead of the live APIs')
+@with_appcontext
+def extract_laps_command(season: int, rounds, store_dir: str = None, force: bool = False,
+                         cache_dir: str = None, replay_dir: str = None):
+    """Extract per-lap times and positions into the memory-mapped lap store."""
+    if not cache_dir:
+        cache_dir = os.path.expanduser('~/.fastf1')
+    os.makedirs(cache_dir, exist_ok=True)
+    store_dir = store_dir or current_app.config['LAP_STORE_DIR']
+    
+    click.echo(f'Extracting laps for {season} into {store_dir}...')
+    
+    def report(round, round_stats):
+        if 'error' in round_stats:
+            click.echo(f'  Round {round}: Error - {round_stats["error"]}')
+        elif round_stats.get('skipped'):
+            click.echo(f'  Round {round}: already extracted')
+        else:
+            click.echo(f'  Round {round}: {round_stats["drivers"]} drivers x {round_stats["laps"]} laps')
+    
+    stats = extract_season_laps(store_dir, cache_dir, season, rounds=list(rounds) or None, force=force,
+                                progress=report, replay_dir=replay_dir)
+    if not stats:
+        click.echo('No races found; run import-f1-data for this season first.')
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(extract_laps_command)
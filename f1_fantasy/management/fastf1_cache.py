@@ -0,0 +1,50 @@
+import click
+from ..utils.fastf1_cache import ManagedCache
+import os
+
+def _cache(cache_dir: str = None, max_mb: int = None) -> ManagedCache:
+    if not cache_dir:
+        cache_dir = os.path.expanduser('~/.fastf1')
+    os.makedirs(cache_dir, exist_ok=True)
+    return ManagedCache(cache_dir, max_mb * 1024 ** 2 if max_mb is not None else None)
+
+def _mb(size: int) -> str:
+    return f'{size / 1024 ** 2:.1f} MB'
+
+@click.command('fastf1-cache-stats')
+@click.option('--cache-dir', help='Fast-F1 cache directory (defaults to ~/.fastf1)')
+def fastf1_cache_stats(cache_dir: str = None):
+    """Show Fast-F1 cache size and hit rate per season."""
+    cache = _cache(cache_dir)
+    stats = cache.stats()
+    
+    click.echo(f'Cache directory: {cache.cache_dir}')
+    click.echo('-' * 50)
+    for season, season_stats in stats['seasons'].items():
+        hit_rate = season_stats['hit_rate']
+        click.echo(f'Season {season}: {_mb(season_stats["bytes"])} in {season_stats["sessions"]} sessions, '
+                   f'{season_stats["files"]} files, '
+                   f'hit rate {f"{hit_rate:.0%}" if hit_rate is not None else "n/a"}')
+    click.echo('-' * 50)
+    click.echo(f'Sessions: {_mb(stats["session_bytes"])} of {_mb(stats["max_bytes"])} budget')
+    click.echo(f'Other (HTTP cache, summaries): {_mb(stats["other_bytes"])}')
+    click.echo(f'Total: {_mb(stats["total_bytes"])}, {stats["total_files"]} files')
+    if stats['hit_rate'] is not None:
+        click.echo(f'Overall hit rate: {stats["hit_rate"]:.0%}')
+
+@click.command('fastf1-cache-prune')
+@click.option('--cache-dir', help='Fast-F1 cache directory (defaults to ~/.fastf1)')
+@click.option('--max-mb', type=click.IntRange(min=0),
+              help='Byte budget for cached sessions in MB (defaults to FASTF1_CACHE_MAX_BYTES or 2 GB)')
+def fastf1_cache_prune(cache_dir: str = None, max_mb: int = None):
+    """Evict least recently used Fast-F1 sessions until the cache fits its budget."""
+    cache = _cache(cache_dir, max_mb)
+    evicted = cache.evict()
+    for key in evicted:
+        click.echo(f'  Evicted {key}')
+    click.echo(f'Evicted {len(evicted)} session(s); sessions now use {_mb(cache.usage()["session_bytes"])}')
+
+def init_app(app):
+    """Register the commands with the Flask application."""
+    app.cli.add_command(fastf1_cache_stats)
+    app.cli.add_command(fastf1_cache_prune)
@@ -1,6 +1,7 @@
+import time
 import click
 from flask.cli import with_appcontext
-from ..utils.jolpica_api import import_historical_data
+from ..utils.jolpica_api import import_historical_data, peak_memory_mb
 from ..models import Settings
 import os
 
@@ -8,16 +9,42 @@ import os
 @click.option('--start-season', default=2020, help='Start season to import data from')
 @click.option('--end-season', default=2025, help='End season to import data to')
 @click.option('--cache-dir', help='Directory to store Fast-F1 cache (defaults to ~/.fastf1)')
+@click.option('--workers', default=1, type=click.IntRange(min=1),
+              help='Number of processes fetching seasons in parallel (a single writer commits them)')
+@click.option('--sync', is_flag=True,
+              help='Only write rounds and drivers that changed since the last sync, resuming an interrupted run')
+@click.option('--replay-dir', type=click.Path(exists=True, file_okay=False),
+              help='Read fixtures recorded with record-f1-fixtures instead of the live APIs')
 @with_appcontext
-def import_f1_data(start_season: int, end_season: int, cache_dir: str = None):
+def import_f1_data(start_season: int, end_season: int, cache_dir: str = None, workers: int = 1,
+                   sync: bool = False, replay_dir: str = None):
     """Import F1 data using Fast-F1."""
     if not cache_dir:
         cache_dir = os.path.expanduser('~/.fastf1')
+    os.makedirs(cache_dir, exist_ok=True)
     
     click.echo(f'Importing F1 data from {start_season} to {end_season}...')
-    click.echo(f'Using cache directory: {cache_dir}')
+    if replay_dir:
+        click.echo(f'Replaying recorded fixtures from: {replay_dir}')
+    else:
+        click.echo(f'Using cache directory: {cache_dir}')
+    click.echo(f'Using {workers} worker process(es)')
+    if sync:
+        click.echo('Sync mode: only changed rounds and drivers are written')
     
-    stats = import_historical_data(cache_dir, start_season, end_season)
+    def report(season, season_stats):
+        if 'error' in season_stats:
+            click.echo(f'  Season {season} failed')
+        elif season_stats.get('skipped'):
+            click.echo(f'  Season {season} already synced by the interrupted run, skipped')
+        else:
+            click.echo(f'  Season {season} written '
+                       f'(fetch {season_stats["fetch_seconds"]:.2f}s, write {season_stats["write_seconds"]:.2f}s)')
+    
+    started = time.perf_counter()
+    stats = import_historical_data(cache_dir, start_season, end_season, workers=workers, progress=report,
+                                   sync=sync, replay_dir=replay_dir)
+    elapsed = time.perf_counter() - started
     
     # Print results
     click.echo('\nImport Results:')
@@ -25,12 +52,24 @@ def import_f1_data(start_season: int, end_season: int, cache_dir: str = None):
     for season, season_stats in stats.items():
         if 'error' in season_stats:
             click.echo(f'Season {season}: Error - {season_stats["error"]}')
+        elif season_stats.get('skipped'):
+            click.echo(f'Season {season}: Skipped (resumed run)')
+        elif season_stats.get('unchanged'):
+            click.echo(f'Season {season}: Unchanged')
+            click.echo(f'  Fetch time: {season_stats["fetch_seconds"]:.2f}s')
         else:
             click.echo(f'Season {season}:')
             click.echo(f'  Races imported: {season_stats["races"]}')
             click.echo(f'  Drivers imported: {season_stats["drivers"]}')
+            click.echo(f'  Fetch time: {season_stats["fetch_seconds"]:.2f}s')
+            click.echo(f'  Write time: {season_stats["write_seconds"]:.2f}s')
+            click.echo(f'  Fetch peak memory: {season_stats["peak_rss_mb"]:.1f} MB')
     click.echo('-' * 50)
+    click.echo(f'Total time: {elapsed:.2f}s')
+    click.echo(f'Peak memory (writer): {peak_memory_mb():.1f} MB')
+    if workers > 1:
+        click.echo(f'Peak memory (largest worker): {peak_memory_mb(children=True):.1f} MB')
 
 def init_app(app):
     """Register the command with the Flask application."""
-    app.cli.add_command(import_f1_data) 
\ No newline at end of file
+    app.cli.add_command(import_f1_data)
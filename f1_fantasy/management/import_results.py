@@ -0,0 +1,57 @@
+import time
+import click
+from datetime import datetime
+from flask.cli import with_appcontext
+from ..utils.jolpica_api import import_race_results, peak_memory_mb, RESULTS_BATCH_SIZE
+import os
+
+@click.command('import-race-results')
+@click.option('--season', type=int, default=lambda: datetime.utcnow().year,
+              help='Season to import results for (defaults to the current year)')
+@click.option('--round', 'rounds', type=int, multiple=True,
+              help='Round to import (repeatable, defaults to every imported race of the season)')
+@click.option('--batch-size', default=RESULTS_BATCH_SIZE, type=click.IntRange(min=1),
+              help='Result rows written per bulk upsert')
+@click.option('--cache-dir', help='Directory to store Fast-F1 cache (defaults to ~/.fastf1)')
+@click.option('--replay-dir', type=click.Path(exists=True, file_okay=False),
+              help='Read fixtures recorded with record-f1-fixtures instead of the live APIs')
+@click.option('--skip-standings', is_flag=True,
+              help="Don't apply the imported races to league standings (see apply-results)")
+@with_appcontext
+def import_race_results_command(season: int, rounds, batch_size: int, cache_dir: str = None,
+                                replay_dir: str = None, skip_standings: bool = False):
+    """Import race results (grid, finish, status, fastest lap) using Fast-F1."""
+    if not cache_dir:
+        cache_dir = os.path.expanduser('~/.fastf1')
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    click.echo(f'Importing race results for {season}...')
+    
+    def report(round, round_stats):
+        if 'error' in round_stats:
+            click.echo(f'  Round {round}: Error - {round_stats["error"]}')
+        else:
+            click.echo(f'  Round {round}: {round_stats["results"]} results '
+                       f'({round_stats["new_drivers"]} new drivers, {round_stats["seconds"]:.2f}s)')
+    
+    started = time.perf_counter()
+    stats = import_race_results(cache_dir, season, rounds=list(rounds) or None,
+                                batch_size=batch_size, progress=report, replay_dir=replay_dir,
+                                apply_standings=not skip_standings)
+    if not stats:
+        click.echo('No races found; run import-f1-data for this season first.')
+        return
+    
+    click.echo('-' * 50)
+    click.echo(f'Results imported: {sum(s.get("results", 0) for s in stats.values())}')
+    if not skip_standings:
+        updated = sum(s.get('leagues_updated', 0) for s in stats.values())
+        skipped = sum(s.get('leagues_skipped', 0) for s in stats.values())
+        click.echo(f'League standings updated: {updated}'
+                   + (f' ({skipped} skipped: later rounds applied; rescore instead)' if skipped else ''))
+    click.echo(f'Total time: {time.perf_counter() - started:.2f}s')
+    click.echo(f'Peak memory: {peak_memory_mb():.1f} MB')
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(import_race_results_command)
@@ -0,0 +1,24 @@
+import click
+from flask.cli import with_appcontext
+from ..utils.import_jobs import work, DEFAULT_POLL_INTERVAL
+import os
+
+@click.command('import-worker')
+@click.option('--once', is_flag=True, help='Exit once the queue is empty instead of polling')
+@click.option('--poll-interval', default=DEFAULT_POLL_INTERVAL, type=float,
+              help='Seconds between checks of an empty queue')
+@click.option('--cache-dir', help='Directory to store Fast-F1 cache (defaults to ~/.fastf1)')
+@with_appcontext
+def import_worker(once: bool = False, poll_interval: float = DEFAULT_POLL_INTERVAL, cache_dir: str = None):
+    """Run import jobs queued from the admin panel."""
+    if not cache_dir:
+        cache_dir = os.path.expanduser('~/.fastf1')
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    click.echo('Waiting for import jobs...' if not once else 'Running queued import jobs...')
+    ran = work(cache_dir, once=once, poll_interval=poll_interval)
+    click.echo(f'Ran {ran} import job(s)')
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(import_worker)
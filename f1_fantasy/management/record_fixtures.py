@@ -0,0 +1,44 @@
+import click
+from ..utils.jolpica_api import F1DataManager
+from ..utils.data_sources import FastF1Source, RecordingSource
+import os
+
+@click.command('record-f1-fixtures')
+@click.option('--start-season', default=2024, help='First season to record')
+@click.option('--end-season', default=2024, help='Last season to record')
+@click.option('--out-dir', required=True, type=click.Path(file_okay=False),
+              help='Directory to write the recorded fixtures to')
+@click.option('--results/--no-results', default=True, help='Also record every race classification')
+@click.option('--laps/--no-laps', default=False, help='Also record lap timing for the lap store')
+@click.option('--cache-dir', help='Directory to store Fast-F1 cache (defaults to ~/.fastf1)')
+def record_f1_fixtures(start_season: int, end_season: int, out_dir: str, results: bool = True,
+                       laps: bool = False, cache_dir: str = None):
+    """Record Fast-F1 schedules, drivers and results for offline replay."""
+    if not cache_dir:
+        cache_dir = os.path.expanduser('~/.fastf1')
+    os.makedirs(cache_dir, exist_ok=True)
+    manager = F1DataManager(source=RecordingSource(FastF1Source(cache_dir), out_dir))
+    
+    for season in range(start_season, end_season + 1):
+        try:
+            rows = manager.fetch_season_rows(season)
+        except Exception as e:
+            click.echo(f'Season {season}: Error - {str(e)}')
+            continue
+        recorded = 0
+        if results:
+            for race in rows['races']:
+                try:
+                    manager.fetch_result_rows(season, race['round'])
+                    if laps:
+                        manager.source.laps(season, race['round'])
+                    recorded += 1
+                except Exception as e:
+                    click.echo(f'  Round {race["round"]}: Error - {str(e)}')
+        click.echo(f'Season {season}: {len(rows["races"])} races, {len(rows["drivers"])} drivers, '
+                   f'{recorded} results recorded')
+    click.echo(f'Fixtures written to {out_dir}')
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(record_f1_fixtures)
@@ -0,0 +1,34 @@
+import click
+from flask.cli import with_appcontext
+from ..models import League
+from ..utils.rescoring import DEFAULT_CHUNK_SIZE, rescore_all
+
+@click.command('rescore-leagues')
+@click.option('--league-id', 'league_ids', type=int, multiple=True,
+              help='League to rescore (repeatable); defaults to all leagues')
+@click.option('--chunk-size', default=DEFAULT_CHUNK_SIZE, help='Races committed per transaction')
+@with_appcontext
+def rescore_leagues(league_ids=(), chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Recompute past race points after a point system or rule change."""
+    def report(stats):
+        click.echo(f'  League {stats["league_id"]}: {stats["processed"]}/{stats["races"]} races '
+                   f'({stats["rescored_races"]} rescored, {stats["updated_rows"]} rows updated)')
+    
+    if league_ids:
+        missing = set(league_ids) - {league.id for league in League.query.filter(League.id.in_(league_ids))}
+        if missing:
+            raise click.BadParameter(f'Unknown league id(s): {sorted(missing)}', param_hint='--league-id')
+    
+    click.echo('Rescoring ' + (f'{len(league_ids)} league(s)' if league_ids else 'all leagues') + '...')
+    totals = rescore_all(chunk_size=chunk_size, progress=report, league_ids=list(league_ids))
+    
+    click.echo('-' * 50)
+    click.echo(f'Leagues: {totals["leagues"]}')
+    click.echo(f'Races: {totals["races"]} ({totals["rescored_races"]} rescored)')
+    click.echo(f'Rows updated: {totals["updated_rows"]}')
+    click.echo(f'Elapsed: {totals["elapsed"]:.2f}s')
+    click.echo('-' * 50)
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(rescore_leagues)
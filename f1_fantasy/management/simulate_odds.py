@@ -0,0 +1,46 @@
+import time
+import click
+from flask.cli import with_appcontext
+from ..models import League, LeagueOdds
+from ..utils.simulation import DEFAULT_SIMULATIONS, simulate_league_odds, starting_point
+
+@click.command('simulate-odds')
+@click.option('--league-id', type=int, help='Only simulate this league (defaults to all active leagues)')
+@click.option('--simulations', default=DEFAULT_SIMULATIONS, help='Number of season continuations to simulate')
+@click.option('--seed', default=0, help='Random seed; the same seed always gives the same odds')
+@click.option('--force', is_flag=True, help='Recompute odds even if they are cached for the current round')
+@with_appcontext
+def simulate_odds(league_id: int = None, simulations: int = DEFAULT_SIMULATIONS, seed: int = 0,
+                  force: bool = False):
+    """Simulate championship odds and cache them per league per round."""
+    if league_id:
+        league = League.query.get(league_id)
+        if not league:
+            raise click.BadParameter(f'League {league_id} does not exist', param_hint='--league-id')
+        leagues = [league]
+    else:
+        leagues = League.query.filter_by(status='active').all()
+    
+    click.echo(f'Simulating odds for {len(leagues)} league(s) with {simulations} simulations (seed {seed})...')
+    click.echo('-' * 50)
+    for league in leagues:
+        start = starting_point(league)
+        if start is None:
+            click.echo(f'{league.name}: no season data, skipped')
+            continue
+        season, round = start[0], start[1]
+        if not force and LeagueOdds.exists_for(league.id, season, round):
+            click.echo(f'{league.name}: odds already cached for {season} round {round}')
+            continue
+        
+        started = time.perf_counter()
+        simulation = simulate_league_odds(league, n_sims=simulations, seed=seed, season=season)
+        LeagueOdds.store(league.id, simulation, simulations, seed)
+        elapsed = time.perf_counter() - started
+        click.echo(f'{league.name}: {simulation["remaining_races"]} races remaining after round '
+                   f'{simulation["round"]} ({elapsed:.2f}s)')
+    click.echo('-' * 50)
+
+def init_app(app):
+    """Register the command with the Flask application."""
+    app.cli.add_command(simulate_odds)
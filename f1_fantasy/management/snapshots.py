@@ -0,0 +1,40 @@
+import click
+from flask.cli import with_appcontext
+from ..utils.snapshots import export_season, import_season, snapshot_dir
+
+@click.command('export-snapshots')
+@click.option('--start-season', default=2020, help='First season to export')
+@click.option('--end-season', default=2025, help='Last season to export')
+@click.option('--dir', 'root', help='Snapshot directory (defaults to SNAPSHOT_DIR)')
+@with_appcontext
+def export_snapshots(start_season: int, end_season: int, root: str = None):
+    """Export races, drivers and results to per-season Parquet snapshots."""
+    root = snapshot_dir(root)
+    click.echo(f'Exporting seasons {start_season} to {end_season} into {root}...')
+    for season in range(start_season, end_season + 1):
+        stats = export_season(root, season)
+        click.echo(f'Season {season}: {stats["races"]} races, {stats["drivers"]} drivers, '
+                   f'{stats["results"]} results')
+
+@click.command('import-snapshots')
+@click.option('--start-season', default=2020, help='First season to import')
+@click.option('--end-season', default=2025, help='Last season to import')
+@click.option('--dir', 'root', help='Snapshot directory (defaults to SNAPSHOT_DIR)')
+@with_appcontext
+def import_snapshots(start_season: int, end_season: int, root: str = None):
+    """Re-hydrate races, drivers and results from per-season Parquet snapshots."""
+    root = snapshot_dir(root)
+    click.echo(f'Importing seasons {start_season} to {end_season} from {root}...')
+    for season in range(start_season, end_season + 1):
+        try:
+            stats = import_season(root, season)
+        except Exception as e:
+            click.echo(f'Season {season}: Error - {str(e)}')
+            continue
+        click.echo(f'Season {season}: {stats["races"]} races, {stats["drivers"]} drivers, '
+                   f'{stats["results"]} results')
+
+def init_app(app):
+    """Register the commands with the Flask application."""
+    app.cli.add_command(export_snapshots)
+    app.cli.add_command(import_snapshots)
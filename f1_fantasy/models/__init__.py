@@ -5,10 +5,15 @@ db = SQLAlchemy()
 
 # Import models after db is initialized to avoid circular imports
 from .user import User, Role
-from .settings import Settings
+from .settings import Settings, SettingsAudit
 from .league import League, LeagueMember
 from .team import Team
-from .f1_data import Race, Driver
+from .f1_data import Race, Driver, RaceResult, ImportCheckpoint
+from .standings import TeamStanding
+from .odds import LeagueOdds
+from .scoring_rule import ScoringRule
+from .import_job import ImportJob
+from .draft import Draft, DraftPick, DraftRanking, AuctionLot, AuctionBid
 
 # Re-export models for convenience
-__all__ = ['db', 'User', 'Role', 'Settings', 'League', 'LeagueMember', 'Team', 'Race', 'Driver'] 
\ No newline at end of file
+__all__ = ['db', 'User', 'Role', 'Settings', 'SettingsAudit', 'League', 'LeagueMember', 'Team', 'Race', 'Driver', 'RaceResult', 'ImportCheckpoint', 'TeamStanding', 'LeagueOdds', 'ScoringRule', 'ImportJob', 'Draft', 'DraftPick', 'DraftRanking', 'AuctionLot', 'AuctionBid'] 
\ No newline at end of file
@@ -0,0 +1,147 @@
+from datetime import datetime
+from . import db
+
+class Draft(db.Model):
+    """A league's driver draft.
+
+    The full pick order (team id per overall pick) is computed once when the
+    draft starts and stored with it; picks themselves are append-only
+    DraftPick rows.
+    """
+    __tablename__ = 'drafts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'), nullable=False, unique=True)
+    season = db.Column(db.Integer, nullable=False)  # Season the drivers are drafted from
+    draft_type = db.Column(db.String(20), nullable=False)  # Options: snake, random, auction
+    rounds = db.Column(db.Integer, nullable=False)  # Drivers per team
+    pick_order = db.Column(db.JSON, nullable=False)  # Team id for every overall pick (auction: nominating team)
+    budget = db.Column(db.Integer, nullable=True)  # Starting budget per team in an auction draft
+    pick_seconds = db.Column(db.Integer, nullable=True)  # Pick timer; the team on the clock is autodrafted after it
+    seed = db.Column(db.Integer, nullable=True)  # Seed of a random order, for reproducibility
+    status = db.Column(db.String(20), default='active',  # Options: active, completed
+                       nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    league = db.relationship('League', backref=db.backref('draft', uselist=False, cascade='all, delete-orphan'))
+    picks = db.relationship('DraftPick', backref='draft', lazy='dynamic', cascade='all, delete-orphan',
+                            order_by='DraftPick.pick_number')
+    lots = db.relationship('AuctionLot', backref='draft', lazy='dynamic', cascade='all, delete-orphan',
+                           order_by='AuctionLot.lot_number')
+
+    def __repr__(self):
+        return f'<Draft league={self.league_id} {self.draft_type} {self.status}>'
+
+    @property
+    def total_picks(self):
+        return len(self.pick_order)
+
+class DraftPick(db.Model):
+    """A single draft pick; rows are only ever appended."""
+    __tablename__ = 'draft_picks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    draft_id = db.Column(db.Integer, db.ForeignKey('drafts.id'), nullable=False)
+    pick_number = db.Column(db.Integer, nullable=False)  # Overall pick, starting at 0
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    driver_id = db.Column(db.Integer, db.ForeignKey('drivers.id'), nullable=False)
+    made_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # None for autodraft and auction picks
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    team = db.relationship('Team', backref=db.backref('draft_picks', lazy='dynamic', cascade='all, delete-orphan'))
+    driver = db.relationship('Driver')
+
+    # A pick slot is filled once and a driver is drafted once; the database
+    # arbitrates between workers racing for the same slot
+    __table_args__ = (
+        db.UniqueConstraint('draft_id', 'pick_number', name='uix_draft_pick_number'),
+        db.UniqueConstraint('draft_id', 'driver_id', name='uix_draft_driver'),
+    )
+
+    def __repr__(self):
+        return f'<DraftPick {self.draft_id}#{self.pick_number}: team={self.team_id} driver={self.driver_id}>'
+
+class DraftRanking(db.Model):
+    """A team owner's personal driver ranking, used when the team is autodrafted."""
+    __tablename__ = 'draft_rankings'
+
+    id = db.Column(db.Integer, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False, unique=True)
+    driver_ids = db.Column(db.JSON, nullable=False, default=list)  # Best first; unranked drivers follow by projection
+    autodraft = db.Column(db.Boolean, nullable=False, default=False)  # Pick as soon as the team is on the clock
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    team = db.relationship('Team', backref=db.backref('draft_ranking', uselist=False, cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<DraftRanking team={self.team_id} {len(self.driver_ids or [])} drivers>'
+
+class AuctionLot(db.Model):
+    """A driver nominated in an auction draft, open for bids until ``closes_at``.
+
+    ``version`` is a SQLAlchemy version counter: every bid is an UPDATE
+    guarded by the version it read, so of two concurrent bids on the same
+    lot exactly one commits and the other re-reads and revalidates.
+    """
+    __tablename__ = 'auction_lots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    draft_id = db.Column(db.Integer, db.ForeignKey('drafts.id'), nullable=False)
+    lot_number = db.Column(db.Integer, nullable=False)
+    driver_id = db.Column(db.Integer, db.ForeignKey('drivers.id'), nullable=False)
+    nominated_by = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    high_bid = db.Column(db.Integer, nullable=False)
+    high_team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    bids = db.Column(db.Integer, nullable=False, default=1)  # Accepted bids, including the nomination
+    status = db.Column(db.String(20), nullable=False, default='open')  # Options: open, sold
+    opened_at = db.Column(db.DateTime, default=datetime.utcnow)
+    closes_at = db.Column(db.DateTime, nullable=False)
+    closed_at = db.Column(db.DateTime, nullable=True)
+    version = db.Column(db.Integer, nullable=False)
+
+    driver = db.relationship('Driver')
+    high_team = db.relationship('Team', foreign_keys=[high_team_id])
+
+    __table_args__ = (
+        db.UniqueConstraint('draft_id', 'lot_number', name='uix_auction_lot_number'),
+        db.UniqueConstraint('draft_id', 'driver_id', name='uix_auction_lot_driver'),
+    )
+    __mapper_args__ = {'version_id_col': version}
+
+    def __repr__(self):
+        return f'<AuctionLot {self.draft_id}#{self.lot_number}: driver={self.driver_id} {self.high_bid} {self.status}>'
+
+    @property
+    def is_open(self):
+        return self.status == 'open'
+
+    def to_dict(self):
+        return {
+            'lot_number': self.lot_number,
+            'driver_id': self.driver_id,
+            'nominated_by': self.nominated_by,
+            'high_bid': self.high_bid,
+            'high_team_id': self.high_team_id,
+            'bids': self.bids,
+            'status': self.status,
+            'closes_at': self.closes_at.isoformat() + 'Z',
+            'version': self.version
+        }
+
+class AuctionBid(db.Model):
+    """An accepted bid; rows are only ever appended, in the bid's transaction."""
+    __tablename__ = 'auction_bids'
+
+    id = db.Column(db.Integer, primary_key=True)
+    lot_id = db.Column(db.Integer, db.ForeignKey('auction_lots.id'), nullable=False, index=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    amount = db.Column(db.Integer, nullable=False)
+    made_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    lot = db.relationship('AuctionLot', backref=db.backref('bid_history', lazy='dynamic', cascade='all, delete-orphan',
+                                                           order_by='AuctionBid.id'))
+
+    def __repr__(self):
+        return f'<AuctionBid lot={self.lot_id} team={self.team_id} {self.amount}>'
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from datetime import datetime
 from . import db
 
@@ -55,4 +57,75 @@ class Driver(db.Model):
         return f"{self.first_name} {self.last_name}"
 
     def __repr__(self):
-        return f'<Driver {self.season} #{self.driver_number}: {self.full_name}>' 
\ No newline at end of file
+        return f'<Driver {self.season} #{self.driver_number}: {self.full_name}>' 
+
+class ImportCheckpoint(db.Model):
+    """Per-season record of the last successful F1 data sync.
+
+    Holds a content hash per round and per driver so a sync only writes the
+    rows whose source data changed, plus season-level digests of both.
+    """
+    __tablename__ = 'import_checkpoints'
+
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, nullable=False, unique=True)
+    schedule_hash = db.Column(db.String(40), nullable=True)
+    drivers_hash = db.Column(db.String(40), nullable=True)
+    round_hashes = db.Column(db.JSON, nullable=False, default=dict)  # {round: row hash}
+    driver_hashes = db.Column(db.JSON, nullable=False, default=dict)  # {driver number: row hash}
+    synced_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ImportCheckpoint {self.season} synced {self.synced_at}>'
+
+    @staticmethod
+    def hash_row(row):
+        """Stable digest of an imported row dict."""
+        payload = json.dumps(row, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @staticmethod
+    def hash_frame(row_hashes):
+        """Digest of a whole frame from its per-row hashes."""
+        digest = hashlib.sha1()
+        for key in sorted(row_hashes, key=int):
+            digest.update(f'{key}:{row_hashes[key]};'.encode())
+        return digest.hexdigest()
+
+class RaceResult(db.Model):
+    """Model for a driver's result in a race."""
+    __tablename__ = 'race_results'
+
+    id = db.Column(db.Integer, primary_key=True)
+    race_id = db.Column(db.Integer, db.ForeignKey('races.id'), nullable=False)
+    driver_id = db.Column(db.Integer, db.ForeignKey('drivers.id'), nullable=False)
+    grid_position = db.Column(db.Integer, nullable=True)  # 0 for a pit lane start
+    position = db.Column(db.Integer, nullable=True)  # Classified finishing position, None if not classified
+    classification = db.Column(db.String(1), nullable=True)  # FastF1 code for non-finishers: R, D, E, W, F, N
+    status = db.Column(db.String(50), nullable=True)  # e.g. Finished, +1 Lap, Engine
+    fastest_lap = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    race = db.relationship('Race', backref=db.backref('results', lazy='dynamic', cascade='all, delete-orphan'))
+    driver = db.relationship('Driver', backref=db.backref('results', lazy='dynamic'))
+
+    # Unique constraint to prevent duplicate results for a driver in a race
+    __table_args__ = (
+        db.UniqueConstraint('race_id', 'driver_id', name='uix_race_driver'),
+    )
+
+    # Non-finisher classifications mapped onto the scoring status codes
+    SCORING_STATUS = {'R': 'DNF', 'N': 'DNF', 'D': 'DSQ', 'E': 'DSQ', 'W': 'DNS', 'F': 'DNS'}
+
+    @property
+    def scoring_position(self):
+        """Position or status string as understood by the scoring engine."""
+        if self.position:
+            return self.position
+        return self.SCORING_STATUS.get(self.classification)
+
+    def __repr__(self):
+        return f'<RaceResult race={self.race_id} driver={self.driver_id}: {self.position or self.classification}>'
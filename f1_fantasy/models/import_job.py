@@ -0,0 +1,142 @@
+import os
+import socket
+from datetime import datetime, timedelta
+from . import db
+
+class ImportJob(db.Model):
+    """A queued F1 data import run by the import worker.
+
+    Jobs are claimed by a worker process, which records per-unit (season or
+    round) stats in ``progress`` as it goes, so the admin panel can follow a
+    run by polling this table.
+    """
+    __tablename__ = 'import_jobs'
+
+    KINDS = {
+        'seasons': 'Season data (races and drivers)',
+        'results': 'Race results'
+    }
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # Options: seasons, results
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default='queued',  # Options: queued, running, completed, failed
+                       index=True)
+    progress = db.Column(db.JSON, nullable=False, default=dict)  # {season or round: stats}
+    total_units = db.Column(db.Integer, nullable=False, default=0)
+    completed_units = db.Column(db.Integer, nullable=False, default=0)
+    rows_written = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    worker = db.Column(db.String(100), nullable=True)  # host:pid of the worker running the job
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ImportJob {self.id} {self.kind} {self.status}>'
+
+    @property
+    def is_active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def percent(self):
+        if not self.total_units:
+            return 0
+        return int(100 * self.completed_units / self.total_units)
+
+    @property
+    def elapsed_seconds(self):
+        if not self.started_at:
+            return 0.0
+        return ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed_seconds
+        return self.rows_written / elapsed if elapsed else 0.0
+
+    @property
+    def failed_units(self):
+        return sorted(unit for unit, stats in self.progress.items() if 'error' in stats)
+
+    def to_dict(self):
+        """Compact status for the admin panel's polling endpoint."""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'status': self.status,
+            'percent': self.percent,
+            'completed_units': self.completed_units,
+            'total_units': self.total_units,
+            'rows_written': self.rows_written,
+            'rows_per_second': round(self.rows_per_second, 1),
+            'elapsed_seconds': round(self.elapsed_seconds, 1),
+            'failed_units': self.failed_units,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    @classmethod
+    def enqueue(cls, kind, params, total_units, user_id=None):
+        """Queue a job for the import worker."""
+        job = cls(kind=kind, params=params, total_units=total_units, progress={}, created_by=user_id)
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @classmethod
+    def claim_next(cls):
+        """Atomically claim the oldest queued job for this process, or None.
+
+        The claim is a conditional UPDATE, so two workers polling the same
+        table never run the same job.
+        """
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        while True:
+            job_id = (db.session.query(cls.id).filter_by(status='queued')
+                      .order_by(cls.created_at, cls.id).limit(1).scalar())
+            if job_id is None:
+                return None
+            now = datetime.utcnow()
+            claimed = (cls.query.filter_by(id=job_id, status='queued')
+                       .update({'status': 'running', 'worker': worker, 'started_at': now, 'heartbeat_at': now},
+                               synchronize_session=False))
+            db.session.commit()
+            if claimed:
+                return db.session.get(cls, job_id)
+
+    @classmethod
+    def requeue_stale(cls, timeout=timedelta(minutes=15)):
+        """Put running jobs whose worker stopped heart-beating back in the queue."""
+        stale = (cls.query.filter(cls.status == 'running', cls.heartbeat_at < datetime.utcnow() - timeout)
+                 .update({'status': 'queued', 'worker': None}, synchronize_session=False))
+        db.session.commit()
+        return stale
+
+    @classmethod
+    def recent(cls, limit=10):
+        """Most recent jobs, newest first."""
+        return cls.query.order_by(cls.created_at.desc(), cls.id.desc()).limit(limit).all()
+
+    def record_progress(self, unit, stats, rows=0):
+        """Store a finished unit's stats and bump the heartbeat (commits)."""
+        self.progress = dict(self.progress, **{str(unit): stats})
+        self.completed_units = len(self.progress)
+        self.rows_written += rows
+        self.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+
+    def finish(self, error=None):
+        """Mark the job completed, or failed with ``error`` (commits)."""
+        self.status = 'failed' if error or self.failed_units else 'completed'
+        if error:
+            self.error = error
+        elif self.failed_units:
+            self.error = f'Failed: {", ".join(self.failed_units)}'
+        self.finished_at = datetime.utcnow()
+        db.session.commit()
@@ -1,6 +1,9 @@
 from datetime import datetime
 from . import db
+from sqlalchemy import event
 from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import Session
+from ..utils.scoring import rules_for_point_system, score_position
 
 class LeagueMember(db.Model):
     __tablename__ = 'league_members'
@@ -35,7 +38,7 @@ class League(db.Model):
     max_teams = db.Column(db.Integer, default=10)
     draft_type = db.Column(db.String(20), default='snake',  # Options: snake, auction, random
                           nullable=False)
-    point_system = db.Column(db.String(20), default='f1_default',  # Options: f1_default, simple, points_race
+    point_system = db.Column(db.String(20), default='f1_default',  # Options: f1_default, simple, points_race, custom
                            nullable=False)
     status = db.Column(db.String(20), default='setup',  # Options: setup, active, completed
                       nullable=False)
@@ -52,6 +55,8 @@ class League(db.Model):
     teams = db.relationship('Team', backref='league', lazy='dynamic', cascade='all, delete-orphan')
     member_links = db.relationship('LeagueMember', back_populates='league', cascade='all, delete-orphan')
     members = association_proxy('member_links', 'user')
+    scoring_rule = db.relationship('ScoringRule', back_populates='league', uselist=False,
+                                   cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<League {self.name}>'
@@ -79,34 +84,42 @@ class League(db.Model):
         return (self.status == 'setup' and 
                 self.teams.count() > 1)
 
+    def compiled_scoring(self):
+        """Get the compiled scoring rules for this league's point system."""
+        if self.point_system == 'custom' and self.scoring_rule:
+            return self.scoring_rule.compile()
+        return rules_for_point_system(self.point_system)
+
     def get_points_for_position(self, position):
         """Get points for a given position based on the league's point system."""
-        if position is None or position == 'DNF' or position == 'DNS' or position == 'DSQ':
-            return 0
-            
-        position = int(position)
-        
-        if self.point_system == 'f1_default':
-            # F1 default scoring system
-            points = {
-                1: 25, 2: 18, 3: 15, 4: 12, 5: 10,
-                6: 8, 7: 6, 8: 4, 9: 2, 10: 1
-            }
-            return points.get(position, 0)
-            
-        elif self.point_system == 'simple':
-            # Simple scoring: 1st = 20, 2nd = 19, ..., 20th = 1
-            if 1 <= position <= 20:
-                return 21 - position
-            return 0
-            
-        elif self.point_system == 'points_race':
-            # Points Race: 10th = 10, 9th/11th = 9, 8th/12th = 8, etc.
-            if position == 10:
-                return 10
-            elif 1 <= position <= 20:
-                distance_from_10 = abs(position - 10)
-                return max(10 - distance_from_10, 1)
-            return 0
-            
-        return 0
\ No newline at end of file
+        return score_position(self.compiled_scoring(), position)
+
+    @property
+    def version(self):
+        """Changes whenever the league page would: see ``touch``."""
+        return (self.updated_at or self.created_at).isoformat()
+
+    @classmethod
+    def touch(cls, *league_ids, connection=None):
+        """Mark leagues as changed, invalidating their cached page fragments.
+
+        Flushed changes to a league's teams, members, odds, draft or standings do this
+        automatically; call it after bulk UPDATEs, which skip flush events.
+        """
+        if league_ids:
+            (connection or db.session).execute(
+                cls.__table__.update().where(cls.__table__.c.id.in_(league_ids)).values(updated_at=datetime.utcnow()))
+
+
+@event.listens_for(Session, 'after_flush')
+def _touch_changed_leagues(session, flush_context):
+    # Rows shown on the league, team and standings pages, which are cached by League.version
+    from . import Team, LeagueOdds, Draft, TeamStanding
+    shown = (Team, LeagueMember, LeagueOdds, Draft, TeamStanding)
+    league_ids = {obj.league_id for obj in session.new | session.deleted if isinstance(obj, shown)}
+    league_ids.update(obj.league_id for obj in session.dirty
+                      if isinstance(obj, shown) and session.is_modified(obj))
+    league_ids.discard(None)
+    # Leagues changed directly get a new updated_at from its onupdate
+    if league_ids:
+        League.touch(*league_ids, connection=session.connection())
@@ -0,0 +1,75 @@
+from datetime import datetime
+from sqlalchemy import select
+from . import db
+
+class LeagueOdds(db.Model):
+    """Cached championship odds for a team, computed after a given round.
+
+    Rows are written by the ``simulate-odds`` command so league pages only
+    ever read stored odds and never run a simulation in a request.
+    """
+    __tablename__ = 'league_odds'
+
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)  # Last scored round the odds start from
+    p_first = db.Column(db.Float, nullable=False, default=0.0)
+    p_top3 = db.Column(db.Float, nullable=False, default=0.0)
+    expected_points = db.Column(db.Float, nullable=False, default=0.0)
+    rank_probabilities = db.Column(db.JSON, nullable=True)  # P(final position) per position
+    simulations = db.Column(db.Integer, nullable=False)
+    seed = db.Column(db.Integer, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    team = db.relationship('Team', backref=db.backref('odds', lazy='dynamic',
+                                                      cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.UniqueConstraint('league_id', 'season', 'round', 'team_id', name='uix_league_round_team_odds'),
+    )
+
+    def __repr__(self):
+        return f'<LeagueOdds team={self.team_id} {self.season} R{self.round}: {self.p_first:.3f}>'
+
+    @classmethod
+    def exists_for(cls, league_id, season, round):
+        """Check whether odds have already been computed for a league round."""
+        return db.session.query(cls.id).filter_by(
+            league_id=league_id, season=season, round=round).first() is not None
+
+    @classmethod
+    def store(cls, league_id, simulation, simulations, seed):
+        """Replace the cached odds for a league round with a simulation result."""
+        season, round = simulation['season'], simulation['round']
+        cls.query.filter_by(league_id=league_id, season=season, round=round).delete()
+        for team_id, odds in simulation['odds'].items():
+            db.session.add(cls(
+                league_id=league_id,
+                team_id=team_id,
+                season=season,
+                round=round,
+                p_first=odds['p_first'],
+                p_top3=odds['p_top3'],
+                expected_points=odds['expected_points'],
+                rank_probabilities=odds['rank_probabilities'],
+                simulations=simulations,
+                seed=seed
+            ))
+        db.session.commit()
+
+    @classmethod
+    def for_league(cls, league_id):
+        """Get the most recently computed odds for a league, keyed by team id."""
+        latest = (select(cls.id)
+                  .where(cls.league_id == league_id)
+                  .order_by(cls.season.desc(), cls.round.desc())
+                  .limit(1)
+                  .scalar_subquery())
+        latest_row = select(cls.season, cls.round).where(cls.id == latest).subquery()
+        rows = cls.query.join(latest_row, db.and_(
+            cls.season == latest_row.c.season,
+            cls.round == latest_row.c.round
+        )).filter(cls.league_id == league_id).all()
+        return {row.team_id: row for row in rows}
@@ -0,0 +1,32 @@
+from datetime import datetime
+from . import db
+from ..utils.scoring import compile_rules
+
+DEFAULT_POSITION_POINTS = '25,18,15,12,10,8,6,4,2,1'
+
+class ScoringRule(db.Model):
+    """Custom scoring table for a league using the 'custom' point system.
+
+    The record is kept compact (points list as a comma-separated string plus
+    three integers) and compiled into lookup arrays once per worker.
+    """
+    __tablename__ = 'scoring_rules'
+
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'), nullable=False, unique=True)
+    position_points = db.Column(db.String(200), nullable=False, default=DEFAULT_POSITION_POINTS)
+    fastest_lap_bonus = db.Column(db.Integer, nullable=False, default=0)
+    positions_gained_bonus = db.Column(db.Integer, nullable=False, default=0)  # Per position gained
+    dnf_penalty = db.Column(db.Integer, nullable=False, default=0)  # Points deducted for a DNF
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    league = db.relationship('League', back_populates='scoring_rule')
+
+    def __repr__(self):
+        return f'<ScoringRule league={self.league_id}: {self.position_points}>'
+
+    def compile(self):
+        """Get the compiled lookup arrays for this rule (cached per worker)."""
+        return compile_rules(self.position_points, self.fastest_lap_bonus,
+                             self.positions_gained_bonus, self.dnf_penalty)
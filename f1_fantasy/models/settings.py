@@ -1,6 +1,70 @@
+import os
+import threading
+import time
 from datetime import datetime
+from flask import current_app
 from f1_fantasy.models import db
 
+
+class _SettingsCache:
+    """Every setting, loaded in one query and kept until the version file changes.
+
+    ``Settings.set`` replaces the version file (``SETTINGS_VERSION_FILE``)
+    after committing, so each worker notices an admin change on its next
+    ``Settings.get`` with a single ``stat`` instead of a query.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.stamp = None
+        self.values = None
+        self.lock = threading.Lock()
+
+    def version(self):
+        """The version file's identity; a replaced file always differs."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.bump()
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def bump(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp = f'{self.path}.{os.getpid()}.{threading.get_ident()}'
+            with open(temp, 'w') as f:
+                f.write(str(time.time_ns()))
+            os.replace(temp, self.path)
+        except OSError:
+            current_app.logger.warning('Could not write the settings version file %s', self.path)
+
+    def get(self, key, default=None):
+        stamp = self.version()
+        if stamp is None:
+            # Without a version file other workers' changes can't be seen: don't cache
+            setting = Settings.query.filter_by(key=key).first()
+            return setting.value if setting else default
+        with self.lock:
+            if stamp != self.stamp:
+                # Stamped before loading, so a change committed meanwhile is reloaded next time
+                self.values = dict(db.session.query(Settings.key, Settings.value))
+                self.stamp = stamp
+            return self.values.get(key, default)
+
+
+def _settings_cache():
+    cache = current_app.extensions.get('settings_cache')
+    if cache is None:
+        path = current_app.config.get('SETTINGS_VERSION_FILE') or os.path.join(current_app.instance_path,
+                                                                               'settings.version')
+        cache = current_app.extensions.setdefault('settings_cache', _SettingsCache(path))
+    return cache
+
+
 class Settings(db.Model):
     """Application-wide settings model."""
     __tablename__ = 'settings'
@@ -18,9 +82,8 @@ class Settings(db.Model):
 
     @classmethod
     def get(cls, key, default=None):
-        """Get a setting value by key."""
-        setting = cls.query.filter_by(key=key).first()
-        return setting.value if setting else default
+        """Get a setting value by key (from this worker's settings cache)."""
+        return _settings_cache().get(key, default)
 
     @classmethod
     def set(cls, key, value, description=None, category='general', user_id=None):
@@ -36,8 +99,42 @@ class Settings(db.Model):
         setting.updated_at = datetime.utcnow()
         db.session.add(setting)
         db.session.commit()
+        _settings_cache().bump()
         return setting
 
+    @classmethod
+    def set_many(cls, values, category='general', user_id=None):
+        """Save several settings in one transaction and record one audit entry.
+
+        ``values`` maps each key to its value, or to (value, description).
+        Returns the audit entry, which lists the keys whose value changed.
+        """
+        values = {key: value if isinstance(value, tuple) else (value, None) for key, value in values.items()}
+        existing = {setting.key: setting for setting in cls.query.filter(cls.key.in_(values))}
+        now = datetime.utcnow()
+        changes = {}
+        for key, (value, description) in values.items():
+            setting = existing.get(key)
+            if setting is None:
+                setting = cls(key=key, category=category)
+                db.session.add(setting)
+            elif setting.value == value and (not description or setting.description == description):
+                continue
+            if setting.value != value:
+                changes[key] = {'old': setting.value, 'new': value}
+            setting.value = value
+            if description:
+                setting.description = description
+            if user_id:
+                setting.updated_by = user_id
+            setting.updated_at = now
+        audit = SettingsAudit(category=category, changes=changes, user_id=user_id, created_at=now)
+        db.session.add(audit)
+        db.session.commit()
+        if changes:
+            _settings_cache().bump()
+        return audit
+
     @classmethod
     def get_all_by_category(cls, category=None):
         """Get all settings, optionally filtered by category."""
@@ -49,4 +146,28 @@ class Settings(db.Model):
     @classmethod
     def get_categories(cls):
         """Get list of all setting categories."""
-        return db.session.query(cls.category).distinct().all() 
\ No newline at end of file
+        return db.session.query(cls.category).distinct().all() 
+
+
+class SettingsAudit(db.Model):
+    """One saved settings form: who saved it and which values changed."""
+    __tablename__ = 'settings_audit'
+
+    id = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.String(32), nullable=False, default='general')
+    changes = db.Column(db.JSON, nullable=False, default=dict)  # {key: {'old': value, 'new': value}}
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    user = db.relationship('User')
+
+    def __repr__(self):
+        return f'<SettingsAudit {self.id} {self.category}>'
+
+    @classmethod
+    def recent(cls, limit=5, category=None):
+        """Most recent saves first, optionally of one category."""
+        query = cls.query
+        if category:
+            query = query.filter_by(category=category)
+        return query.order_by(cls.created_at.desc(), cls.id.desc()).limit(limit).all()
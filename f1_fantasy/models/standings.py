@@ -0,0 +1,167 @@
+import hashlib
+import json
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+from . import db
+from .team import Team
+from ..utils.scoring import encode_results, rules_fingerprint, score_results
+
+# Standing-like row for leagues that have no applied races yet
+ProvisionalStanding = namedtuple('ProvisionalStanding', 'rank team points total_points')
+
+class TeamStanding(db.Model):
+    """Per-race standings snapshot for a team in a league.
+
+    One row is written for every team in the league each time a race result
+    is applied, so the table holds the full standings history and any
+    "as of round N" view is a single indexed read.
+    """
+    __tablename__ = 'team_standings'
+
+    id = db.Column(db.Integer, primary_key=True)
+    league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    race_id = db.Column(db.Integer, db.ForeignKey('races.id'), nullable=False)
+    # Denormalized from Race so standings can be ordered without a join
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)
+    points = db.Column(db.Integer, nullable=False, default=0)  # Points scored in this race
+    total_points = db.Column(db.Integer, nullable=False, default=0)  # Running total after this race
+    rank = db.Column(db.Integer, nullable=False)
+    results = db.Column(db.JSON, nullable=True)  # Result columns the points were computed from
+    input_hash = db.Column(db.String(40), nullable=True)  # Digest of scoring rules + results
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    team = db.relationship('Team', backref=db.backref('standings', lazy='dynamic',
+                                                      cascade='all, delete-orphan'))
+    race = db.relationship('Race')
+
+    __table_args__ = (
+        db.UniqueConstraint('team_id', 'race_id', name='uix_team_race'),
+        db.Index('ix_team_standings_league_round_rank', 'league_id', 'season', 'round', 'rank'),
+    )
+
+    def __repr__(self):
+        return f'<TeamStanding team={self.team_id} {self.season} R{self.round}: {self.total_points}>'
+
+    @staticmethod
+    def rank_totals(totals):
+        """Rank totals descending; ties share a rank (1, 2, 2, 4)."""
+        ordered = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        ranks = {}
+        for index, (team_id, total) in enumerate(ordered):
+            if index and total == ordered[index - 1][1]:
+                ranks[team_id] = ranks[ordered[index - 1][0]]
+            else:
+                ranks[team_id] = index + 1
+        return ranks
+
+    @staticmethod
+    def hash_inputs(fingerprint, results):
+        """Digest of the inputs a row's points depend on."""
+        digest = hashlib.sha1(fingerprint.encode())
+        digest.update(json.dumps(results, sort_keys=True, separators=(',', ':')).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def score_team_results(cls, league, results):
+        """Score one team's result columns for a race under the league's rules."""
+        positions = results.get('position', []) if results else []
+        if not positions:
+            return 0
+        return int(score_results(league.compiled_scoring(), encode_results(positions),
+                                 grid=results.get('grid'), fastest_lap=results.get('fastest_lap')).sum())
+
+    @classmethod
+    def apply_race(cls, league, race, team_results):
+        """Apply a race result to a league's standings.
+
+        ``team_results`` maps team id to that team's result columns for the
+        race, e.g. ``{'position': [3, 'DNF'], 'grid': [5, 2],
+        'fastest_lap': [True, False]}`` (grid and fastest_lap are optional).
+        Teams missing from the mapping score zero for the race. The previous
+        round's totals are read once and the new snapshot is written
+        incrementally on top of them.
+        """
+        later = cls.query.filter(
+            cls.league_id == league.id,
+            cls.season == race.season,
+            cls.round > race.round
+        ).first()
+        if later:
+            raise ValueError(f'League {league.id} already has standings after round {race.round}; '
+                             'rescore the season instead')
+
+        previous = {row.team_id: row.total_points
+                    for row in cls._rows_as_of(league.id, race.season, race.round - 1)}
+        existing = {row.team_id: row
+                    for row in cls.query.filter_by(league_id=league.id, race_id=race.id)}
+        teams = Team.query.filter_by(league_id=league.id).all()
+        fingerprint = rules_fingerprint(league.compiled_scoring())
+
+        race_points = {}
+        totals = {}
+        for team_id in (team.id for team in teams):
+            race_points[team_id] = cls.score_team_results(league, team_results.get(team_id))
+            totals[team_id] = previous.get(team_id, 0) + race_points[team_id]
+        ranks = cls.rank_totals(totals)
+
+        for team in teams:
+            team_id = team.id
+            standing = existing.get(team_id)
+            if not standing:
+                standing = cls(league_id=league.id, team_id=team_id, race_id=race.id,
+                               season=race.season, round=race.round)
+                db.session.add(standing)
+            standing.points = race_points[team_id]
+            standing.total_points = totals[team_id]
+            standing.rank = ranks[team_id]
+            standing.results = team_results.get(team_id)
+            standing.input_hash = cls.hash_inputs(fingerprint, standing.results)
+            # Keep Team.points in sync with the latest running total
+            team.points = totals[team_id]
+
+        db.session.commit()
+        return ranks
+
+    @classmethod
+    def _rows_as_of(cls, league_id, season=None, round=None):
+        """Build the query for the snapshot at the latest round <= ``round``."""
+        if season is None:
+            season = (select(func.max(cls.season))
+                      .where(cls.league_id == league_id)
+                      .scalar_subquery())
+        latest_round = select(func.max(cls.round)).where(cls.league_id == league_id,
+                                                         cls.season == season)
+        if round is not None:
+            latest_round = latest_round.where(cls.round <= round)
+        return cls.query.filter(
+            cls.league_id == league_id,
+            cls.season == season,
+            cls.round == latest_round.scalar_subquery()
+        ).order_by(cls.rank, cls.team_id)
+
+    @classmethod
+    def for_league(cls, league_id, season=None, round=None):
+        """Get a league's standings, optionally as of a given season/round.
+
+        Defaults to the latest applied round of the latest season.
+        """
+        return cls._rows_as_of(league_id, season, round).options(joinedload(cls.team)).all()
+
+    @classmethod
+    def provisional(cls, league_id):
+        """Standings for a league with no applied races, ordered by Team.points."""
+        teams = Team.query.filter_by(league_id=league_id).order_by(Team.points.desc(), Team.id).all()
+        ranks = cls.rank_totals({team.id: team.points or 0 for team in teams})
+        return [ProvisionalStanding(ranks[team.id], team, 0, team.points or 0) for team in teams]
+
+    @classmethod
+    def rounds_for_league(cls, league_id, season):
+        """Get the rounds that have applied standings for a league season."""
+        return [round for (round,) in db.session.query(cls.round)
+                .filter(cls.league_id == league_id, cls.season == season)
+                .distinct().order_by(cls.round)]
@@ -0,0 +1,164 @@
+"""Auction drafts.
+
+Teams take turns nominating a driver (the nomination rotation is the
+draft's pick order, skipping full rosters), which opens a timed lot.
+Any team with a free roster spot may then outbid the high bid until the
+lot closes; late bids extend the clock. The winner pays from
+``Team.budget`` and the driver becomes a DraftPick, so rosters, the
+draft room stream and the simulation treat auctions like any other draft.
+
+Bids never lock tables. ``AuctionLot.version`` is a SQLAlchemy version
+counter, so a bid's UPDATE only applies if nobody changed the lot since
+it was read; the loser of a race re-reads the lot and is revalidated
+against the new high bid.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from ..models import db, League, Team, Draft, DraftPick, AuctionLot, AuctionBid
+from .draft import DraftError, DraftState, get_state
+
+MIN_BID = 1
+LOT_SECONDS = 30  # How long a lot stays open after nomination
+EXTEND_SECONDS = 10  # A bid in the closing seconds keeps the lot open at least this long
+BID_RETRIES = 5
+
+
+def open_lot(draft: Draft) -> Optional[AuctionLot]:
+    return AuctionLot.query.filter_by(draft_id=draft.id, status='open').first()
+
+
+def nominating_team(draft: Draft, state: DraftState) -> Optional[int]:
+    """Team due to nominate next: the next in rotation with a free roster spot."""
+    if state.is_complete:
+        return None
+    teams = list(state.rosters)
+    start = state.next_pick % len(teams)
+    for offset in range(len(teams)):
+        team_id = teams[(start + offset) % len(teams)]
+        if state.roster_size(team_id) < draft.rounds:
+            return team_id
+    return None
+
+
+def max_bid(draft: Draft, state: DraftState, team: Team) -> int:
+    """Most a team may bid while keeping the minimum bid for each other open spot."""
+    open_spots = draft.rounds - state.roster_size(team.id)
+    if open_spots <= 0:
+        return 0
+    return int(team.budget or 0) - (open_spots - 1) * MIN_BID
+
+
+def nominate(draft: Draft, team_id: int, driver_id: int, amount: int = MIN_BID,
+             user_id: Optional[int] = None, lot_seconds: int = LOT_SECONDS) -> AuctionLot:
+    """Open a lot for a driver with the nominating team's opening bid."""
+    close_expired_lots(draft)
+    state = get_state(draft)
+    if state.is_complete:
+        raise DraftError('The draft is already complete.')
+    if open_lot(draft) is not None:
+        raise DraftError('Bidding on the current lot has not closed yet.')
+    if team_id != nominating_team(draft, state):
+        raise DraftError('It is not your turn to nominate.')
+    bit = state.bits.get(driver_id)
+    if bit is None or not state.available & bit:
+        raise DraftError('That driver is not available.')
+    limit = max_bid(draft, state, db.session.get(Team, team_id))
+    if not MIN_BID <= amount <= limit:
+        raise DraftError(f'Opening bids must be between {MIN_BID} and {limit}.')
+
+    now = datetime.utcnow()
+    # One lot per pick: the lot number is the pick its winner will fill, and
+    # its unique constraint settles nominations racing from two workers
+    lot = AuctionLot(draft_id=draft.id, lot_number=state.next_pick, driver_id=driver_id, nominated_by=team_id,
+                     high_bid=amount, high_team_id=team_id, opened_at=now,
+                     closes_at=now + timedelta(seconds=lot_seconds))
+    db.session.add(lot)
+    db.session.add(AuctionBid(lot=lot, team_id=team_id, amount=amount, made_by=user_id))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise DraftError('Another nomination was just made; please try again.')
+    return lot
+
+
+def place_bid(lot_id: int, team_id: int, amount: int, user_id: Optional[int] = None) -> AuctionLot:
+    """Raise the high bid on an open lot.
+
+    Raises DraftError if the bid is invalid, including when a concurrent
+    bid that committed first has made it too low.
+    """
+    for _ in range(BID_RETRIES):
+        lot = db.session.get(AuctionLot, lot_id, populate_existing=True)
+        if lot is None:
+            raise DraftError('No such lot.')
+        now = datetime.utcnow()
+        if not lot.is_open or now >= lot.closes_at:
+            raise DraftError('Bidding on this lot has closed.')
+        if lot.high_team_id == team_id:
+            raise DraftError('You already hold the high bid.')
+        if amount <= lot.high_bid:
+            raise DraftError(f'Bids must be at least {lot.high_bid + 1}.')
+        team = db.session.get(Team, team_id)
+        if team is None or team.league_id != lot.draft.league_id:
+            raise DraftError('That team is not part of this draft.')
+        limit = max_bid(lot.draft, get_state(lot.draft), team)
+        if amount > limit:
+            raise DraftError(f'You can bid at most {limit}.')
+
+        lot.high_bid = amount
+        lot.high_team_id = team_id
+        lot.bids += 1
+        lot.closes_at = max(lot.closes_at, now + timedelta(seconds=EXTEND_SECONDS))
+        db.session.add(AuctionBid(lot_id=lot.id, team_id=team_id, amount=amount, made_by=user_id))
+        try:
+            db.session.commit()
+            return lot
+        except StaleDataError:
+            # Another bid changed the lot since we read it: revalidate against it
+            db.session.rollback()
+    raise DraftError('The bidding is too busy right now; please bid again.')
+
+
+def close_lot(lot: AuctionLot) -> Optional[DraftPick]:
+    """Sell an expired lot to the high bidder; returns the resulting pick.
+
+    Returns None if the lot is still running or another worker (or a last
+    bid) changed it first.
+    """
+    now = datetime.utcnow()
+    if not lot.is_open or now < lot.closes_at:
+        return None
+    draft = lot.draft
+    state = get_state(draft)
+    with state.lock:
+        # The budget UPDATE autoflushes the lot and the pick, so a concurrent
+        # close can fail there as well as at the commit
+        try:
+            lot.status = 'sold'
+            lot.closed_at = now
+            pick = DraftPick(draft_id=draft.id, pick_number=lot.lot_number, team_id=lot.high_team_id,
+                             driver_id=lot.driver_id)
+            db.session.add(pick)
+            Team.query.filter_by(id=lot.high_team_id).update({Team.budget: Team.budget - lot.high_bid})
+            League.touch(draft.league_id)  # The budget UPDATE above skips flush events
+            if lot.lot_number + 1 == len(draft.pick_order):
+                draft.status = 'completed'
+                draft.completed_at = now
+                draft.league.status = 'active'
+            db.session.commit()
+        except (StaleDataError, IntegrityError):
+            db.session.rollback()
+            return None
+        state.apply(pick.team_id, pick.driver_id)
+    return pick
+
+
+def close_expired_lots(draft: Optional[Draft] = None) -> int:
+    """Close every lot past its deadline (of one draft, or all); returns how many sold."""
+    query = AuctionLot.query.filter(AuctionLot.status == 'open', AuctionLot.closes_at <= datetime.utcnow())
+    if draft is not None:
+        query = query.filter(AuctionLot.draft_id == draft.id)
+    return sum(1 for lot in query.all() if close_lot(lot) is not None)
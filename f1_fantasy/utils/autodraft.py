@@ -0,0 +1,156 @@
+"""Autodraft for snake and random drafts.
+
+Each worker keeps an ``AutodraftQueue`` per draft next to its DraftState:
+a heap of the season's drivers by projected points under the league's
+rules, plus a heap per team built from the owner's personal ranking.
+Drafted drivers are dropped lazily as they reach the top, so choosing a
+pick is O(log n) amortised instead of a scan and sort of every driver.
+
+A team is autodrafted once its pick timer runs out, or straight away if
+its owner switched autodraft on.
+"""
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from ..models import db, League, Driver, RaceResult, Draft, DraftPick, DraftRanking
+from .draft import DraftError, DraftState, get_state, make_pick
+from .scoring import encode_results, score_results
+
+
+def projected_points(league: League, season: int) -> Dict[int, float]:
+    """Average points per race of each of the season's drivers under the league's rules.
+
+    Drivers without results yet in ``season`` are projected from the
+    previous season (matched by driver code, else number).
+    """
+    drivers = Driver.query.filter(Driver.season.in_([season, season - 1])).all()
+    current = [driver for driver in drivers if driver.season == season]
+    previous = {driver.code or driver.driver_number: driver.id for driver in drivers if driver.season != season}
+
+    results = {}
+    for driver_id, position, classification, grid, fastest_lap in (
+            db.session.query(RaceResult.driver_id, RaceResult.position, RaceResult.classification,
+                             RaceResult.grid_position, RaceResult.fastest_lap)
+            .filter(RaceResult.driver_id.in_([driver.id for driver in drivers]))):
+        position = position or RaceResult.SCORING_STATUS.get(classification)
+        results.setdefault(driver_id, []).append((position, grid or 0, fastest_lap))
+
+    rules = league.compiled_scoring()
+    projected = {}
+    for driver in current:
+        rows = results.get(driver.id) or results.get(previous.get(driver.code or driver.driver_number), [])
+        if not rows:
+            projected[driver.id] = 0.0
+            continue
+        positions, grid, fastest_lap = zip(*rows)
+        points = score_results(rules, encode_results(positions), grid=grid, fastest_lap=fastest_lap)
+        projected[driver.id] = float(np.mean(points))
+    return projected
+
+
+class AutodraftQueue:
+    """Best-available heaps for one draft."""
+
+    def __init__(self, projected: Dict[int, float]):
+        self.projected = projected
+        self.best = [(-points, driver_id) for driver_id, points in projected.items()]
+        heapq.heapify(self.best)
+        self.rankings: Dict[int, tuple] = {}  # team id: (ranking updated_at, heap)
+
+    def sync_ranking(self, team_id: int, ranking: Optional[DraftRanking]):
+        """Rebuild a team's ranking heap if its ranking changed since it was built."""
+        stamp = ranking.updated_at if ranking else None
+        if team_id in self.rankings and self.rankings[team_id][0] == stamp:
+            return
+        # Entries are (rank, driver id), so the ranking in order is already a heap
+        heap = [(rank, driver_id) for rank, driver_id in enumerate(ranking.driver_ids)] if ranking else []
+        self.rankings[team_id] = (stamp, heap)
+
+    @staticmethod
+    def _top(heap: List[tuple], state: DraftState) -> Optional[int]:
+        while heap:
+            driver_id = heap[0][1]
+            if state.available & state.bits.get(driver_id, 0):
+                return driver_id
+            heapq.heappop(heap)
+        return None
+
+    def best_available(self, team_id: int, state: DraftState) -> Optional[int]:
+        """The team's highest ranked available driver, else the best projected one."""
+        ranking = self.rankings.get(team_id)
+        if ranking:
+            driver_id = self._top(ranking[1], state)
+            if driver_id is not None:
+                return driver_id
+        return self._top(self.best, state)
+
+
+_queues: Dict[int, AutodraftQueue] = {}
+_registry_lock = threading.Lock()
+
+
+def autodraft_queue(draft: Draft) -> AutodraftQueue:
+    """The worker's autodraft heaps for a draft, built on first use."""
+    with _registry_lock:
+        queue = _queues.get(draft.id)
+        if queue is None:
+            queue = _queues[draft.id] = AutodraftQueue(projected_points(draft.league, draft.season))
+        return queue
+
+
+def autopick(draft: Draft) -> DraftPick:
+    """Draft the best valid driver for the team on the clock."""
+    state = get_state(draft)
+    team_id = state.on_clock
+    if team_id is None:
+        raise DraftError('The draft is already complete.')
+    queue = autodraft_queue(draft)
+    ranking = DraftRanking.query.filter_by(team_id=team_id).first()
+    with state.lock:
+        queue.sync_ranking(team_id, ranking)
+        driver_id = queue.best_available(team_id, state)
+    if driver_id is None:
+        raise DraftError('No drivers are left to draft.')
+    return make_pick(draft, team_id, driver_id)
+
+
+def clock_started_at(draft: Draft) -> datetime:
+    """When the team on the clock went on it: the last pick, or the draft's start."""
+    last_pick = db.session.query(db.func.max(DraftPick.created_at)).filter_by(draft_id=draft.id).scalar()
+    return last_pick or draft.started_at
+
+
+def pick_deadline(draft: Draft) -> Optional[datetime]:
+    if not draft.pick_seconds:
+        return None
+    return clock_started_at(draft) + timedelta(seconds=draft.pick_seconds)
+
+
+def run_due_autopicks(draft: Draft) -> int:
+    """Autodraft every team whose timer ran out or that opted in; returns picks made."""
+    if draft.draft_type == 'auction' or draft.status != 'active':
+        return 0
+    made = 0
+    while True:
+        state = get_state(draft)
+        if state.is_complete:
+            break
+        deadline = pick_deadline(draft)
+        ranking = DraftRanking.query.filter_by(team_id=state.on_clock).first()
+        if not (ranking and ranking.autodraft) and (deadline is None or datetime.utcnow() < deadline):
+            break
+        try:
+            autopick(draft)
+        except DraftError:
+            # Someone else picked first (or nobody is left); their pick restarts the clock
+            break
+        made += 1
+    return made
+
+
+def run_all_due_autopicks() -> int:
+    """Run due autopicks for every active timed or opted-in draft."""
+    drafts = Draft.query.filter(Draft.status == 'active', Draft.draft_type != 'auction').all()
+    return sum(run_due_autopicks(draft) for draft in drafts)
@@ -0,0 +1,84 @@
+"""Natural-key bulk upserts.
+
+Rows are written with a single executemany per table using the dialect's
+native upsert (``ON CONFLICT ... DO UPDATE`` on SQLite/PostgreSQL,
+``ON DUPLICATE KEY UPDATE`` on MySQL), keyed on a unique constraint rather
+than the surrogate primary key. Re-running the same upsert is idempotent.
+"""
+from datetime import datetime
+from typing import Dict, List, Sequence
+from ..models import db
+
+# Columns that are never overwritten by an upsert
+_PRESERVED_COLUMNS = ('id', 'created_at')
+
+
+def _dialect_insert(dialect: str):
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        return None
+    return insert
+
+
+def bulk_upsert(model, rows: List[Dict], conflict_columns: Sequence[str],
+                insert_only: Sequence[str] = ()) -> int:
+    """Insert or update ``rows`` of ``model`` keyed on ``conflict_columns``.
+
+    Every row must have the same keys. ``insert_only`` columns are written
+    for new rows but left alone on existing ones. ``updated_at`` is stamped
+    on all rows when the model has that column. Runs inside the caller's
+    transaction and does not commit. Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+
+    table = model.__table__
+    if 'updated_at' in table.c:
+        now = datetime.utcnow()
+        rows = [dict(row, updated_at=now) for row in rows]
+    update_columns = [key for key in rows[0]
+                      if key not in conflict_columns and key not in _PRESERVED_COLUMNS
+                      and key not in insert_only]
+
+    dialect = db.session.get_bind().dialect.name
+    insert = _dialect_insert(dialect)
+    if insert is None:
+        return _upsert_by_lookup(model, rows, conflict_columns, update_columns)
+
+    stmt = insert(table)
+    if dialect in ('mysql', 'mariadb'):
+        stmt = stmt.on_duplicate_key_update({key: stmt.inserted[key] for key in update_columns})
+    elif update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={key: stmt.excluded[key] for key in update_columns}
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    db.session.execute(stmt, rows)
+    return len(rows)
+
+
+def _upsert_by_lookup(model, rows: List[Dict], conflict_columns: Sequence[str],
+                      update_columns: Sequence[str]) -> int:
+    """Portable fallback: one lookup query for all keys, then update or add."""
+    key_of = lambda values: tuple(values[column] for column in conflict_columns)
+    columns = [getattr(model, column) for column in conflict_columns]
+    keys = {key_of(row) for row in rows}
+    existing = {}
+    for obj in model.query.filter(db.tuple_(*columns).in_(list(keys))):
+        existing[tuple(getattr(obj, column) for column in conflict_columns)] = obj
+    for row in rows:
+        obj = existing.get(key_of(row))
+        if obj is None:
+            db.session.add(model(**row))
+        else:
+            for key in update_columns:
+                setattr(obj, key, row[key])
+    db.session.flush()
+    return len(rows)
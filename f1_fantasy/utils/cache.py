@@ -0,0 +1,370 @@
+"""Application cache with interchangeable backends.
+
+``CACHE_TYPE`` picks the backend:
+
+- ``simple`` (default): an LRU dict in each worker process, holding at
+  most ``CACHE_THRESHOLD`` entries.
+- ``filesystem``: one pickle file per key under ``CACHE_DIR``, shared by
+  every worker on the host.
+- ``sqlite``: one table in ``CACHE_SQLITE_PATH``, shared by every worker
+  on the host (on Linux it defaults to /dev/shm, so reads never touch disk).
+- ``null``: caches nothing.
+
+Entries expire after ``CACHE_DEFAULT_TIMEOUT`` seconds unless ``set``
+is given its own timeout; 0 means never. Hit and miss counts are kept
+per worker, overall and per memoized function.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from flask import current_app
+
+DEFAULT_TIMEOUT = 300
+DEFAULT_THRESHOLD = 500
+BACKEND_ALIASES = {
+    'simple': 'simple', 'simplecache': 'simple', 'memory': 'simple',
+    'filesystem': 'filesystem', 'filesystemcache': 'filesystem',
+    'sqlite': 'sqlite',
+    'null': 'null', 'nullcache': 'null'
+}
+
+
+class BaseCache:
+    """Expiring key-value store; subclasses implement the ``_`` methods."""
+
+    def __init__(self, default_timeout: int = DEFAULT_TIMEOUT, threshold: int = DEFAULT_THRESHOLD):
+        self.default_timeout = default_timeout
+        self.threshold = threshold
+
+    def expiry(self, timeout: Optional[int]) -> float:
+        timeout = self.default_timeout if timeout is None else timeout
+        return time.time() + timeout if timeout else 0
+
+    def _get(self, key: str) -> Any:
+        """The stored value; raises KeyError if missing or expired."""
+        raise KeyError(key)
+
+    def _set(self, key: str, value: Any, expires: float):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self) -> int:
+        return 0
+
+
+class NullCache(BaseCache):
+    pass
+
+
+class SimpleCache(BaseCache):
+    """Least recently used entries in this process."""
+
+    def __init__(self, default_timeout: int = DEFAULT_TIMEOUT, threshold: int = DEFAULT_THRESHOLD):
+        super().__init__(default_timeout, threshold)
+        self._entries: OrderedDict = OrderedDict()  # key: (expires, value), least recently used first
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _get(self, key):
+        with self._lock:
+            expires, value = self._entries[key]
+            if expires and expires <= time.time():
+                del self._entries[key]
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, expires):
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.threshold:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class FileSystemCache(BaseCache):
+    """One pickle file per key; writes are atomic renames, so readers never see half a file."""
+
+    def __init__(self, cache_dir: str, default_timeout: int = DEFAULT_TIMEOUT, threshold: int = DEFAULT_THRESHOLD):
+        super().__init__(default_timeout, threshold)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def _files(self):
+        return [entry for entry in os.scandir(self.cache_dir) if entry.is_file() and '.' not in entry.name]
+
+    def _get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                expires, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            raise KeyError(key)
+        if expires and expires <= time.time():
+            self.delete(key)
+            raise KeyError(key)
+        return value
+
+    def _set(self, key, value, expires):
+        fd, temp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((expires, value), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, self._path(key))
+        files = self._files()
+        if len(files) > self.threshold:
+            self._prune(files)
+
+    def _prune(self, files):
+        """Drop the least recently written files until back under the threshold."""
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.threshold]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in self._files():
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def size(self):
+        return len(self._files())
+
+
+class SQLiteCache(BaseCache):
+    """A table in a SQLite database shared by every worker on the host."""
+
+    PRUNE_EVERY = 100  # Sets between sweeps of expired and excess rows
+
+    def __init__(self, path: str, default_timeout: int = DEFAULT_TIMEOUT, threshold: int = DEFAULT_THRESHOLD):
+        super().__init__(default_timeout, threshold)
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS cache '
+                         '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL, stored REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_stored ON cache (stored)')
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=10)
+            # Readers never block the writer (or each other)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _get(self, key):
+        row = self._connection().execute('SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None or (row[1] and row[1] <= time.time()):
+            raise KeyError(key)
+        return pickle.loads(row[0])
+
+    def _set(self, key, value, expires):
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO cache (key, value, expires, stored) VALUES (?, ?, ?, ?)',
+                         (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires, time.time()))
+        self._sets += 1
+        if self._sets % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache WHERE expires AND expires <= ?', (time.time(),))
+            conn.execute('DELETE FROM cache WHERE key IN '
+                         '(SELECT key FROM cache ORDER BY stored DESC LIMIT -1 OFFSET ?)', (self.threshold,))
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache')
+
+    def size(self):
+        return self._connection().execute('SELECT count(*) FROM cache').fetchone()[0]
+
+
+def _default_sqlite_path(app) -> str:
+    if os.path.isdir('/dev/shm'):
+        return os.path.join('/dev/shm', f'f1_fantasy-{hashlib.sha1(app.instance_path.encode()).hexdigest()[:8]}',
+                            'cache.sqlite3')
+    return os.path.join(app.instance_path, 'cache.sqlite3')
+
+
+def make_backend(app) -> BaseCache:
+    """The backend named by the app's CACHE_TYPE."""
+    config = app.config
+    cache_type = str(config.get('CACHE_TYPE') or 'simple')
+    backend = BACKEND_ALIASES.get(cache_type.lower())
+    if backend is None:
+        raise ValueError(f'Unknown CACHE_TYPE {cache_type!r}; use one of simple, filesystem, sqlite or null.')
+    options = {
+        'default_timeout': int(config.get('CACHE_DEFAULT_TIMEOUT', DEFAULT_TIMEOUT)),
+        'threshold': int(config.get('CACHE_THRESHOLD', DEFAULT_THRESHOLD))
+    }
+    if backend == 'filesystem':
+        return FileSystemCache(config.get('CACHE_DIR') or os.path.join(app.instance_path, 'cache'), **options)
+    if backend == 'sqlite':
+        return SQLiteCache(config.get('CACHE_SQLITE_PATH') or _default_sqlite_path(app), **options)
+    if backend == 'null':
+        return NullCache(**options)
+    return SimpleCache(**options)
+
+
+def _key_part(value: Any) -> str:
+    # Model instances are keyed by class and primary key, not their (session-bound) state
+    if hasattr(value, '__table__') and getattr(value, 'id', None) is not None:
+        return f'{type(value).__name__}#{value.id}'
+    return repr(value)
+
+
+class Cache:
+    """The app's cache: backend chosen by ``init_app``, plus hit/miss counters."""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['cache'] = {
+            'backend': make_backend(app),
+            'prefix': app.config.get('CACHE_KEY_PREFIX', 'f1_fantasy:'),
+            'stats': {'hits': 0, 'misses': 0, 'sets': 0, 'functions': {}}
+        }
+
+    @property
+    def _state(self) -> Dict:
+        return current_app.extensions['cache']
+
+    @property
+    def backend(self) -> BaseCache:
+        return self._state['backend']
+
+    def _count(self, counter: str, function: Optional[str] = None):
+        stats = self._state['stats']
+        with self._lock:
+            stats[counter] += 1
+            if function:
+                function_stats = stats['functions'].setdefault(function, {'hits': 0, 'misses': 0})
+                function_stats[counter] += 1
+
+    def _lookup(self, key: str, function: Optional[str] = None) -> (bool, Any):
+        try:
+            value = self.backend._get(self._state['prefix'] + key)
+        except KeyError:
+            self._count('misses', function)
+            return False, None
+        self._count('hits', function)
+        return True, value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        hit, value = self._lookup(key)
+        return value if hit else default
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None):
+        """Store ``value``; ``timeout`` seconds overrides CACHE_DEFAULT_TIMEOUT (0 never expires)."""
+        backend = self.backend
+        backend._set(self._state['prefix'] + key, value, backend.expiry(timeout))
+        self._count('sets')
+
+    def delete(self, key: str):
+        self.backend.delete(self._state['prefix'] + key)
+
+    def clear(self):
+        self.backend.clear()
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], timeout: Optional[int] = None,
+                   function: Optional[str] = None) -> Any:
+        hit, value = self._lookup(key, function)
+        if not hit:
+            value = compute()
+            self.set(key, value, timeout)
+        return value
+
+    @staticmethod
+    def function_name(f: Callable) -> str:
+        return f'{f.__module__}.{f.__qualname__}'
+
+    def memoize_key(self, f: Callable, *args, **kwargs) -> str:
+        parts = [_key_part(arg) for arg in args] + [f'{name}={_key_part(value)}'
+                                                     for name, value in sorted(kwargs.items())]
+        return f'memoize:{self.function_name(f)}:{hashlib.sha1(",".join(parts).encode()).hexdigest()}'
+
+    def memoize(self, timeout: Optional[int] = None):
+        """Cache a function's result by its arguments (models by primary key).
+
+        The wrapped function gains ``uncached`` (the original) and
+        ``forget(*args, **kwargs)`` to drop one cached result.
+        """
+        def decorator(f):
+            name = self.function_name(f)
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                return self.get_or_set(self.memoize_key(f, *args, **kwargs), lambda: f(*args, **kwargs),
+                                       timeout, name)
+
+            wrapper.uncached = f
+            wrapper.forget = lambda *args, **kwargs: self.delete(self.memoize_key(f, *args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict:
+        """This worker's hit/miss counts, overall and per memoized function."""
+        state = self._state
+        with self._lock:
+            stats = {
+                'backend': type(state['backend']).__name__,
+                'entries': state['backend'].size(),
+                'hits': state['stats']['hits'],
+                'misses': state['stats']['misses'],
+                'sets': state['stats']['sets'],
+                'functions': {name: dict(counts) for name, counts in state['stats']['functions'].items()}
+            }
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+        for counts in stats['functions'].values():
+            counts['hit_rate'] = counts['hits'] / (counts['hits'] + counts['misses'])
+        if isinstance(state['backend'], SimpleCache):
+            stats['evictions'] = state['backend'].evictions
+        return stats
@@ -0,0 +1,75 @@
+"""Conditional GET for pages rendered from versioned data.
+
+A page's ETag is derived from the version of the data it shows (e.g.
+``League.version``), the viewer, the deployed templates and the current
+CSRF token window, so it can be computed and compared before any query
+or template rendering beyond the version lookup. ETags are weak: pages
+embed a fresh CSRF token on every render but are otherwise identical.
+
+Browsers may keep these pages (``Cache-Control: no-cache`` makes them
+revalidate every time) but shared caches may not keep authenticated ones,
+and ``Vary: Cookie`` stops one user's copy being offered to another.
+"""
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+
+def _templates_stamp() -> str:
+    """Changes when the deployed templates do, so a release invalidates every ETag."""
+    stamp = current_app.extensions.get('conditional_templates_stamp')
+    if stamp is None:
+        folder = os.path.join(current_app.root_path, current_app.template_folder or 'templates')
+        mtimes = [os.path.getmtime(os.path.join(dirpath, name))
+                  for dirpath, _, filenames in os.walk(folder) for name in filenames]
+        stamp = current_app.extensions['conditional_templates_stamp'] = str(max(mtimes, default=0))
+    return stamp
+
+
+def page_etag(*version) -> str:
+    """ETag of the current page for the current viewer, given its data version."""
+    viewer = current_user.get_id() if current_user.is_authenticated else 'anonymous'
+    # A reused page's CSRF tokens must still be valid: ETags expire at half their lifetime
+    limit = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    window = int(time.time() // (limit / 2)) if limit else 0
+    key = '|'.join(str(part) for part in (request.endpoint, _templates_stamp(), viewer, window) + version)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _is_current(etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the client's copy matches (If-None-Match wins over If-Modified-Since)."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    return False
+
+
+def _add_validators(response, etag: str, last_modified: Optional[datetime]):
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if current_user.is_authenticated:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
+
+def conditional_response(render: Callable[[], str], *version, last_modified: Optional[datetime] = None):
+    """304 Not Modified if the client's copy of this version is current, else ``render()``.
+
+    ``version`` identifies the data the page shows; ``last_modified`` (naive
+    UTC) is sent for clients that only revalidate by date.
+    """
+    etag = page_etag(*version)
+    # Pending flash messages are part of the page, so it must be rendered
+    if request.method in ('GET', 'HEAD') and '_flashes' not in session and _is_current(etag, last_modified):
+        return _add_validators(current_app.response_class(status=304), etag, last_modified)
+    return _add_validators(make_response(render()), etag, last_modified)
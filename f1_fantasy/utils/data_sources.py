@@ -0,0 +1,202 @@
+"""Data sources behind F1DataManager.
+
+``FastF1Source`` fetches from the live APIs. ``ReplaySource`` serves frames
+recorded to disk by ``RecordingSource`` (see the ``record-f1-fixtures``
+command), so imports can be run and benchmarked without network access.
+
+Recorded layout, one directory per season::
+
+    <root>/<season>/schedule.json
+    <root>/<season>/drivers.json
+    <root>/<season>/results_<round>.json
+    <root>/<season>/fastest_laps_<round>.json
+    <root>/<season>/laps_<round>.json
+
+Frames are stored with pandas' ``orient='table'`` JSON, which keeps column
+dtypes (dates included) across the round trip. Timedelta columns, which
+that format cannot read back, are stored as seconds under a suffixed name.
+"""
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Set
+import fastf1
+import pandas as pd
+from fastf1.ergast import Ergast
+from .fastf1_cache import managed_cache
+
+# Suffix of columns holding a timedelta as float seconds in recordings
+_SECONDS_SUFFIX = '__seconds'
+
+# Lap columns needed by the lap store; recordings keep only these
+LAP_COLUMNS = ['DriverNumber', 'LapNumber', 'LapTime', 'Position']
+
+
+class F1DataSource(ABC):
+    """Interface for the frames F1DataManager imports from.
+
+    A source missing any of these methods fails when it is created, not
+    midway through an import.
+    """
+
+    @abstractmethod
+    def schedule(self, season: int) -> pd.DataFrame:
+        """The season's race weekends (testing events excluded)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def drivers(self, season: int) -> pd.DataFrame:
+        """The season's drivers, as session results of the opening race."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def results(self, season: int, round: int) -> pd.DataFrame:
+        """A race's classification (session results)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def fastest_lap_drivers(self, season: int, round: int) -> Set[int]:
+        """Driver numbers credited with a race's fastest lap."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def laps(self, season: int, round: int) -> pd.DataFrame:
+        """A race's lap timing (at least LAP_COLUMNS)."""
+        raise NotImplementedError
+
+
+class FastF1Source(F1DataSource):
+    """Live data from FastF1 (and Ergast for the fastest lap)."""
+
+    def __init__(self, cache_dir: str = None):
+        # Size-bounded cache; see fastf1_cache.ManagedCache
+        self.cache = managed_cache(cache_dir) if cache_dir else None
+        fastf1.set_log_level('WARNING')  # Reduce noise in logs
+
+    def _load(self, season: int, round: int, **kwargs):
+        session = fastf1.get_session(season, round, 'R')
+        if self.cache:
+            return self.cache.load(session, **kwargs)
+        session.load(**kwargs)
+        return session
+
+    def schedule(self, season: int) -> pd.DataFrame:
+        return fastf1.get_event_schedule(season, include_testing=False)
+
+    def drivers(self, season: int) -> pd.DataFrame:
+        return self.results(season, 1)
+
+    def results(self, season: int, round: int) -> pd.DataFrame:
+        # Only the classification is needed: skip laps, telemetry, weather and messages
+        return self._load(season, round, laps=False, telemetry=False, weather=False, messages=False).results
+
+    def fastest_lap_drivers(self, season: int, round: int) -> Set[int]:
+        # Lap data is not loaded, so the fastest lap rank comes from the
+        # (much smaller) Ergast race results instead
+        response = Ergast().get_race_results(season=season, round=round)
+        if not response.content:
+            return set()
+        results = response.content[0]
+        if 'fastestLapRank' not in results:
+            return set()
+        return {int(number) for number in results.loc[results['fastestLapRank'] == 1, 'number']}
+
+    def laps(self, season: int, round: int) -> pd.DataFrame:
+        return self._load(season, round, laps=True, telemetry=False, weather=False, messages=False).laps
+
+
+class ReplaySource(F1DataSource):
+    """Serves frames previously recorded to a directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, season: int, name: str) -> str:
+        return os.path.join(self.root, str(season), f'{name}.json')
+
+    def _read(self, season: int, name: str) -> pd.DataFrame:
+        path = self.path(season, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No recorded {name} for season {season} in {self.root}')
+        frame = pd.read_json(path, orient='table')
+        for column in frame.columns:
+            if column.endswith(_SECONDS_SUFFIX):
+                frame[column[:-len(_SECONDS_SUFFIX)]] = pd.to_timedelta(frame.pop(column), unit='s')
+        return frame
+
+    def schedule(self, season: int) -> pd.DataFrame:
+        return self._read(season, 'schedule')
+
+    def drivers(self, season: int) -> pd.DataFrame:
+        return self._read(season, 'drivers')
+
+    def results(self, season: int, round: int) -> pd.DataFrame:
+        return self._read(season, f'results_{round}')
+
+    def fastest_lap_drivers(self, season: int, round: int) -> Set[int]:
+        path = self.path(season, f'fastest_laps_{round}')
+        if not os.path.exists(path):
+            return set()
+        with open(path) as f:
+            return set(json.load(f))
+
+    def laps(self, season: int, round: int) -> pd.DataFrame:
+        return self._read(season, f'laps_{round}')
+
+    def write_frame(self, season: int, name: str, frame: pd.DataFrame):
+        """Record a frame; columns of mixed object types are stored as strings."""
+        path = self.path(season, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame = pd.DataFrame(frame).reset_index(drop=True)
+        for column in list(frame.columns):
+            if pd.api.types.is_timedelta64_dtype(frame[column]):
+                frame[column + _SECONDS_SUFFIX] = frame.pop(column).dt.total_seconds()
+            elif frame[column].dtype == object:
+                frame[column] = frame[column].map(lambda value: None if pd.isna(value) else str(value))
+        frame.to_json(path, orient='table', index=False, date_format='iso')
+
+    def write_fastest_laps(self, season: int, round: int, driver_numbers: Set[int]):
+        path = self.path(season, f'fastest_laps_{round}')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(sorted(driver_numbers), f)
+
+
+class RecordingSource(F1DataSource):
+    """Passes through another source, recording every frame for later replay."""
+
+    def __init__(self, source: F1DataSource, root: str):
+        self.source = source
+        self.replay = ReplaySource(root)
+
+    def schedule(self, season: int) -> pd.DataFrame:
+        frame = self.source.schedule(season)
+        self.replay.write_frame(season, 'schedule', frame)
+        return frame
+
+    def drivers(self, season: int) -> pd.DataFrame:
+        frame = self.source.drivers(season)
+        self.replay.write_frame(season, 'drivers', frame)
+        return frame
+
+    def results(self, season: int, round: int) -> pd.DataFrame:
+        frame = self.source.results(season, round)
+        self.replay.write_frame(season, f'results_{round}', frame)
+        return frame
+
+    def fastest_lap_drivers(self, season: int, round: int) -> Set[int]:
+        driver_numbers = self.source.fastest_lap_drivers(season, round)
+        self.replay.write_fastest_laps(season, round, driver_numbers)
+        return driver_numbers
+
+    def laps(self, season: int, round: int) -> pd.DataFrame:
+        frame = self.source.laps(season, round)
+        self.replay.write_frame(season, f'laps_{round}', frame[LAP_COLUMNS])
+        return frame
+
+
+def get_data_source(cache_dir: str = None, replay_dir: str = None) -> F1DataSource:
+    """Pick the replay source when a recording directory is given, else FastF1."""
+    if replay_dir:
+        return ReplaySource(replay_dir)
+    return FastF1Source(cache_dir)
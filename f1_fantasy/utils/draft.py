@@ -0,0 +1,230 @@
+"""In-memory draft engine for snake and random drafts.
+
+The whole pick order is computed when a draft starts. Each worker keeps a
+``DraftState`` per active draft in a process-wide registry: the available
+drivers and every team's roster are bitsets over the season's drivers, so
+validating and applying a pick are O(1). Picks are persisted as
+append-only DraftPick rows; the unique constraints on (draft, pick number)
+and (draft, driver) arbitrate between workers, and a worker catches up on
+picks made elsewhere with one small indexed query per request instead of
+re-reading the whole draft.
+"""
+import random
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy.exc import IntegrityError
+from ..models import db, League, Team, Driver, Draft, DraftPick
+
+DRAFT_TYPES = ('snake', 'random', 'auction')
+DEFAULT_ROUNDS = 2
+DEFAULT_BUDGET = 100
+
+
+class DraftError(ValueError):
+    """A pick or draft action that is not allowed in the current state."""
+
+
+def pick_order(team_ids: Sequence[int], rounds: int, draft_type: str, seed: Optional[int] = None) -> List[int]:
+    """Team id for every overall pick.
+
+    Snake drafts shuffle the first round once and reverse it every other
+    round; random drafts shuffle every round independently. In an auction
+    the order is the nomination rotation: the shuffled first round repeated.
+    """
+    if draft_type not in DRAFT_TYPES:
+        raise DraftError(f'Unsupported draft type: {draft_type}')
+    rng = random.Random(seed)
+    first = list(team_ids)
+    rng.shuffle(first)
+    order = []
+    for round in range(rounds):
+        if draft_type == 'snake':
+            order.extend(first if round % 2 == 0 else reversed(first))
+        elif draft_type == 'auction':
+            order.extend(first)
+        else:
+            this_round = list(team_ids)
+            rng.shuffle(this_round)
+            order.extend(this_round)
+    return order
+
+
+class DraftState:
+    """Pick order, availability and rosters of one draft, as bitsets."""
+
+    def __init__(self, draft_id: int, order: Sequence[int], driver_ids: Iterable[int], picks=()):
+        self.draft_id = draft_id
+        self.order = tuple(order)
+        self.driver_ids = tuple(sorted(driver_ids))
+        self.bits = {driver_id: 1 << index for index, driver_id in enumerate(self.driver_ids)}
+        self.available = (1 << len(self.driver_ids)) - 1
+        self.rosters = dict.fromkeys(self.order, 0)
+        self.next_pick = 0
+        self.lock = threading.RLock()
+        for pick in picks:
+            self.apply(pick.team_id, pick.driver_id)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.next_pick >= len(self.order)
+
+    @property
+    def on_clock(self) -> Optional[int]:
+        """Team id due to pick next, or None once the draft is over."""
+        return None if self.is_complete else self.order[self.next_pick]
+
+    @property
+    def round(self) -> int:
+        """Current round, starting at 1."""
+        teams = len(self.rosters)
+        return min(self.next_pick, len(self.order) - 1) // teams + 1 if teams else 0
+
+    def validate(self, team_id: int, driver_id: int):
+        """Raise DraftError unless ``team_id`` may draft ``driver_id`` now."""
+        if self.is_complete:
+            raise DraftError('The draft is already complete.')
+        if team_id != self.order[self.next_pick]:
+            raise DraftError('It is not your turn to pick.')
+        bit = self.bits.get(driver_id)
+        if bit is None:
+            raise DraftError('That driver is not part of this draft.')
+        if not self.available & bit:
+            raise DraftError('That driver has already been drafted.')
+
+    def apply(self, team_id: int, driver_id: int) -> int:
+        """Apply a validated pick; returns its overall pick number."""
+        bit = self.bits[driver_id]
+        self.available &= ~bit
+        self.rosters[team_id] |= bit
+        self.next_pick += 1
+        return self.next_pick - 1
+
+    def roster_size(self, team_id: int) -> int:
+        return bin(self.rosters.get(team_id, 0)).count('1')
+
+    def _members(self, bitset: int) -> List[int]:
+        return [driver_id for driver_id, bit in self.bits.items() if bitset & bit]
+
+    def available_driver_ids(self) -> List[int]:
+        return self._members(self.available)
+
+    def roster(self, team_id: int) -> List[int]:
+        return self._members(self.rosters.get(team_id, 0))
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly snapshot for clients polling the draft."""
+        return {
+            'draft_id': self.draft_id,
+            'next_pick': self.next_pick,
+            'total_picks': len(self.order),
+            'round': self.round,
+            'on_clock': self.on_clock,
+            'complete': self.is_complete,
+            'available': self.available_driver_ids(),
+            'rosters': {str(team_id): self.roster(team_id) for team_id in self.rosters}
+        }
+
+
+_states: Dict[int, DraftState] = {}
+_registry_lock = threading.Lock()
+
+
+def _load_state(draft: Draft) -> DraftState:
+    driver_ids = [driver_id for (driver_id,) in db.session.query(Driver.id).filter_by(season=draft.season)]
+    picks = db.session.query(DraftPick.team_id, DraftPick.driver_id).filter_by(draft_id=draft.id) \
+        .order_by(DraftPick.pick_number).all()
+    return DraftState(draft.id, draft.pick_order, driver_ids, picks)
+
+
+def get_state(draft: Draft) -> DraftState:
+    """The worker's in-memory state for a draft, caught up with picks made elsewhere."""
+    with _registry_lock:
+        state = _states.get(draft.id)
+        if state is None:
+            state = _states[draft.id] = _load_state(draft)
+            return state
+    with state.lock:
+        newer = (db.session.query(DraftPick.team_id, DraftPick.driver_id)
+                 .filter(DraftPick.draft_id == draft.id, DraftPick.pick_number >= state.next_pick)
+                 .order_by(DraftPick.pick_number).all())
+        for team_id, driver_id in newer:
+            state.apply(team_id, driver_id)
+    return state
+
+
+def forget(draft_id: int):
+    """Drop a draft's cached state so the next request reloads it."""
+    with _registry_lock:
+        _states.pop(draft_id, None)
+
+
+def start_draft(league: League, rounds: int = DEFAULT_ROUNDS, season: Optional[int] = None,
+                seed: Optional[int] = None, budget: int = DEFAULT_BUDGET, pick_seconds: Optional[int] = None) -> Draft:
+    """Compute the pick order and open the draft for a league.
+
+    An auction draft also resets every team's budget to ``budget``.
+    """
+    if league.draft is not None:
+        raise DraftError('This league has already started its draft.')
+    if not league.is_draftable:
+        raise DraftError('A league needs at least two teams and must be in setup to draft.')
+    if season is None:
+        season = db.session.query(db.func.max(Driver.season)).scalar()
+    drivers = Driver.query.filter_by(season=season).count() if season else 0
+    team_ids = [team_id for (team_id,) in db.session.query(Team.id).filter_by(league_id=league.id).order_by(Team.id)]
+    if rounds < 1 or len(team_ids) * rounds > drivers:
+        raise DraftError(f'{drivers} drivers are available: not enough for {len(team_ids)} teams '
+                         f'x {rounds} rounds.')
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 31)
+
+    draft = Draft(league_id=league.id, season=season, draft_type=league.draft_type, rounds=rounds,
+                  pick_order=pick_order(team_ids, rounds, league.draft_type, seed), seed=seed,
+                  pick_seconds=pick_seconds or None)
+    if draft.draft_type == 'auction':
+        if budget < rounds:
+            raise DraftError(f'A budget of {budget} cannot fill {rounds} roster spots.')
+        draft.budget = budget
+        Team.query.filter_by(league_id=league.id).update({Team.budget: budget})
+    db.session.add(draft)
+    db.session.commit()
+    return draft
+
+
+def make_pick(draft: Draft, team_id: int, driver_id: int, user_id: Optional[int] = None) -> DraftPick:
+    """Validate a pick against the in-memory state and append it.
+
+    Raises DraftError if the pick is not allowed, including when another
+    worker filled the slot first.
+    """
+    if draft.draft_type == 'auction':
+        raise DraftError('Drivers in an auction draft are won by bidding.')
+    state = get_state(draft)
+    with state.lock:
+        state.validate(team_id, driver_id)
+        pick = DraftPick(draft_id=draft.id, pick_number=state.next_pick, team_id=team_id,
+                         driver_id=driver_id, made_by=user_id)
+        db.session.add(pick)
+        if state.next_pick + 1 == len(state.order):
+            draft.status = 'completed'
+            draft.completed_at = datetime.utcnow()
+            draft.league.status = 'active'
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            forget(draft.id)
+            raise DraftError('That pick was just made by someone else; please try again.')
+        state.apply(team_id, driver_id)
+    return pick
+
+
+def team_driver_ids(team_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """Drafted driver ids per team."""
+    rosters = {team_id: [] for team_id in team_ids}
+    for team_id, driver_id in (db.session.query(DraftPick.team_id, DraftPick.driver_id)
+                               .filter(DraftPick.team_id.in_(list(rosters)))
+                               .order_by(DraftPick.pick_number)):
+        rosters[team_id].append(driver_id)
+    return rosters
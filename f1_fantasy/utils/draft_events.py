@@ -0,0 +1,228 @@
+"""Live draft events.
+
+Each worker runs at most one publisher per league with watchers. The
+publisher polls for new DraftPick rows (one small indexed query per poll
+interval, however many clients are watching) and fans them out to every
+subscriber in the process. Picks made in this worker wake it immediately.
+
+Event ids are overall pick numbers + 1. Since picks are append-only, a
+client resuming with ``Last-Event-ID`` (or a long-poll ``after``) gets
+exactly the picks it missed. The publisher also runs the draft's clocks:
+it autodrafts teams whose pick timer ran out and, in an auction, closes
+expired lots and sends the current lot (without an id) whenever its
+version changes.
+"""
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+from flask import current_app
+from ..models import db, Draft, DraftPick, Driver, Team, AuctionLot
+from .auction import close_expired_lots
+from .autodraft import run_due_autopicks
+
+DEFAULT_POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15.0
+IDLE_LINGER = 30.0  # Seconds a publisher outlives its last subscriber
+
+
+class LeaguePublisher:
+    """Fans out one league's draft picks to the subscribers in this process."""
+
+    def __init__(self, app, league_id: int, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.app = app
+        self.league_id = league_id
+        self.poll_interval = poll_interval
+        self.events: List[Dict] = []
+        self.complete = False
+        self.lot = None  # Current auction lot
+        self.lot_serial = 0  # Bumped whenever the lot changes
+        self.subscribers = 0
+        self.idle_since = time.monotonic()
+        self.running = False
+        self._pending = False
+        self._condition = threading.Condition()
+
+    @property
+    def last_event_id(self) -> int:
+        return len(self.events)
+
+    def subscribe(self):
+        with self._condition:
+            self.subscribers += 1
+            if not self.running:
+                self.running = True
+                threading.Thread(target=self._run, name=f'draft-events-{self.league_id}', daemon=True).start()
+
+    def unsubscribe(self):
+        with self._condition:
+            self.subscribers -= 1
+            if not self.subscribers:
+                self.idle_since = time.monotonic()
+
+    def notify(self):
+        """Poll now rather than at the next interval (a pick was just made here)."""
+        with self._condition:
+            self._pending = True
+            self._condition.notify_all()
+
+    def wait(self, after: int, timeout: float, lot_serial: int = 0) -> (List[Dict], int, Optional[Dict]):
+        """Events with an id above ``after`` and the current lot, waiting up to
+        ``timeout`` for either a new event or a lot newer than ``lot_serial``.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.last_event_id > after or self.complete or self.lot_serial != lot_serial, timeout)
+            return self.events[after:], self.lot_serial, self.lot
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                try:
+                    self._poll()
+                except Exception:
+                    current_app.logger.exception('Polling draft picks for league %s failed', self.league_id)
+                finally:
+                    db.session.remove()
+                with self._condition:
+                    if not self.subscribers and time.monotonic() - self.idle_since >= IDLE_LINGER:
+                        self.running = False
+                        _forget(self)
+                        return
+                    if not self._pending:
+                        self._condition.wait(self.poll_interval)
+                    self._pending = False
+
+    def _poll(self):
+        draft = Draft.query.filter_by(league_id=self.league_id).first()
+        if draft is None:
+            return
+        if draft.draft_type == 'auction':
+            close_expired_lots(draft)
+            self._poll_lot(draft)
+        else:
+            run_due_autopicks(draft)
+        rows = (db.session.query(DraftPick.pick_number, DraftPick.team_id, Team.name, DraftPick.driver_id,
+                                 Driver.first_name, Driver.last_name)
+                .join(Team, Team.id == DraftPick.team_id)
+                .join(Driver, Driver.id == DraftPick.driver_id)
+                .filter(DraftPick.draft_id == draft.id, DraftPick.pick_number >= self.last_event_id)
+                .order_by(DraftPick.pick_number).all())
+        if not rows:
+            return
+        order = draft.pick_order
+        teams = len(set(order))
+        events = []
+        for pick_number, team_id, team_name, driver_id, first_name, last_name in rows:
+            next_pick = pick_number + 1
+            events.append({
+                'id': next_pick,
+                'pick_number': pick_number,
+                'round': pick_number // teams + 1,
+                'team_id': team_id,
+                'team_name': team_name,
+                'driver_id': driver_id,
+                'driver_name': f'{first_name} {last_name}',
+                'on_clock': order[next_pick] if next_pick < len(order) else None,
+                'complete': next_pick >= len(order)
+            })
+        with self._condition:
+            # Picks are contiguous, so anything already published is skipped
+            self.events.extend(events[self.last_event_id - rows[0].pick_number:])
+            self.complete = self.last_event_id >= len(order)
+            self._condition.notify_all()
+
+    def _poll_lot(self, draft: Draft):
+        lot = AuctionLot.query.filter_by(draft_id=draft.id).order_by(AuctionLot.lot_number.desc()).first()
+        if lot is None or (self.lot and (self.lot['lot_number'], self.lot['version']) == (lot.lot_number, lot.version)):
+            return
+        snapshot = dict(lot.to_dict(), driver_name=lot.driver.full_name, high_team_name=lot.high_team.name)
+        with self._condition:
+            self.lot = snapshot
+            self.lot_serial += 1
+            self._condition.notify_all()
+
+
+_publishers: Dict[int, LeaguePublisher] = {}
+_registry_lock = threading.Lock()
+
+
+def publisher(league_id: int) -> LeaguePublisher:
+    """The process-wide publisher for a league, created on first use."""
+    with _registry_lock:
+        league_publisher = _publishers.get(league_id)
+        if league_publisher is None:
+            league_publisher = _publishers[league_id] = LeaguePublisher(
+                current_app._get_current_object(), league_id,
+                current_app.config.get('DRAFT_EVENTS_POLL_INTERVAL', DEFAULT_POLL_INTERVAL))
+        return league_publisher
+
+
+def _forget(league_publisher: LeaguePublisher):
+    with _registry_lock:
+        if _publishers.get(league_publisher.league_id) is league_publisher:
+            del _publishers[league_publisher.league_id]
+
+
+def notify(league_id: int):
+    """Wake the league's publisher, if this worker has one, after a local pick."""
+    with _registry_lock:
+        league_publisher = _publishers.get(league_id)
+    if league_publisher is not None:
+        league_publisher.notify()
+
+
+def format_sse(data: Dict, event: str = 'pick') -> str:
+    # Only picks carry an id, so Last-Event-ID always names the last pick seen
+    event_id = f"id: {data['id']}\n" if event == 'pick' else ''
+    return f"{event_id}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def stream(league_publisher: LeaguePublisher, last_event_id: int = 0, heartbeat: float = HEARTBEAT_INTERVAL):
+    """Generate a text/event-stream of picks after ``last_event_id``.
+
+    Takes the publisher rather than a league id because the generator runs
+    after the request context is gone. Sends a comment line every
+    ``heartbeat`` seconds so proxies keep the connection open, and ends once
+    the draft is complete.
+    """
+    league_publisher.subscribe()
+    lot_serial = 0
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            events, serial, lot = league_publisher.wait(last_event_id, heartbeat, lot_serial)
+            for event in events:
+                yield format_sse(event)
+            if serial != lot_serial:
+                lot_serial = serial
+                yield format_sse(lot, 'lot')
+            elif not events:
+                if league_publisher.complete:
+                    break
+                yield ': keep-alive\n\n'
+            if events:
+                last_event_id = events[-1]['id']
+                if events[-1]['complete']:
+                    break
+    finally:
+        league_publisher.unsubscribe()
+
+
+def long_poll(league_id: int, after: int = 0, timeout: float = 25.0, lot_serial: int = 0) -> Dict:
+    """Picks after ``after`` (and the lot, if newer than ``lot_serial``), held
+    open up to ``timeout`` seconds while there is nothing new.
+    """
+    league_publisher = publisher(league_id)
+    league_publisher.subscribe()
+    try:
+        events, serial, lot = league_publisher.wait(after, timeout, lot_serial)
+    finally:
+        league_publisher.unsubscribe()
+    return {
+        'events': events,
+        'last_event_id': events[-1]['id'] if events else after,
+        'lot': lot if serial != lot_serial else None,
+        'lot_serial': serial,
+        'complete': league_publisher.complete
+    }
@@ -0,0 +1,194 @@
+"""Size-bounded FastF1 cache.
+
+FastF1 caches each loaded session under ``<cache_dir>/<season>/<event>/<session>``
+and never cleans up. ``ManagedCache`` enables that cache, records when each
+session directory was last used (and whether the load was a cache hit) in a
+small index file, and evicts the least recently used session directories
+once they grow past its byte budget, so hot seasons stay warm while disk
+and inode usage stay flat. The rest of the directory (FastF1's HTTP cache,
+race summaries) cannot be evicted and does not count against the budget.
+"""
+import fcntl
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import fastf1
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB, override with FASTF1_CACHE_MAX_BYTES
+INDEX_FILE = '.f1_fantasy_cache.json'
+LOCK_FILE = '.f1_fantasy_cache.lock'
+
+
+def default_max_bytes() -> int:
+    return int(os.getenv('FASTF1_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+
+
+def _dir_size(path: str) -> Tuple[int, int]:
+    """Total bytes and file count below ``path``."""
+    size = files = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            file_path = os.path.join(dirpath, name)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+                files += 1
+    return size, files
+
+
+class ManagedCache:
+    """FastF1 cache directory with a byte budget and LRU eviction by session."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else default_max_bytes()
+
+    def enable(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fastf1.Cache.enable_cache(self.cache_dir)
+        return self
+
+    @contextmanager
+    def _index(self):
+        """Lock and yield the usage index; it is saved when the block exits."""
+        with open(os.path.join(self.cache_dir, LOCK_FILE), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            path = os.path.join(self.cache_dir, INDEX_FILE)
+            try:
+                with open(path) as f:
+                    index = json.load(f)
+            except (FileNotFoundError, ValueError):
+                index = {}
+            index.setdefault('sessions', {})
+            index.setdefault('seasons', {})
+            yield index
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(temp_path, path)
+
+    def session_key(self, session) -> str:
+        """Cache-relative directory of a session (FastF1 drops the '/static/' prefix)."""
+        return session.api_path[len('/static/'):].strip('/')
+
+    def load(self, session, **kwargs):
+        """Load a FastF1 session through the cache, recording use and evicting if needed."""
+        key = self.session_key(session)
+        session_dir = os.path.join(self.cache_dir, key)
+        hit = os.path.isdir(session_dir) and any(name.endswith('.ff1pkl') for name in os.listdir(session_dir))
+        session.load(**kwargs)
+
+        with self._index() as index:
+            index['sessions'][key] = time.time()
+            season = index['seasons'].setdefault(key.split('/')[0], {'hits': 0, 'misses': 0})
+            season['hits' if hit else 'misses'] += 1
+        if not hit:
+            # Only a miss grows the cache
+            self.evict(protect={key})
+        return session
+
+    def _session_dirs(self) -> List[str]:
+        """Cache-relative paths of every <season>/<event>/<session> directory."""
+        sessions = []
+        for season in os.listdir(self.cache_dir):
+            season_dir = os.path.join(self.cache_dir, season)
+            if not (season.isdigit() and os.path.isdir(season_dir)):
+                continue
+            for event in os.listdir(season_dir):
+                event_dir = os.path.join(season_dir, event)
+                if os.path.isdir(event_dir):
+                    sessions.extend(f'{season}/{event}/{name}' for name in os.listdir(event_dir)
+                                    if os.path.isdir(os.path.join(event_dir, name)))
+        return sessions
+
+    def usage(self) -> Dict:
+        """Bytes and files per session directory, plus everything else in the cache."""
+        sessions = {}
+        for key in self._session_dirs():
+            size, files = _dir_size(os.path.join(self.cache_dir, key))
+            sessions[key] = {'bytes': size, 'files': files}
+        total, files = _dir_size(self.cache_dir)
+        session_bytes = sum(s['bytes'] for s in sessions.values())
+        return {
+            'sessions': sessions,
+            'session_bytes': session_bytes,
+            'total_bytes': total,
+            'total_files': files,
+            'other_bytes': total - session_bytes
+        }
+
+    def evict(self, protect: Optional[set] = None, max_bytes: int = None) -> List[str]:
+        """Remove least recently used sessions until they fit the budget.
+
+        Only session bytes count: nothing else in the directory is evictable,
+        so counting it would empty the cache on every miss. Sessions never loaded through this class count as used when their
+        newest file was written. Returns the evicted session keys.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        usage = self.usage()
+        total = usage['session_bytes']
+        if total <= budget:
+            return []
+
+        evicted = []
+        with self._index() as index:
+            def last_used(key):
+                if key in index['sessions']:
+                    return index['sessions'][key]
+                session_dir = os.path.join(self.cache_dir, key)
+                return max((os.path.getmtime(os.path.join(session_dir, name)) for name in os.listdir(session_dir)),
+                           default=0)
+
+            for key in sorted(usage['sessions'], key=last_used):
+                if total <= budget:
+                    break
+                if protect and key in protect:
+                    continue
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+                index['sessions'].pop(key, None)
+                total -= usage['sessions'][key]['bytes']
+                evicted.append(key)
+                # Drop the event and season directories once empty
+                for parent in (os.path.dirname(key), key.split('/')[0]):
+                    parent_dir = os.path.join(self.cache_dir, parent)
+                    if os.path.isdir(parent_dir) and not os.listdir(parent_dir):
+                        os.rmdir(parent_dir)
+        return evicted
+
+    def stats(self) -> Dict:
+        """Hit rate and bytes per season, with overall totals."""
+        usage = self.usage()
+        with self._index() as index:
+            counters = dict(index['seasons'])
+        seasons = {}
+        for key, session_usage in usage['sessions'].items():
+            season = seasons.setdefault(key.split('/')[0], {'bytes': 0, 'files': 0, 'sessions': 0})
+            season['bytes'] += session_usage['bytes']
+            season['files'] += session_usage['files']
+            season['sessions'] += 1
+        for season, counts in counters.items():
+            seasons.setdefault(season, {'bytes': 0, 'files': 0, 'sessions': 0}).update(counts)
+        for season in seasons.values():
+            lookups = season.get('hits', 0) + season.get('misses', 0)
+            season['hit_rate'] = season.get('hits', 0) / lookups if lookups else None
+
+        hits = sum(counts['hits'] for counts in counters.values())
+        lookups = hits + sum(counts['misses'] for counts in counters.values())
+        return {
+            'seasons': dict(sorted(seasons.items())),
+            'session_bytes': usage['session_bytes'],
+            'total_bytes': usage['total_bytes'],
+            'total_files': usage['total_files'],
+            'other_bytes': usage['other_bytes'],
+            'max_bytes': self.max_bytes,
+            'hit_rate': hits / lookups if lookups else None
+        }
+
+
+@lru_cache(maxsize=None)
+def managed_cache(cache_dir: str, max_bytes: int = None) -> ManagedCache:
+    """The enabled managed cache for a directory (one per process)."""
+    return ManagedCache(cache_dir, max_bytes).enable()
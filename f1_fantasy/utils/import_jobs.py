@@ -0,0 +1,79 @@
+"""Out-of-request execution of queued ImportJobs.
+
+The admin panel only enqueues jobs; an ``import-worker`` process claims
+them one at a time and runs the same import functions as the CLI commands,
+recording each season's (or round's) stats on the job as it finishes.
+"""
+import logging
+import time
+from typing import Dict, Optional
+from ..models import db, ImportJob, Race
+from .jolpica_api import import_historical_data, import_race_results
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 5
+
+
+def enqueue_seasons(start_season: int, end_season: int, sync: bool = True, user_id: Optional[int] = None):
+    """Queue an import of races and drivers for a range of seasons."""
+    return ImportJob.enqueue('seasons', {'start_season': start_season, 'end_season': end_season, 'sync': sync},
+                             total_units=end_season - start_season + 1, user_id=user_id)
+
+
+def enqueue_results(season: int, user_id: Optional[int] = None):
+    """Queue a results ingestion for every imported race of a season."""
+    rounds = Race.query.filter_by(season=season).count()
+    return ImportJob.enqueue('results', {'season': season}, total_units=rounds, user_id=user_id)
+
+
+def _rows(stats: Dict) -> int:
+    return sum(stats.get(key, 0) for key in ('races', 'drivers', 'results'))
+
+
+def run_job(job: ImportJob, cache_dir: str = None):
+    """Run a claimed job to completion, recording progress as it goes."""
+    job_id = job.id
+
+    def progress(unit, stats):
+        # The import commits (and may roll back) the session, so re-fetch the job
+        current = db.session.get(ImportJob, job_id)
+        current.record_progress(unit, stats, rows=_rows(stats))
+
+    params = job.params
+    try:
+        if job.kind == 'seasons':
+            import_historical_data(cache_dir, params['start_season'], params['end_season'],
+                                   progress=progress, sync=params.get('sync', False))
+        elif job.kind == 'results':
+            import_race_results(cache_dir, params['season'], progress=progress)
+        else:
+            raise ValueError(f'Unknown import job kind: {job.kind}')
+    except Exception as e:
+        db.session.rollback()
+        logger.exception('Import job %s failed', job_id)
+        db.session.get(ImportJob, job_id).finish(error=str(e))
+        return
+    db.session.get(ImportJob, job_id).finish()
+
+
+def work(cache_dir: str = None, once: bool = False, poll_interval: float = DEFAULT_POLL_INTERVAL) -> int:
+    """Claim and run queued jobs until interrupted (or the queue is empty with ``once``).
+
+    Returns the number of jobs run.
+    """
+    requeued = ImportJob.requeue_stale()
+    if requeued:
+        logger.warning('Requeued %d stale import job(s)', requeued)
+    ran = 0
+    while True:
+        job = ImportJob.claim_next()
+        if job is None:
+            if once:
+                return ran
+            time.sleep(poll_interval)
+            continue
+        logger.info('Running import job %s (%s)', job.id, job.kind)
+        run_job(job, cache_dir)
+        ran += 1
+        db.session.expunge_all()
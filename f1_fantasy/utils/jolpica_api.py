@@ -1,78 +1,211 @@
 import fastf1
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Optional
-from ..models import db, Race, Driver
+from typing import Callable, List, Dict, Optional
+import pandas as pd
+from ..models import db, Race, Driver, RaceResult, ImportCheckpoint, Settings
+from .bulk import bulk_upsert
+from .data_sources import F1DataSource, FastF1Source, get_data_source
+from .race_details import race_details_service
+from .lap_store import LapStore, extract_laps
+from .standings import apply_season_results
+
+# Result rows buffered before each bulk upsert when ingesting results
+RESULTS_BATCH_SIZE = 500
+
+# Race columns a schedule import sets on new races only: results ingestion
+# marks races completed, and re-importing the schedule must not undo that
+RACE_INSERT_ONLY = ('status',)
+
+# Settings key holding the start time of an unfinished sync run
+SYNC_RUN_SETTING = 'f1_sync_run_started_at'
+
+def peak_memory_mb(children: bool = False) -> float:
+    """Peak resident memory of this process (or its reaped children) in MB."""
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+def _value(row: pd.Series, key: str):
+    """Get a column value from a FastF1 row, mapping missing/NaN to None."""
+    value = row.get(key)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
 
 class F1DataManager:
     """Utility class for managing F1 data using Fast-F1."""
     
-    def __init__(self, cache_dir: str = None):
-        """Initialize Fast-F1 with optional cache directory."""
-        if cache_dir:
-            fastf1.set_cache(cache_dir)
-        # Enable caching by default
-        fastf1.set_log_level('WARNING')  # Reduce noise in logs
+    def __init__(self, cache_dir: str = None, source: F1DataSource = None):
+        """Initialize with a data source, defaulting to Fast-F1 with optional cache directory."""
+        self.cache_dir = cache_dir
+        self.source = source or FastF1Source(cache_dir)
     
-    def import_season_data(self, season: int) -> Dict[str, int]:
-        """Import all race and driver data for a given season."""
-        stats = {'races': 0, 'drivers': 0}
+    def load_schedule(self, season: int) -> pd.DataFrame:
+        """Load the race weekends of a season (testing events excluded)."""
+        return self.source.schedule(season)
+    
+    def load_drivers(self, season: int) -> pd.DataFrame:
+        """Load the season's drivers from the opening race's results."""
+        return self.source.drivers(season)
+    
+    def fetch_season_rows(self, season: int) -> Dict:
+        """Fetch and parse a season into plain row dicts, without touching the DB.
+        
+        The result only holds builtin types so it can be shipped from a worker
+        process to the single writer.
+        """
+        started = time.perf_counter()
+        schedule = self.load_schedule(season)
+        races = []
+        for _, event in schedule.iterrows():
+            race_start = _value(event, 'Session5DateUtc')
+            races.append({
+                'season': season,
+                'round': int(event['RoundNumber']),
+                'name': event['EventName'],
+                'circuit_name': _value(event, 'CircuitName') or event['Location'],
+                'country': event['Country'],
+                'city': _value(event, 'City') or _value(event, 'Location'),  # Some circuits might not have city data
+                'date': event['EventDate'].date(),
+                'time': race_start.time() if race_start is not None else None,
+                'status': 'scheduled'
+            })
+        
+        drivers = []
+        for _, driver in self.load_drivers(season).iterrows():
+            date_of_birth = _value(driver, 'DateOfBirth')
+            drivers.append({
+                'season': season,
+                'driver_number': int(driver['DriverNumber']),
+                'code': _value(driver, 'Abbreviation'),  # Some drivers might not have a code
+                'first_name': driver['FirstName'],
+                'last_name': driver['LastName'],
+                'nationality': _value(driver, 'CountryCode') or '',
+                'date_of_birth': date_of_birth.date() if date_of_birth is not None else None,
+                'constructor': driver['TeamName'],
+                'status': 'active'
+            })
+        
+        return {
+            'season': season,
+            'races': races,
+            'drivers': drivers,
+            'fetch_seconds': time.perf_counter() - started,
+            'peak_rss_mb': peak_memory_mb()
+        }
+    
+    def write_season_rows(self, rows: Dict) -> Dict[str, int]:
+        """Write a fetched season to the database in a single transaction.
         
+        Races and drivers are bulk-upserted on their natural keys
+        (uix_season_round / uix_season_driver_number), one executemany per
+        table, so re-importing a season is idempotent.
+        """
         try:
-            # Get schedule for the season
-            schedule = fastf1.get_event_schedule(season)
-            
-            # Import races
-            for _, event in schedule.iterrows():
-                race = Race(
-                    season=season,
-                    round=event['RoundNumber'],
-                    name=event['EventName'],
-                    circuit_name=event['CircuitName'],
-                    country=event['Country'],
-                    city=event.get('City'),  # Some circuits might not have city data
-                    date=event['EventDate'].date(),
-                    time=event['EventTime'].time() if 'EventTime' in event else None,
-                    status='scheduled'
-                )
-                db.session.merge(race)
-                stats['races'] += 1
+            stats = {
+                'races': bulk_upsert(Race, rows['races'], ('season', 'round'), RACE_INSERT_ONLY),
+                'drivers': bulk_upsert(Driver, rows['drivers'], ('season', 'driver_number'))
+            }
+            db.session.commit()
+            return stats
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    def sync_season_rows(self, rows: Dict) -> Dict[str, int]:
+        """Write only the rounds and drivers of a fetched season that changed.
+        
+        Each row is hashed and compared with the season's ImportCheckpoint;
+        changed rows are upserted and the checkpoint is updated in the same
+        transaction, so a season is either fully synced or not at all.
+        """
+        season = rows['season']
+        try:
+            checkpoint = ImportCheckpoint.query.filter_by(season=season).first()
+            if checkpoint is None:
+                checkpoint = ImportCheckpoint(season=season, round_hashes={}, driver_hashes={})
+                db.session.add(checkpoint)
             
-            # Get drivers for the season
-            drivers = fastf1.get_drivers(season)
-            for _, driver in drivers.iterrows():
-                driver_obj = Driver(
-                    driver_number=driver['DriverNumber'],
-                    code=driver.get('Abbreviation'),  # Some drivers might not have a code
-                    first_name=driver['FirstName'],
-                    last_name=driver['LastName'],
-                    nationality=driver['CountryCode'],
-                    date_of_birth=driver['DateOfBirth'].date() if 'DateOfBirth' in driver else None,
-                    constructor=driver['TeamName'],
-                    status='active'
-                )
-                db.session.merge(driver_obj)
-                stats['drivers'] += 1
+            round_hashes = {str(race['round']): ImportCheckpoint.hash_row(race) for race in rows['races']}
+            driver_hashes = {str(driver['driver_number']): ImportCheckpoint.hash_row(driver)
+                             for driver in rows['drivers']}
+            races = [race for race in rows['races']
+                     if checkpoint.round_hashes.get(str(race['round'])) != round_hashes[str(race['round'])]]
+            drivers = [driver for driver in rows['drivers']
+                       if checkpoint.driver_hashes.get(str(driver['driver_number']))
+                       != driver_hashes[str(driver['driver_number'])]]
             
+            stats = {
+                'races': bulk_upsert(Race, races, ('season', 'round'), RACE_INSERT_ONLY),
+                'drivers': bulk_upsert(Driver, drivers, ('season', 'driver_number')),
+                'unchanged': not races and not drivers
+            }
+            checkpoint.round_hashes = round_hashes
+            checkpoint.driver_hashes = driver_hashes
+            checkpoint.schedule_hash = ImportCheckpoint.hash_frame(round_hashes)
+            checkpoint.drivers_hash = ImportCheckpoint.hash_frame(driver_hashes)
+            checkpoint.synced_at = datetime.utcnow()
             db.session.commit()
             return stats
-            
-        except Exception as e:
+        except Exception:
             db.session.rollback()
+            raise
+    
+    def load_results(self, season: int, round: int) -> pd.DataFrame:
+        """Load a race's classification only: no laps, telemetry, weather or messages."""
+        return self.source.results(season, round)
+    
+    def load_fastest_lap_drivers(self, season: int, round: int) -> set:
+        """Driver numbers credited with the race's fastest lap."""
+        return self.source.fastest_lap_drivers(season, round)
+    
+    def fetch_result_rows(self, season: int, round: int) -> List[Dict]:
+        """Fetch and parse a race's results into plain row dicts keyed by driver number."""
+        fastest = self.load_fastest_lap_drivers(season, round)
+        rows = []
+        for _, result in self.load_results(season, round).iterrows():
+            driver_number = int(result['DriverNumber'])
+            classified = _value(result, 'ClassifiedPosition')
+            grid = _value(result, 'GridPosition')
+            rows.append({
+                'driver_number': driver_number,
+                'code': _value(result, 'Abbreviation'),
+                'first_name': result['FirstName'],
+                'last_name': result['LastName'],
+                'nationality': _value(result, 'CountryCode') or '',
+                'constructor': result['TeamName'],
+                'grid_position': int(grid) if grid is not None else None,
+                'position': int(classified) if classified is not None and str(classified).isdigit() else None,
+                'classification': None if classified is None or str(classified).isdigit() else str(classified),
+                'status': _value(result, 'Status'),
+                'fastest_lap': driver_number in fastest
+            })
+        return rows
+    
+    def extract_race_laps(self, season: int, round: int, store: LapStore) -> Dict[str, int]:
+        """Extract a race's lap times and positions into the lap store."""
+        race = extract_laps(self.source.laps(season, round))
+        store.write(season, round, race)
+        return {'drivers': int(race.lap_times.shape[0]), 'laps': int(race.lap_times.shape[1])}
+    
+    def import_season_data(self, season: int) -> Dict[str, int]:
+        """Import all race and driver data for a given season."""
+        try:
+            return self.write_season_rows(self.fetch_season_rows(season))
+        except Exception as e:
             raise Exception(f"Error importing season {season}: {str(e)}")
     
     def get_race_details(self, season: int, round: int) -> Dict:
-        """Get detailed information about a specific race."""
+        """Get a compact summary of a race (weather, track status, key stats).
+        
+        Served from the race details cache; FastF1 is only hit on a cold miss.
+        """
         try:
-            session = fastf1.get_session(season, round, 'R')  # 'R' for race
-            session.load()
-            
-            return {
-                'race_name': session.event['EventName'],
-                'circuit': session.event['CircuitName'],
-                'date': session.event['EventDate'],
-                'weather': session.weather_data.to_dict() if hasattr(session, 'weather_data') else None,
-                'track_temperature': session.track_status.to_dict() if hasattr(session, 'track_status') else None
-            }
+            return race_details_service(self.cache_dir).get(season, round)
         except Exception as e:
             raise Exception(f"Error getting race details: {str(e)}")
     
@@ -90,17 +223,209 @@ class F1DataManager:
         except Exception as e:
             raise Exception(f"Error getting driver details: {str(e)}")
 
-def import_historical_data(cache_dir: str = None, start_season: int = 2020, end_season: int = 2025) -> Dict[str, Dict[str, int]]:
-    """Import historical F1 data for a range of seasons."""
-    manager = F1DataManager(cache_dir)
+def import_race_results(cache_dir: str = None, season: int = None, rounds: Optional[List[int]] = None,
+                        batch_size: int = RESULTS_BATCH_SIZE,
+                        progress: Optional[Callable[[int, Dict], None]] = None,
+                        replay_dir: str = None, apply_standings: bool = True) -> Dict[int, Dict]:
+    """Ingest race results for a season's imported races.
+    
+    Rows are buffered and bulk-upserted on (race, driver) every
+    ``batch_size`` rows, each batch committed on its own, so memory stays
+    bounded by one race session plus one batch. Drivers missing from the
+    season's roster (mid-season replacements) are added on the fly and
+    races with results are marked completed. ``progress`` is called with
+    (round, stats) as each race is read. ``replay_dir`` reads recorded
+    fixtures instead of the live APIs.
+    
+    Once everything is committed the imported races are applied, in round
+    order, to the standings of every league drafted for the season (see
+    ``apply_season_results``) unless ``apply_standings`` is off; each
+    round's stats then also count the leagues updated and skipped.
+    """
+    manager = F1DataManager(source=get_data_source(cache_dir, replay_dir))
+    query = Race.query.filter_by(season=season).order_by(Race.round)
+    if rounds:
+        query = query.filter(Race.round.in_(rounds))
+    races = [(race.id, race.round) for race in query]
+    driver_ids = {number: driver_id for driver_id, number in
+                  db.session.query(Driver.id, Driver.driver_number).filter_by(season=season)}
     stats = {}
+    batch = []
     
-    for season in range(start_season, end_season + 1):
+    def flush():
         try:
-            season_stats = manager.import_season_data(season)
-            stats[str(season)] = season_stats
+            bulk_upsert(RaceResult, batch, ('race_id', 'driver_id'))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        batch.clear()
+    
+    for race_id, round in races:
+        started = time.perf_counter()
+        try:
+            rows = manager.fetch_result_rows(season, round)
         except Exception as e:
-            print(f"Error importing data for season {season}: {str(e)}")
-            stats[str(season)] = {'error': str(e)}
+            print(f"Error importing results for {season} round {round}: {str(e)}")
+            stats[round] = {'error': str(e)}
+            if progress:
+                progress(round, stats[round])
+            continue
+        
+        missing = [row for row in rows if row['driver_number'] not in driver_ids]
+        if missing:
+            bulk_upsert(Driver, [{
+                'season': season,
+                'driver_number': row['driver_number'],
+                'code': row['code'],
+                'first_name': row['first_name'],
+                'last_name': row['last_name'],
+                'nationality': row['nationality'],
+                'date_of_birth': None,
+                'constructor': row['constructor'],
+                'status': 'active'
+            } for row in missing], ('season', 'driver_number'))
+            driver_ids.update(db.session.query(Driver.driver_number, Driver.id).filter(
+                Driver.season == season,
+                Driver.driver_number.in_([row['driver_number'] for row in missing])))
+        
+        for row in rows:
+            batch.append({
+                'race_id': race_id,
+                'driver_id': driver_ids[row['driver_number']],
+                'grid_position': row['grid_position'],
+                'position': row['position'],
+                'classification': row['classification'],
+                'status': row['status'],
+                'fastest_lap': row['fastest_lap']
+            })
+        if rows:
+            Race.query.filter_by(id=race_id).update({'status': 'completed'})
+        if len(batch) >= batch_size:
+            flush()
+        
+        stats[round] = {'results': len(rows), 'new_drivers': len(missing),
+                        'seconds': time.perf_counter() - started}
+        if progress:
+            progress(round, stats[round])
+    
+    # Commit the final partial batch (and any pending status updates)
+    flush()
+    
+    imported = [round for round, round_stats in stats.items() if round_stats.get('results')]
+    if apply_standings and imported:
+        for round, applied in apply_season_results(season, rounds=imported).items():
+            stats[round].update(leagues_updated=applied['applied'], leagues_skipped=applied['skipped'])
+    return stats
+
+def extract_season_laps(store_dir: str, cache_dir: str = None, season: int = None,
+                        rounds: Optional[List[int]] = None, force: bool = False,
+                        progress: Optional[Callable[[int, Dict], None]] = None,
+                        replay_dir: str = None) -> Dict[int, Dict]:
+    """Extract lap data for a season's imported races into the lap store.
+    
+    Races already in the store are skipped unless ``force`` is set.
+    """
+    manager = F1DataManager(source=get_data_source(cache_dir, replay_dir))
+    store = LapStore(store_dir)
+    query = db.session.query(Race.round).filter_by(season=season).order_by(Race.round)
+    if rounds:
+        query = query.filter(Race.round.in_(rounds))
+    stats = {}
+    for (round,) in query:
+        if not force and store.has(season, round):
+            stats[round] = {'skipped': True}
+        else:
+            try:
+                stats[round] = manager.extract_race_laps(season, round, store)
+            except Exception as e:
+                print(f"Error extracting laps for {season} round {round}: {str(e)}")
+                stats[round] = {'error': str(e)}
+        if progress:
+            progress(round, stats[round])
+    return stats
+
+def _fetch_season_worker(cache_dir: Optional[str], season: int, replay_dir: Optional[str] = None) -> Dict:
+    """Process-pool entry point: fetch and parse one season."""
+    return F1DataManager(source=get_data_source(cache_dir, replay_dir)).fetch_season_rows(season)
+
+def _resume_point() -> Optional[datetime]:
+    """Start time of an interrupted sync run, if the last one did not finish."""
+    value = Settings.get(SYNC_RUN_SETTING)
+    return datetime.fromisoformat(value) if value else None
+
+def import_historical_data(cache_dir: str = None, start_season: int = 2020, end_season: int = 2025,
+                           workers: int = 1,
+                           progress: Optional[Callable[[str, Dict], None]] = None,
+                           sync: bool = False, replay_dir: str = None) -> Dict[str, Dict[str, int]]:
+    """Import historical F1 data for a range of seasons.
+    
+    With ``workers > 1`` seasons are fetched and parsed in a process pool
+    while this process acts as the single writer, committing each season as
+    it arrives. ``progress`` is called with (season, stats) as each season
+    finishes.
+    
+    With ``sync`` only changed rounds and drivers are written (see
+    ``F1DataManager.sync_season_rows``). The run's start time is kept in
+    settings until every season has synced, so a run that was interrupted
+    or hit errors resumes on the next invocation, skipping the seasons it
+    already committed.
+    
+    ``replay_dir`` reads recorded fixtures instead of the live APIs.
+    """
+    manager = F1DataManager(source=get_data_source(cache_dir, replay_dir))
+    seasons = list(range(start_season, end_season + 1))
+    stats = {}
+    
+    if sync:
+        resume_from = _resume_point()
+        if resume_from:
+            done = {season for (season,) in db.session.query(ImportCheckpoint.season).filter(
+                ImportCheckpoint.season.in_(seasons), ImportCheckpoint.synced_at >= resume_from)}
+            for season in sorted(done):
+                stats[str(season)] = {'skipped': True}
+                if progress:
+                    progress(str(season), stats[str(season)])
+            seasons = [season for season in seasons if season not in done]
+        else:
+            Settings.set(SYNC_RUN_SETTING, datetime.utcnow().isoformat(),
+                         description='Start time of the F1 data sync in progress', category='import')
+    
+    def write(rows: Dict):
+        started = time.perf_counter()
+        season_stats = manager.sync_season_rows(rows) if sync else manager.write_season_rows(rows)
+        season_stats.update({
+            'fetch_seconds': rows['fetch_seconds'],
+            'write_seconds': time.perf_counter() - started,
+            'peak_rss_mb': rows['peak_rss_mb']
+        })
+        return season_stats
+    
+    def record(season: int, season_stats: Dict):
+        stats[str(season)] = season_stats
+        if progress:
+            progress(str(season), season_stats)
+    
+    if workers <= 1:
+        for season in seasons:
+            try:
+                record(season, write(manager.fetch_season_rows(season)))
+            except Exception as e:
+                print(f"Error importing data for season {season}: {str(e)}")
+                record(season, {'error': str(e)})
+    else:
+        # Spawned workers never inherit the writer's DB connections
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {pool.submit(_fetch_season_worker, cache_dir, season, replay_dir): season for season in seasons}
+            for future in as_completed(futures):
+                season = futures[future]
+                try:
+                    record(season, write(future.result()))
+                except Exception as e:
+                    print(f"Error importing data for season {season}: {str(e)}")
+                    record(season, {'error': str(e)})
     
-    return stats 
\ No newline at end of file
+    if sync and not any('error' in season_stats for season_stats in stats.values()):
+        Settings.set(SYNC_RUN_SETTING, '')
+    return {season: stats[season] for season in sorted(stats)}
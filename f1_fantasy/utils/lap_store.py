@@ -0,0 +1,160 @@
+"""On-disk, memory-mapped store of per-lap race data.
+
+Each race is extracted once from FastF1 into fixed-dtype NumPy arrays, one
+row per driver and one column per lap::
+
+    <root>/<season>/<round>/drivers.npy    int16   driver numbers (row order)
+    <root>/<season>/<round>/lap_times.npy  float32 lap time in seconds, NaN if none
+    <root>/<season>/<round>/positions.npy  int8    position at the end of the lap, 0 if none
+
+Readers open the arrays with ``mmap_mode='r'``, so every worker shares the
+page cache instead of holding its own copy, and features are computed with
+vectorized NumPy over the mapped arrays.
+"""
+import os
+from collections import namedtuple
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+from flask import current_app
+
+RaceLaps = namedtuple('RaceLaps', 'drivers lap_times positions')
+
+# Laps slower than this multiple of a driver's median (pit stops, safety cars)
+# are left out of consistency
+CONSISTENCY_CUTOFF = 1.07
+
+_ARRAYS = ('drivers', 'lap_times', 'positions')
+
+
+def extract_laps(laps: pd.DataFrame) -> RaceLaps:
+    """Pivot a FastF1 Laps frame into fixed-dtype (drivers x laps) arrays."""
+    drivers = np.array(sorted({int(number) for number in laps['DriverNumber']}), dtype=np.int16)
+    n_laps = int(laps['LapNumber'].max()) if len(laps) else 0
+    lap_times = np.full((len(drivers), n_laps), np.nan, dtype=np.float32)
+    positions = np.zeros((len(drivers), n_laps), dtype=np.int8)
+
+    laps = laps.dropna(subset=['LapNumber'])
+    rows = np.searchsorted(drivers, laps['DriverNumber'].astype(int).to_numpy())
+    columns = laps['LapNumber'].astype(int).to_numpy() - 1
+    lap_times[rows, columns] = laps['LapTime'].dt.total_seconds().to_numpy(dtype=np.float32)
+    positions[rows, columns] = laps['Position'].fillna(0).to_numpy(dtype=np.int8)
+    return RaceLaps(drivers, lap_times, positions)
+
+
+class LapStore:
+    """Reads and writes extracted races under a root directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def race_dir(self, season: int, round: int) -> str:
+        return os.path.join(self.root, str(season), str(round))
+
+    def has(self, season: int, round: int) -> bool:
+        return os.path.exists(os.path.join(self.race_dir(season, round), 'positions.npy'))
+
+    def write(self, season: int, round: int, race: RaceLaps):
+        """Write a race's arrays, each atomically, positions last (marks complete)."""
+        directory = self.race_dir(season, round)
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            path = os.path.join(directory, f'{name}.npy')
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as f:
+                np.save(f, getattr(race, name))
+            os.replace(temp_path, path)
+        _open.cache_clear()
+
+    def load(self, season: int, round: int) -> Optional[RaceLaps]:
+        """Memory-map a race's arrays read-only; None if it was never extracted."""
+        directory = self.race_dir(season, round)
+        try:
+            stat = os.stat(os.path.join(directory, 'positions.npy'))
+        except FileNotFoundError:
+            return None
+        # A rewrite (in any worker) replaces positions.npy last, so its inode
+        # and mtime tell this worker's cached maps are stale
+        return _open(directory, (stat.st_ino, stat.st_mtime_ns))
+
+
+@lru_cache(maxsize=256)
+def _open(directory: str, version: Tuple[int, int]) -> RaceLaps:
+    return RaceLaps(*(np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in _ARRAYS))
+
+
+def best_lap_times(race: RaceLaps) -> np.ndarray:
+    """Each driver's fastest lap in seconds (NaN if they set none)."""
+    times = np.asarray(race.lap_times)
+    best = np.full(len(times), np.nan, dtype=np.float32)
+    has_lap = ~np.isnan(times).all(axis=1)
+    best[has_lap] = np.nanmin(times[has_lap], axis=1)
+    return best
+
+
+def fastest_lap_mask(race: RaceLaps) -> np.ndarray:
+    """Boolean mask of the driver(s) who set the race's fastest lap."""
+    best = best_lap_times(race)
+    if np.isnan(best).all():
+        return np.zeros(len(best), dtype=bool)
+    return best == np.nanmin(best)
+
+
+def grid_and_finish(race: RaceLaps) -> Tuple[np.ndarray, np.ndarray]:
+    """Position after the first lap and at each driver's last completed lap."""
+    positions = np.asarray(race.positions)
+    if positions.shape[1] == 0:
+        empty = np.zeros(len(positions), dtype=np.int8)
+        return empty, empty
+    completed = positions > 0
+    last = np.where(completed.any(axis=1), completed.shape[1] - 1 - np.argmax(completed[:, ::-1], axis=1), 0)
+    return positions[:, 0], positions[np.arange(len(positions)), last]
+
+
+def positions_gained(race: RaceLaps) -> np.ndarray:
+    """Places gained from the end of lap 1 to the final lap (never negative)."""
+    start, finish = grid_and_finish(race)
+    start = start.astype(np.int16)
+    finish = finish.astype(np.int16)
+    return np.where((start > 0) & (finish > 0), start - finish, 0).clip(min=0)
+
+
+def consistency(race: RaceLaps, cutoff: float = CONSISTENCY_CUTOFF) -> np.ndarray:
+    """Standard deviation of each driver's representative laps, in seconds.
+
+    Lap 1 and laps slower than ``cutoff`` x the driver's median are ignored;
+    lower is more consistent. NaN for drivers with fewer than two laps left.
+    """
+    times = np.asarray(race.lap_times)[:, 1:]
+    result = np.full(len(times), np.nan, dtype=np.float32)
+    counted = (~np.isnan(times)).sum(axis=1)
+    rows = counted >= 2
+    if not rows.any():
+        return result
+    times = times[rows]
+    median = np.nanmedian(times, axis=1, keepdims=True)
+    times = np.where(times <= median * cutoff, times, np.nan)
+    enough = (~np.isnan(times)).sum(axis=1) >= 2
+    spread = np.full(len(times), np.nan, dtype=np.float32)
+    spread[enough] = np.nanstd(times[enough], axis=1)
+    result[rows] = spread
+    return result
+
+
+def race_features(race: RaceLaps) -> dict:
+    """All per-driver features of a race, aligned with ``race.drivers``."""
+    return {
+        'driver_number': np.asarray(race.drivers),
+        'best_lap': best_lap_times(race),
+        'fastest_lap': fastest_lap_mask(race),
+        'positions_gained': positions_gained(race),
+        'consistency': consistency(race)
+    }
+
+
+def lap_store(root: str = None) -> LapStore:
+    """The store configured for the app (LAP_STORE_DIR), or under ``root``."""
+    if root is None:
+        root = current_app.config['LAP_STORE_DIR']
+    return LapStore(root)
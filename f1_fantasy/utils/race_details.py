@@ -0,0 +1,177 @@
+"""Cached race details.
+
+A FastF1 race session is loaded once and reduced to a compact summary:
+weather downsampled into fixed buckets, track status as intervals and a
+handful of key stats. Summaries are kept in two tiers, an in-process LRU in
+front of small JSON files on disk, so repeat lookups never construct or
+parse a FastF1 session again. Only summaries of finished races are cached.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache, partial
+from typing import Callable, Dict, Optional
+import fastf1
+import pandas as pd
+from .fastf1_cache import ManagedCache, managed_cache
+
+DEFAULT_MAXSIZE = 256
+WEATHER_BUCKET = timedelta(minutes=10)
+
+# FastF1 track status codes
+TRACK_STATUS = {'1': 'green', '2': 'yellow', '4': 'safety_car', '5': 'red', '6': 'vsc', '7': 'vsc_ending'}
+
+SummaryLoader = Callable[[int, int], Dict]
+
+
+def _seconds(value) -> Optional[float]:
+    return None if pd.isna(value) else round(value.total_seconds(), 3)
+
+
+def summarize_weather(weather: pd.DataFrame, bucket: timedelta = WEATHER_BUCKET) -> Dict:
+    """Downsample weather samples into columnar per-bucket averages."""
+    if weather is None or weather.empty:
+        return {}
+    buckets = weather.groupby(weather['Time'] // bucket)
+    summary = buckets[['AirTemp', 'TrackTemp', 'Humidity', 'WindSpeed']].mean().round(1)
+    return {
+        'minute': [int(index * bucket.total_seconds() // 60) for index in summary.index],
+        'air_temp': summary['AirTemp'].tolist(),
+        'track_temp': summary['TrackTemp'].tolist(),
+        'humidity': summary['Humidity'].tolist(),
+        'wind_speed': summary['WindSpeed'].tolist(),
+        'rainfall': buckets['Rainfall'].any().astype(bool).tolist()
+    }
+
+
+def summarize_track_status(track_status: pd.DataFrame) -> list:
+    """Collapse track status messages into [start, end, status] intervals (seconds)."""
+    if track_status is None or track_status.empty:
+        return []
+    starts = track_status['Time'].tolist()
+    ends = starts[1:] + [None]
+    return [[_seconds(start), _seconds(end) if end is not None else None,
+             TRACK_STATUS.get(str(status), str(status))]
+            for start, end, status in zip(starts, ends, track_status['Status'])]
+
+
+def summarize_session(session) -> Dict:
+    """Reduce a loaded race session to a compact, JSON-serialisable summary."""
+    results = session.results
+    laps = session.laps
+    intervals = summarize_track_status(session.track_status)
+    fastest = laps.pick_fastest() if laps is not None and not laps.empty else None
+    classified = results['ClassifiedPosition'].astype(str).str.isdigit() if not results.empty else []
+    winner = results.loc[results['Position'] == 1, 'Abbreviation'] if not results.empty else []
+    weather = summarize_weather(session.weather_data)
+
+    return {
+        'race_name': session.event['EventName'],
+        'circuit': session.event['Location'],
+        'date': session.event['EventDate'].date().isoformat(),
+        'complete': not results.empty and fastest is not None,
+        'weather': weather,
+        'track_status': intervals,
+        'stats': {
+            'laps': int(laps['LapNumber'].max()) if fastest is not None else None,
+            'winner': winner.iloc[0] if len(winner) else None,
+            'fastest_lap_driver': fastest['Driver'] if fastest is not None else None,
+            'fastest_lap_seconds': _seconds(fastest['LapTime']) if fastest is not None else None,
+            'finishers': int(sum(classified)),
+            'retirements': int(len(results) - sum(classified)),
+            'safety_cars': sum(1 for interval in intervals if interval[2] == 'safety_car'),
+            'virtual_safety_cars': sum(1 for interval in intervals if interval[2] == 'vsc'),
+            'red_flags': sum(1 for interval in intervals if interval[2] == 'red'),
+            'rain': any(weather.get('rainfall', []))
+        }
+    }
+
+
+def load_race_summary(season: int, round: int, cache: Optional[ManagedCache] = None) -> Dict:
+    """Load a race session from FastF1 (no telemetry or messages) and summarize it."""
+    session = fastf1.get_session(season, round, 'R')
+    # Laps are needed for track status and the fastest lap; telemetry is not
+    options = dict(laps=True, telemetry=False, weather=True, messages=False)
+    if cache:
+        cache.load(session, **options)
+    else:
+        session.load(**options)
+    return summarize_session(session)
+
+
+class RaceDetailsService:
+    """Two-tier cache (in-process LRU, then on-disk JSON) of race summaries."""
+
+    def __init__(self, summary_dir: str, loader: SummaryLoader = load_race_summary,
+                 maxsize: int = DEFAULT_MAXSIZE):
+        self.summary_dir = summary_dir
+        self.loader = loader
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'loads': 0}
+
+    def path(self, season: int, round: int) -> str:
+        return os.path.join(self.summary_dir, str(season), f'{round}.json')
+
+    def get(self, season: int, round: int) -> Dict:
+        """Get a race summary, loading it from FastF1 only on a cold miss."""
+        key = (season, round)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return self._memory[key]
+
+        summary = self._read(season, round)
+        if summary is not None:
+            self.stats['disk_hits'] += 1
+        else:
+            summary = self.loader(season, round)
+            self.stats['loads'] += 1
+            if not summary.get('complete'):
+                # Unfinished races are served but not cached
+                return summary
+            self._write(season, round, summary)
+
+        with self._lock:
+            self._memory[key] = summary
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+        return summary
+
+    def invalidate(self, season: int, round: int):
+        """Drop a cached summary from both tiers."""
+        with self._lock:
+            self._memory.pop((season, round), None)
+        try:
+            os.remove(self.path(season, round))
+        except FileNotFoundError:
+            pass
+
+    def _read(self, season: int, round: int) -> Optional[Dict]:
+        try:
+            with open(self.path(season, round)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, season: int, round: int, summary: Dict):
+        path = self.path(season, round)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(summary, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+
+@lru_cache(maxsize=None)
+def race_details_service(cache_dir: str = None) -> RaceDetailsService:
+    """The shared service for a FastF1 cache directory (one per process)."""
+    root = cache_dir or os.path.expanduser('~/.fastf1')
+    loader = partial(load_race_summary, cache=managed_cache(root))
+    return RaceDetailsService(os.path.join(root, 'summaries'), loader=loader)
@@ -0,0 +1,106 @@
+"""Batched rescoring of past races when a league's scoring rules change.
+
+Every applied race is rescored from the result columns stored on its
+standings rows. Races are processed in chunks, each committed as a single
+transaction, and rows whose input hash (scoring rules + results) is
+unchanged are not rescored. Running totals and ranks are still rolled
+forward in memory so an earlier change propagates to later rounds.
+"""
+import time
+from typing import Callable, Dict, Optional
+from ..models import db, League, Team, TeamStanding
+from .scoring import rules_fingerprint
+
+DEFAULT_CHUNK_SIZE = 10
+
+ProgressCallback = Callable[[Dict], None]
+
+
+def rescore_league(league: League, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """Recompute every applied race for a league under its current rules.
+
+    Returns counts of races seen, races with rescored rows and rows written.
+    ``progress`` is called after each committed chunk with the running stats.
+    """
+    fingerprint = rules_fingerprint(league.compiled_scoring())
+    races = (db.session.query(TeamStanding.race_id, TeamStanding.season, TeamStanding.round)
+             .filter(TeamStanding.league_id == league.id)
+             .distinct()
+             .order_by(TeamStanding.season, TeamStanding.round)
+             .all())
+    stats = {'league_id': league.id, 'races': len(races), 'processed': 0,
+             'rescored_races': 0, 'updated_rows': 0}
+
+    season = None
+    totals = {}
+    for start in range(0, len(races), chunk_size):
+        chunk = races[start:start + chunk_size]
+        rows_by_race = {}
+        for row in TeamStanding.query.filter(
+                TeamStanding.league_id == league.id,
+                TeamStanding.race_id.in_([race_id for race_id, _, _ in chunk])):
+            rows_by_race.setdefault(row.race_id, []).append(row)
+
+        for race_id, race_season, _ in chunk:
+            if race_season != season:
+                season, totals = race_season, {}
+            rows = rows_by_race.get(race_id, [])
+            rescored = False
+            updated = set()
+            for row in rows:
+                input_hash = TeamStanding.hash_inputs(fingerprint, row.results)
+                if input_hash != row.input_hash:
+                    points = TeamStanding.score_team_results(league, row.results)
+                    if points != row.points:
+                        row.points = points
+                        updated.add(row.team_id)
+                    row.input_hash = input_hash
+                    rescored = True
+                totals[row.team_id] = totals.get(row.team_id, 0) + row.points
+
+            ranks = TeamStanding.rank_totals({row.team_id: totals[row.team_id] for row in rows})
+            for row in rows:
+                if row.total_points != totals[row.team_id] or row.rank != ranks[row.team_id]:
+                    row.total_points = totals[row.team_id]
+                    row.rank = ranks[row.team_id]
+                    updated.add(row.team_id)
+            stats['updated_rows'] += len(updated)
+            stats['rescored_races'] += int(rescored)
+            stats['processed'] += 1
+
+        db.session.commit()
+        if progress:
+            progress(dict(stats))
+
+    if races:
+        # Team.points mirrors the running total of the latest applied race
+        for team in Team.query.filter_by(league_id=league.id):
+            team.points = totals.get(team.id, 0)
+        db.session.commit()
+    return stats
+
+
+def rescore_all(chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Optional[ProgressCallback] = None,
+                league_ids=None) -> Dict[str, int]:
+    """Rescore every league (or the given league ids) after a global rule fix.
+
+    Leagues are streamed by id and expunged after processing so memory stays
+    flat regardless of how many leagues exist. Compiled rules are cached per
+    worker, so leagues sharing a point system share one lookup table.
+    """
+    query = db.session.query(League.id).order_by(League.id)
+    if league_ids:
+        query = query.filter(League.id.in_(league_ids))
+    ids = [league_id for (league_id,) in query]
+
+    totals = {'leagues': len(ids), 'races': 0, 'rescored_races': 0, 'updated_rows': 0}
+    started = time.perf_counter()
+    for league_id in ids:
+        league = League.query.get(league_id)
+        stats = rescore_league(league, chunk_size=chunk_size, progress=progress)
+        for key in ('races', 'rescored_races', 'updated_rows'):
+            totals[key] += stats[key]
+        db.session.expunge_all()
+    totals['elapsed'] = time.perf_counter() - started
+    return totals
@@ -0,0 +1,229 @@
+"""Monte Carlo championship-odds simulator for leagues.
+
+Remaining races of a season are simulated as whole NumPy arrays: for every
+simulation and race a finishing order is drawn from a Plackett-Luce model
+over driver strengths (via the Gumbel-max trick), scored through the
+league's compiled point table and summed into team totals with a roster
+matrix product. Given the same seed the results are fully deterministic.
+
+Driver strengths are Plackett-Luce maximum a posteriori estimates fitted
+to the classified finishing orders of the most recent races (this season
+up to the simulated round, then last season), with a Gamma prior that
+pulls drivers with little data towards the field average.
+"""
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from ..models import db, Race, RaceResult, Driver, Team, TeamStanding
+from .scoring import DNF, table_index
+from .draft import team_driver_ids
+
+DEFAULT_SIMULATIONS = 20000
+DEFAULT_DNF_RATE = 0.05
+STRENGTH_RACES = 10  # Most recent races the strengths are fitted to
+STRENGTH_PRIOR = 2.0  # Gamma prior shape; one pseudo-win per driver towards strength 1
+STRENGTH_ITERATIONS = 100
+# Simulations are processed in chunks to bound peak memory
+CHUNK_SIZE = 5000
+
+
+def simulate_finishing_positions(strengths: np.ndarray, n_sims: int, rng: np.random.Generator,
+                                 dnf_rate: float = DEFAULT_DNF_RATE) -> np.ndarray:
+    """Draw ``n_sims`` finishing orders for one race.
+
+    Returns an (n_sims x n_drivers) int16 array of position codes, with
+    non-finishers set to the DNF sentinel.
+    """
+    n_drivers = len(strengths)
+    keys = np.log(strengths) + rng.gumbel(size=(n_sims, n_drivers))
+    order = np.argsort(-keys, axis=1)
+    positions = np.empty((n_sims, n_drivers), dtype=np.int16)
+    np.put_along_axis(positions, order, np.arange(1, n_drivers + 1, dtype=np.int16), axis=1)
+    if dnf_rate > 0:
+        positions[rng.random((n_sims, n_drivers)) < dnf_rate] = DNF
+    return positions
+
+
+def simulate_season(current_totals: Sequence[int], rosters: np.ndarray, strengths: Sequence[float],
+                    point_table: np.ndarray, n_races: int, n_sims: int = DEFAULT_SIMULATIONS,
+                    seed: int = 0, dnf_rate: float = DEFAULT_DNF_RATE) -> Dict[str, np.ndarray]:
+    """Simulate the rest of a season and return per-team finishing probabilities.
+
+    ``rosters`` is a (n_drivers x n_teams) 0/1 matrix mapping drivers to the
+    teams that own them. The returned dict holds ``rank_probabilities``
+    (n_teams x n_teams, row = team, column = final position),
+    ``expected_points`` and the derived ``p_first`` / ``p_top3``.
+    """
+    rng = np.random.default_rng(seed)
+    current_totals = np.asarray(current_totals, dtype=np.int64)
+    strengths = np.asarray(strengths, dtype=np.float64)
+    rosters = np.asarray(rosters, dtype=np.int64)
+    n_teams = len(current_totals)
+
+    rank_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    points_sum = np.zeros(n_teams, dtype=np.float64)
+
+    for start in range(0, n_sims, CHUNK_SIZE):
+        chunk = min(CHUNK_SIZE, n_sims - start)
+        totals = np.broadcast_to(current_totals, (chunk, n_teams)).copy()
+        if len(strengths) and n_teams:
+            for _ in range(n_races):
+                positions = simulate_finishing_positions(strengths, chunk, rng, dnf_rate)
+                totals += point_table[table_index(positions)] @ rosters
+        # Random tie-break so tied teams share the probability mass evenly
+        tie_break = rng.random((chunk, n_teams))
+        order = np.lexsort((tie_break, -totals), axis=1)
+        np.add.at(rank_counts, (order, np.arange(n_teams)), 1)
+        points_sum += totals.sum(axis=0)
+
+    rank_probabilities = rank_counts / max(n_sims, 1)
+    return {
+        'rank_probabilities': rank_probabilities,
+        'p_first': rank_probabilities[:, :1].sum(axis=1),
+        'p_top3': rank_probabilities[:, :3].sum(axis=1),
+        'expected_points': points_sum / max(n_sims, 1),
+    }
+
+
+def team_rosters(teams: List[Team], drivers: List[Driver]) -> np.ndarray:
+    """Build the (drivers x teams) roster matrix for a league from its draft.
+
+    Teams that have not drafted (or drafted drivers from another season)
+    score nothing in the simulated races.
+    """
+    rosters = np.zeros((len(drivers), len(teams)), dtype=np.int64)
+    rows = {driver.id: index for index, driver in enumerate(drivers)}
+    drafted = team_driver_ids([team.id for team in teams])
+    for column, team in enumerate(teams):
+        for driver_id in drafted[team.id]:
+            if driver_id in rows:
+                rosters[rows[driver_id], column] = 1
+    return rosters
+
+
+def fit_strengths(orders: List[np.ndarray], n_drivers: int, prior: float = STRENGTH_PRIOR,
+                  iterations: int = STRENGTH_ITERATIONS, tolerance: float = 1e-6) -> np.ndarray:
+    """MAP Plackett-Luce strengths from finishing orders (driver indexes, winner first).
+
+    Uses the minorize-maximize updates of Hunter (2004) with a Gamma(prior, 1)
+    prior, normalised to mean 1. Drivers absent from every order get 1.
+    """
+    strengths = np.ones(n_drivers, dtype=np.float64)
+    if not orders or not n_drivers:
+        return strengths
+    # Each finisher but the last is chosen once, at their own stage of the race's order
+    wins = prior - 1 + np.bincount(np.concatenate([order[:-1] for order in orders]), minlength=n_drivers)
+    for _ in range(iterations):
+        exposure = np.ones(n_drivers, dtype=np.float64)  # Rate of the Gamma prior
+        for order in orders:
+            # Stage t chooses among the drivers still unplaced: suffix sums of strengths
+            remaining = np.cumsum(strengths[order][::-1])[::-1][:-1]
+            exposure[order] += np.append(np.cumsum(1 / remaining), np.sum(1 / remaining))
+        updated = wins / exposure
+        updated /= updated.mean()
+        converged = np.abs(updated - strengths).max() < tolerance
+        strengths = updated
+        if converged:
+            break
+    return strengths
+
+
+def driver_strengths(drivers: List[Driver], season: Optional[int] = None, last_round: Optional[int] = None,
+                     n_races: int = STRENGTH_RACES) -> np.ndarray:
+    """Relative Plackett-Luce strengths for the season's drivers, fitted to recent results.
+
+    Uses the last ``n_races`` races of ``season`` up to ``last_round`` and
+    then of the previous season, whose drivers are matched by code (else
+    number). Without any results every driver has strength 1.
+    """
+    if not drivers:
+        return np.ones(0, dtype=np.float64)
+    season = season if season is not None else drivers[0].season
+    index = {driver.id: i for i, driver in enumerate(drivers)}
+    by_key = {driver.code or driver.driver_number: i for i, driver in enumerate(drivers)}
+    for driver in Driver.query.filter_by(season=season - 1):
+        key = driver.code or driver.driver_number
+        if key in by_key:
+            index.setdefault(driver.id, by_key[key])
+
+    races = Race.query.filter(Race.season.in_([season, season - 1]))
+    if last_round is not None:
+        races = races.filter(db.or_(Race.season < season, Race.round <= last_round))
+    races = races.filter(db.session.query(RaceResult.id).filter(RaceResult.race_id == Race.id).exists())
+    race_ids = [race.id for race in races.order_by(Race.season.desc(), Race.round.desc()).limit(n_races)]
+
+    finishes = {}
+    for race_id, driver_id in (db.session.query(RaceResult.race_id, RaceResult.driver_id)
+                               .filter(RaceResult.race_id.in_(race_ids), RaceResult.position.isnot(None))
+                               .order_by(RaceResult.race_id, RaceResult.position)):
+        if driver_id in index:
+            finishes.setdefault(race_id, []).append(index[driver_id])
+    orders = [np.array(order) for order in finishes.values() if len(order) > 1]
+    return fit_strengths(orders, len(drivers))
+
+
+def starting_point(league, season: Optional[int] = None):
+    """Get the (season, last scored round, team totals) a simulation starts from.
+
+    Returns ``None`` if there is no season to simulate.
+    """
+    standings = TeamStanding.for_league(league.id, season=season)
+    if standings:
+        return (standings[0].season, standings[0].round,
+                {row.team_id: row.total_points for row in standings})
+    if season is None:
+        season = db.session.query(db.func.max(Race.season)).scalar()
+    if season is None:
+        return None
+    return season, 0, {}
+
+
+def simulate_league_odds(league, n_sims: int = DEFAULT_SIMULATIONS, seed: int = 0,
+                         season: Optional[int] = None,
+                         strengths: Optional[Dict[int, float]] = None) -> Optional[Dict]:
+    """Simulate the remaining season for a league from its current standings.
+
+    ``strengths`` maps driver id to a Plackett-Luce strength (missing
+    drivers get 1) in place of the ones fitted by ``driver_strengths``.
+
+    Returns ``None`` if there is no season to simulate, otherwise a dict with
+    the season, the last scored round, the number of remaining races and a
+    per-team odds mapping keyed by team id.
+    """
+    start = starting_point(league, season)
+    if start is None:
+        return None
+    season, last_round, current = start
+
+    teams = Team.query.filter_by(league_id=league.id).order_by(Team.id).all()
+    drivers = Driver.query.filter_by(season=season).order_by(Driver.driver_number).all()
+    n_races = Race.query.filter(
+        Race.season == season,
+        Race.round > last_round,
+        Race.status != 'cancelled'
+    ).count()
+
+    result = simulate_season(
+        current_totals=[current.get(team.id, 0) for team in teams],
+        rosters=team_rosters(teams, drivers),
+        strengths=([strengths.get(driver.id, 1.0) for driver in drivers] if strengths is not None
+                   else driver_strengths(drivers, season, last_round)),
+        point_table=league.compiled_scoring().table,
+        n_races=n_races,
+        n_sims=n_sims,
+        seed=seed
+    )
+
+    odds = {}
+    for index, team in enumerate(teams):
+        odds[team.id] = {
+            'p_first': float(result['p_first'][index]),
+            'p_top3': float(result['p_top3'][index]),
+            'expected_points': float(result['expected_points'][index]),
+            'rank_probabilities': [float(p) for p in result['rank_probabilities'][index]],
+        }
+    return {
+        'season': season,
+        'round': last_round,
+        'remaining_races': n_races,
+        'odds': odds,
+    }
@@ -0,0 +1,121 @@
+"""Columnar (Parquet) snapshots of a season's reference data.
+
+Each season is written as one Parquet file per table::
+
+    <root>/<season>/races.parquet
+    <root>/<season>/drivers.parquet
+    <root>/<season>/results.parquet
+
+Results reference races and drivers by their natural keys (round, driver
+number) rather than database ids, so a snapshot can be loaded in one bulk
+read for analytics or used to re-hydrate the SQL tables on a fresh install.
+"""
+import os
+from typing import Dict, Iterable
+import pandas as pd
+from flask import current_app
+from ..models import db, Race, Driver, RaceResult
+from .bulk import bulk_upsert
+
+TABLES = ('races', 'drivers', 'results')
+
+RACE_COLUMNS = ['season', 'round', 'name', 'circuit_name', 'country', 'city', 'date', 'time', 'status']
+DRIVER_COLUMNS = ['season', 'driver_number', 'code', 'first_name', 'last_name', 'nationality',
+                  'date_of_birth', 'constructor', 'status']
+RESULT_COLUMNS = ['round', 'driver_number', 'grid_position', 'position', 'classification', 'status',
+                  'fastest_lap']
+
+# Nullable integer dtypes keep integer columns with gaps from turning into floats
+_DTYPES = {
+    'races': {'season': 'Int16', 'round': 'Int16'},
+    'drivers': {'season': 'Int16', 'driver_number': 'Int16'},
+    'results': {'round': 'Int16', 'driver_number': 'Int16', 'grid_position': 'Int16', 'position': 'Int16'}
+}
+
+
+def snapshot_dir(root: str = None) -> str:
+    """The configured snapshot directory (SNAPSHOT_DIR), or ``root``."""
+    return root or current_app.config['SNAPSHOT_DIR']
+
+
+def _path(root: str, season: int, table: str) -> str:
+    return os.path.join(root, str(season), f'{table}.parquet')
+
+
+def _columns(model, names):
+    return [getattr(model, name) for name in names]
+
+
+def season_frames(season: int) -> Dict[str, pd.DataFrame]:
+    """Read a season's races, drivers and results from the database as frames."""
+    races = db.session.query(*_columns(Race, RACE_COLUMNS)).filter(Race.season == season).order_by(Race.round)
+    drivers = (db.session.query(*_columns(Driver, DRIVER_COLUMNS))
+               .filter(Driver.season == season).order_by(Driver.driver_number))
+    results = (db.session.query(Race.round, Driver.driver_number,
+                                *_columns(RaceResult, RESULT_COLUMNS[2:]))
+               .join(Race, RaceResult.race_id == Race.id)
+               .join(Driver, RaceResult.driver_id == Driver.id)
+               .filter(Race.season == season)
+               .order_by(Race.round, Driver.driver_number))
+    frames = {
+        'races': pd.DataFrame(races.all(), columns=RACE_COLUMNS),
+        'drivers': pd.DataFrame(drivers.all(), columns=DRIVER_COLUMNS),
+        'results': pd.DataFrame(results.all(), columns=RESULT_COLUMNS)
+    }
+    return {table: frame.astype(_DTYPES[table]) for table, frame in frames.items()}
+
+
+def export_season(root: str, season: int) -> Dict[str, int]:
+    """Write a season's snapshot; returns the row count per table."""
+    stats = {}
+    for table, frame in season_frames(season).items():
+        path = _path(root, season, table)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        frame.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+        stats[table] = len(frame)
+    return stats
+
+
+def load_season(root: str, season: int, tables: Iterable[str] = TABLES) -> Dict[str, pd.DataFrame]:
+    """Load a season's snapshot, one bulk columnar read per table."""
+    frames = {}
+    for table in tables:
+        path = _path(root, season, table)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No {table} snapshot for season {season} in {root}')
+        frames[table] = pd.read_parquet(path)
+    return frames
+
+
+def _records(frame: pd.DataFrame):
+    """Frame rows as dicts of builtin values, with missing values as None."""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def import_season(root: str, season: int) -> Dict[str, int]:
+    """Re-hydrate a season's races, drivers and results from its snapshot.
+
+    Rows are bulk-upserted on their natural keys in a single transaction, so
+    importing over existing data is safe.
+    """
+    frames = load_season(root, season)
+    try:
+        stats = {
+            'races': bulk_upsert(Race, _records(frames['races']), ('season', 'round')),
+            'drivers': bulk_upsert(Driver, _records(frames['drivers']), ('season', 'driver_number'))
+        }
+        race_ids = dict(db.session.query(Race.round, Race.id).filter(Race.season == season))
+        driver_ids = dict(db.session.query(Driver.driver_number, Driver.id).filter(Driver.season == season))
+        results = []
+        for row in _records(frames['results']):
+            row['race_id'] = race_ids[row.pop('round')]
+            row['driver_id'] = driver_ids[row.pop('driver_number')]
+            results.append(row)
+        stats['results'] = bulk_upsert(RaceResult, results, ('race_id', 'driver_id'))
+        db.session.commit()
+        return stats
+    except Exception:
+        db.session.rollback()
+        raise
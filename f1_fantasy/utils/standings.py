@@ -0,0 +1,82 @@
+"""Applying imported race results to league standings.
+
+A league scores a race once its draft for that season is complete: each
+team's result columns are its drafted drivers' ``RaceResult`` rows, which
+``TeamStanding.apply_race`` turns into the race's standings snapshot.
+Races are applied in round order, so every snapshot builds on the last.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models import db, League, Race, RaceResult, Draft, Team, TeamStanding
+from .draft import team_driver_ids
+
+
+def drafted_league_ids(season: int) -> List[int]:
+    """Leagues whose draft for ``season`` is complete."""
+    return [league_id for (league_id,) in db.session.query(Draft.league_id)
+            .filter(Draft.season == season, Draft.status == 'completed').order_by(Draft.league_id)]
+
+
+def race_results(race: Race) -> Dict[int, Tuple]:
+    """A race's (position, grid, fastest lap) per driver id.
+
+    Plain values rather than rows: applying the race commits once per
+    league, which would expire the rows and reload each one.
+    """
+    return {result.driver_id: (result.scoring_position, result.grid_position or 0, bool(result.fastest_lap))
+            for result in RaceResult.query.filter_by(race_id=race.id)}
+
+
+def team_results(results: Dict[int, Tuple], rosters: Dict[int, List[int]]) -> Dict[int, Dict]:
+    """Result columns per team for a race, from its drafted drivers' results.
+
+    ``results`` is the race's ``race_results``. Drafted drivers without a
+    result (e.g. replaced for the race) score nothing.
+    """
+    columns = {}
+    for team_id, driver_ids in rosters.items():
+        rows = [results[driver_id] for driver_id in driver_ids if driver_id in results]
+        columns[team_id] = {
+            'position': [position for position, _, _ in rows],
+            'grid': [grid for _, grid, _ in rows],
+            'fastest_lap': [fastest_lap for _, _, fastest_lap in rows]
+        }
+    return columns
+
+
+def apply_race_results(race: Race, league_ids: Optional[List[int]] = None) -> Dict[str, int]:
+    """Apply a race's results to every drafted league (or the given ones).
+
+    Leagues that already have standings for a later round are skipped:
+    rescore them instead. Returns counts of applied and skipped leagues.
+    """
+    if league_ids is None:
+        league_ids = drafted_league_ids(race.season)
+    stats = {'applied': 0, 'skipped': 0}
+    results = race_results(race)
+    for league_id in league_ids:
+        league = db.session.get(League, league_id)
+        teams = [team_id for (team_id,) in db.session.query(Team.id).filter_by(league_id=league_id)]
+        try:
+            TeamStanding.apply_race(league, race, team_results(results, team_driver_ids(teams)))
+            stats['applied'] += 1
+        except ValueError:
+            stats['skipped'] += 1
+    return stats
+
+
+def apply_season_results(season: int, rounds: Optional[List[int]] = None,
+                         progress: Optional[Callable[[int, Dict], None]] = None) -> Dict[int, Dict]:
+    """Apply every completed race of a season (or the given rounds) in round order.
+
+    ``progress`` is called with (round, stats) as each race is applied.
+    """
+    query = Race.query.filter_by(season=season, status='completed').order_by(Race.round)
+    if rounds:
+        query = query.filter(Race.round.in_(rounds))
+    league_ids = drafted_league_ids(season)
+    stats = {}
+    for race in query.all():
+        stats[race.round] = apply_race_results(race, league_ids)
+        if progress:
+            progress(race.round, stats[race.round])
+    return stats
@@ -1,18 +1,23 @@
-from flask import Blueprint, render_template, flash, redirect, url_for, request, abort, current_app
+from flask import Blueprint, render_template, flash, redirect, url_for, request, abort, current_app, jsonify
 from flask_security import login_required, roles_required, current_user
 from flask_security.utils import hash_password
 from functools import wraps
 from f1_fantasy.forms.settings import SettingsForm
-from f1_fantasy.models.settings import Settings
-from f1_fantasy.models import db, User, Role, League, Team
+from f1_fantasy.models.settings import Settings, SettingsAudit
+from f1_fantasy.models import db, User, Role, League, Team, ImportJob
+from f1_fantasy.utils.import_jobs import enqueue_seasons, enqueue_results
 from f1_fantasy.security import user_datastore
+from f1_fantasy.extensions import cache
 from datetime import datetime
-from wtforms import StringField, PasswordField, BooleanField, SelectMultipleField
-from wtforms.validators import DataRequired, Email, Length, EqualTo, Optional
+from wtforms import StringField, PasswordField, BooleanField, SelectMultipleField, SelectField, IntegerField
+from wtforms.validators import DataRequired, Email, Length, EqualTo, Optional, NumberRange
 from flask_wtf import FlaskForm
 
 bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Most import jobs the status endpoint returns per poll
+MAX_STATUS_JOBS = 100
+
 @bp.before_request
 @login_required
 @roles_required('admin')
@@ -45,6 +50,7 @@ def index():
                          teams=teams,
                          maintenance_mode=maintenance_mode,
                          smtp_configured=smtp_configured,
+                         import_jobs=ImportJob.recent(3),
                          now=datetime.now)
 
 @bp.route('/settings', methods=['GET', 'POST'])
@@ -59,43 +65,36 @@ def settings():
     form.category.data = category
     
     if form.validate_on_submit():
-        # Update settings based on category
+        # Update settings based on category, in one transaction
         if category == 'general':
-            Settings.set('app_name', form.app_name.data, 
-                'Application name displayed in the title and header', 
-                'general', current_user.id)
-            Settings.set('app_description', form.app_description.data,
-                'Application description shown on the homepage',
-                'general', current_user.id)
-            Settings.set('maintenance_mode', str(form.maintenance_mode.data),
-                'Enable maintenance mode to restrict access to admin users only',
-                'general', current_user.id)
-            Settings.set('allow_registration', str(form.allow_registration.data),
-                'Allow new users to register',
-                'general', current_user.id)
-            Settings.set('require_email_confirmation', str(form.require_email_confirmation.data),
-                'Require email confirmation for new registrations',
-                'general', current_user.id)
-            Settings.set('session_timeout', str(form.session_timeout.data),
-                'Session timeout in minutes',
-                'general', current_user.id)
+            Settings.set_many({
+                'app_name': (form.app_name.data,
+                    'Application name displayed in the title and header'),
+                'app_description': (form.app_description.data,
+                    'Application description shown on the homepage'),
+                'maintenance_mode': (str(form.maintenance_mode.data),
+                    'Enable maintenance mode to restrict access to admin users only'),
+                'allow_registration': (str(form.allow_registration.data),
+                    'Allow new users to register'),
+                'require_email_confirmation': (str(form.require_email_confirmation.data),
+                    'Require email confirmation for new registrations'),
+                'session_timeout': (str(form.session_timeout.data),
+                    'Session timeout in minutes'),
+            }, 'general', current_user.id)
             
         elif category == 'league':
-            Settings.set('max_leagues_per_user', str(form.max_leagues_per_user.data),
-                'Maximum number of leagues a user can join',
-                'league', current_user.id)
-            Settings.set('max_teams_per_league', str(form.max_teams_per_league.data),
-                'Maximum number of teams allowed in a league',
-                'league', current_user.id)
-            Settings.set('min_teams_per_league', str(form.min_teams_per_league.data),
-                'Minimum number of teams required in a league',
-                'league', current_user.id)
-            Settings.set('max_budget', str(form.max_budget.data),
-                'Maximum budget for team creation',
-                'league', current_user.id)
-            Settings.set('allow_public_leagues', str(form.allow_public_leagues.data),
-                'Allow creation of public leagues',
-                'league', current_user.id)
+            Settings.set_many({
+                'max_leagues_per_user': (str(form.max_leagues_per_user.data),
+                    'Maximum number of leagues a user can join'),
+                'max_teams_per_league': (str(form.max_teams_per_league.data),
+                    'Maximum number of teams allowed in a league'),
+                'min_teams_per_league': (str(form.min_teams_per_league.data),
+                    'Minimum number of teams required in a league'),
+                'max_budget': (str(form.max_budget.data),
+                    'Maximum budget for team creation'),
+                'allow_public_leagues': (str(form.allow_public_leagues.data),
+                    'Allow creation of public leagues'),
+            }, 'league', current_user.id)
         
         flash('Settings updated successfully.', 'success')
         return redirect(url_for('admin.settings', category=category))
@@ -124,7 +123,8 @@ def settings():
     return render_template('admin/settings.html', 
                          form=form, 
                          category=category,
-                         smtp_info=smtp_info)
+                         smtp_info=smtp_info,
+                         audits=SettingsAudit.recent(5, category))
 
 @bp.route('/users')
 @login_required
@@ -245,4 +245,61 @@ def delete_user(user_id):
     db.session.delete(user)
     db.session.commit()
     flash('User deleted successfully.', 'success')
-    return redirect(url_for('admin.users')) 
\ No newline at end of file
+    return redirect(url_for('admin.users')) 
+
+class ImportJobForm(FlaskForm):
+    """Form for queueing a background F1 data import."""
+    kind = SelectField('Import', choices=list(ImportJob.KINDS.items()))
+    start_season = IntegerField('From season', validators=[DataRequired(), NumberRange(min=1950, max=2100)])
+    end_season = IntegerField('To season', validators=[Optional(), NumberRange(min=1950, max=2100)])
+    sync = BooleanField('Only write changed rounds and drivers', default=True)
+
+@bp.route('/imports', methods=['GET', 'POST'])
+@login_required
+@roles_required('admin')
+def imports():
+    """Queue F1 data imports and follow their progress."""
+    form = ImportJobForm()
+    if request.method == 'GET':
+        form.start_season.data = form.end_season.data = datetime.utcnow().year
+    
+    if form.validate_on_submit():
+        end_season = form.end_season.data or form.start_season.data
+        if end_season < form.start_season.data:
+            flash('The last season must not be before the first.', 'danger')
+            return redirect(url_for('admin.imports'))
+        if form.kind.data == 'results':
+            # One job per season, queued oldest first so standings are applied in order
+            jobs = [enqueue_results(season, user_id=current_user.id)
+                    for season in range(form.start_season.data, end_season + 1)]
+        else:
+            jobs = [enqueue_seasons(form.start_season.data, end_season, sync=form.sync.data,
+                                    user_id=current_user.id)]
+        if len(jobs) == 1:
+            flash(f'Import job #{jobs[0].id} queued; the import worker will pick it up shortly.', 'success')
+        else:
+            queued = ', '.join(f'#{job.id}' for job in jobs)
+            flash(f'Import jobs {queued} queued; the import worker will run them in order.', 'success')
+        return redirect(url_for('admin.imports'))
+    
+    return render_template('admin/imports.html', form=form, jobs=ImportJob.recent(20))
+
+@bp.route('/imports/status')
+@login_required
+@roles_required('admin')
+def import_status():
+    """JSON status of recent import jobs, polled by the admin panel."""
+    limit = request.args.get('limit', 20, type=int)
+    jobs = ImportJob.recent(max(1, min(limit, MAX_STATUS_JOBS)))
+    return jsonify({
+        'active': any(job.is_active for job in jobs),
+        'jobs': [job.to_dict() for job in jobs]
+    })
+
+
+@bp.route('/cache/stats')
+@login_required
+@roles_required('admin')
+def cache_stats():
+    """JSON hit/miss counts of the cache in the worker serving this request."""
+    return jsonify(cache.stats())
@@ -0,0 +1,248 @@
+from flask import Blueprint, Response, render_template, redirect, url_for, flash, abort, jsonify, request
+from flask_login import login_required, current_user
+from f1_fantasy.models import db, League, Team, Driver, DraftRanking
+from f1_fantasy.forms.draft import DraftStartForm, DraftPickForm, NominateForm, BidForm, DraftRankingForm
+from ..utils.draft import DraftError, get_state, start_draft, make_pick
+from ..utils.auction import open_lot, nominating_team, max_bid, nominate as nominate_driver, place_bid, \
+    close_expired_lots
+from ..utils.autodraft import pick_deadline, run_due_autopicks
+from ..utils import draft_events
+
+bp = Blueprint('draft', __name__, url_prefix='/draft')
+
+def get_league(league_id):
+    """Get a league the current user may follow the draft of."""
+    league = League.query.get_or_404(league_id)
+    if not league.is_public and current_user not in league.members:
+        abort(403)
+    return league
+
+def ranking_form(team, season):
+    """A team's ranking form, filled in with the driver numbers of its saved ranking."""
+    form = DraftRankingForm()
+    ranking = team.draft_ranking
+    if ranking and not form.is_submitted():
+        numbers = dict(db.session.query(Driver.id, Driver.driver_number).filter(Driver.season == season))
+        form.ranking.data = ', '.join(str(numbers[driver_id]) for driver_id in ranking.driver_ids
+                                      if driver_id in numbers)
+        form.autodraft.data = ranking.autodraft
+    return form
+
+def draft_season(league):
+    if league.draft:
+        return league.draft.season
+    return db.session.query(db.func.max(Driver.season)).scalar()
+
+@bp.route('/<int:league_id>')
+@login_required
+def room(league_id):
+    """The draft room: pick order, available drivers and every roster."""
+    league = get_league(league_id)
+    draft = league.draft
+    teams = {team.id: team for team in league.teams}
+    my_team = next((team for team in teams.values() if team.owner_id == current_user.id), None)
+    
+    rankings = ranking_form(my_team, draft_season(league)) if my_team else None
+    if draft is None:
+        return render_template('draft/room.html', league=league, draft=None, state=None, teams=teams,
+                             my_team=my_team, start_form=DraftStartForm(), ranking_form=rankings)
+    
+    auction = {}
+    if draft.draft_type == 'auction':
+        close_expired_lots(draft)
+    else:
+        run_due_autopicks(draft)
+    state = get_state(draft)
+    drivers = {driver.id: driver for driver in Driver.query.filter_by(season=draft.season)}
+    form = NominateForm() if draft.draft_type == 'auction' else DraftPickForm()
+    form.driver_id.choices = sorted(
+        ((driver_id, f'#{drivers[driver_id].driver_number} {drivers[driver_id].full_name} '
+                     f'({drivers[driver_id].constructor})') for driver_id in state.available_driver_ids()),
+        key=lambda choice: choice[1])
+    
+    if draft.draft_type == 'auction':
+        lot = open_lot(draft)
+        auction = {
+            'lot': lot,
+            'nominating_team': nominating_team(draft, state),
+            'max_bid': max_bid(draft, state, my_team) if my_team else 0,
+            'bid_form': BidForm(lot_id=lot.id, amount=lot.high_bid + 1) if lot else None
+        }
+    
+    return render_template('draft/room.html',
+                         league=league,
+                         draft=draft,
+                         state=state,
+                         teams=teams,
+                         drivers=drivers,
+                         my_team=my_team,
+                         form=form,
+                         auction=auction,
+                         deadline=pick_deadline(draft) if not state.is_complete else None,
+                         ranking_form=rankings)
+
+@bp.route('/<int:league_id>/start', methods=['POST'])
+@login_required
+def start(league_id):
+    """Start the draft (owner or commissioner)."""
+    league = get_league(league_id)
+    if not league.can_manage(current_user):
+        abort(403)
+    
+    form = DraftStartForm()
+    if form.validate_on_submit():
+        try:
+            start_draft(league, rounds=form.rounds.data, budget=form.budget.data,
+                        pick_seconds=form.pick_seconds.data)
+            flash('The draft has started!', 'success')
+        except DraftError as e:
+            flash(str(e), 'error')
+    return redirect(url_for('draft.room', league_id=league.id))
+
+@bp.route('/<int:league_id>/pick', methods=['POST'])
+@login_required
+def pick(league_id):
+    """Draft a driver for the team on the clock."""
+    league = get_league(league_id)
+    draft = league.draft
+    if draft is None:
+        abort(404)
+    
+    state = get_state(draft)
+    team = Team.query.get(state.on_clock) if state.on_clock else None
+    # The team's owner picks; a commissioner can pick on their behalf
+    if team is None or (team.owner_id != current_user.id and not league.can_manage(current_user)):
+        flash('It is not your turn to pick.', 'error')
+        return redirect(url_for('draft.room', league_id=league.id))
+    
+    form = DraftPickForm()
+    form.driver_id.choices = [(driver_id, '') for driver_id in state.available_driver_ids()]
+    if form.validate_on_submit():
+        try:
+            make_pick(draft, team.id, form.driver_id.data, user_id=current_user.id)
+            draft_events.notify(league.id)
+        except DraftError as e:
+            flash(str(e), 'error')
+    else:
+        flash('That driver is no longer available.', 'error')
+    return redirect(url_for('draft.room', league_id=league.id))
+
+@bp.route('/<int:league_id>/ranking', methods=['POST'])
+@login_required
+def ranking(league_id):
+    """Save the current user's personal driver ranking for autodraft."""
+    league = get_league(league_id)
+    team = Team.query.filter_by(league_id=league.id, owner_id=current_user.id).first()
+    if team is None:
+        abort(403)
+    
+    form = ranking_form(team, draft_season(league))
+    if form.validate_on_submit():
+        drivers = dict(db.session.query(Driver.driver_number, Driver.id)
+                       .filter(Driver.season == draft_season(league)))
+        numbers = [value.strip() for value in (form.ranking.data or '').split(',') if value.strip()]
+        unknown = [number for number in numbers if not number.isdigit() or int(number) not in drivers]
+        if unknown:
+            flash(f'Unknown driver number(s): {", ".join(unknown)}', 'error')
+            return redirect(url_for('draft.room', league_id=league.id))
+        
+        ranking = team.draft_ranking or DraftRanking(team_id=team.id)
+        # Keep the first mention of a driver listed twice
+        ranking.driver_ids = list(dict.fromkeys(drivers[int(number)] for number in numbers))
+        ranking.autodraft = form.autodraft.data
+        db.session.add(ranking)
+        db.session.commit()
+        flash('Your ranking has been saved.', 'success')
+    return redirect(url_for('draft.room', league_id=league.id))
+
+@bp.route('/<int:league_id>/nominate', methods=['POST'])
+@login_required
+def nominate(league_id):
+    """Put a driver up for auction with an opening bid."""
+    league = get_league(league_id)
+    draft = league.draft
+    if draft is None or draft.draft_type != 'auction':
+        abort(404)
+    
+    state = get_state(draft)
+    team = Team.query.get(nominating_team(draft, state) or 0)
+    if team is None or (team.owner_id != current_user.id and not league.can_manage(current_user)):
+        flash('It is not your turn to nominate.', 'error')
+        return redirect(url_for('draft.room', league_id=league.id))
+    
+    form = NominateForm()
+    form.driver_id.choices = [(driver_id, '') for driver_id in state.available_driver_ids()]
+    if form.validate_on_submit():
+        try:
+            nominate_driver(draft, team.id, form.driver_id.data, form.amount.data, user_id=current_user.id)
+            draft_events.notify(league.id)
+        except DraftError as e:
+            flash(str(e), 'error')
+    else:
+        flash('That driver is no longer available.', 'error')
+    return redirect(url_for('draft.room', league_id=league.id))
+
+@bp.route('/<int:league_id>/bid', methods=['POST'])
+@login_required
+def bid(league_id):
+    """Bid on the open lot for the current user's team."""
+    league = get_league(league_id)
+    draft = league.draft
+    if draft is None or draft.draft_type != 'auction':
+        abort(404)
+    team = Team.query.filter_by(league_id=league.id, owner_id=current_user.id).first()
+    if team is None:
+        abort(403)
+    
+    form = BidForm()
+    if form.validate_on_submit():
+        try:
+            place_bid(int(form.lot_id.data), team.id, form.amount.data, user_id=current_user.id)
+            draft_events.notify(league.id)
+        except DraftError as e:
+            flash(str(e), 'error')
+    return redirect(url_for('draft.room', league_id=league.id))
+
+@bp.route('/<int:league_id>/state')
+@login_required
+def state(league_id):
+    """JSON snapshot of the draft, for clients following along."""
+    league = get_league(league_id)
+    draft = league.draft
+    if draft is None:
+        abort(404)
+    if draft.draft_type != 'auction':
+        return jsonify(get_state(draft).to_dict())
+    
+    close_expired_lots(draft)
+    lot = open_lot(draft)
+    return jsonify(dict(get_state(draft).to_dict(),
+                        lot=lot.to_dict() if lot else None,
+                        budgets={str(team.id): team.budget for team in league.teams}))
+
+@bp.route('/<int:league_id>/events')
+@login_required
+def events(league_id):
+    """Server-sent event stream of picks; resumes after the Last-Event-ID header."""
+    league = get_league(league_id)
+    if league.draft is None:
+        abort(404)
+    # A reconnecting EventSource sends Last-Event-ID; the first connection passes ?after=
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is None:
+        last_event_id = request.args.get('after', 0, type=int)
+    return Response(draft_events.stream(draft_events.publisher(league.id), last_event_id),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/<int:league_id>/events/poll')
+@login_required
+def poll(league_id):
+    """Long-poll fallback for clients without EventSource: picks after ``after``."""
+    league = get_league(league_id)
+    if league.draft is None:
+        abort(404)
+    after = request.args.get('after', 0, type=int)
+    timeout = min(request.args.get('timeout', 25, type=float), 25)
+    lot_serial = request.args.get('lot_serial', 0, type=int)
+    return jsonify(draft_events.long_poll(league.id, after, timeout, lot_serial))
@@ -2,15 +2,32 @@ from datetime import datetime
 from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, current_app
 from flask_login import login_required, current_user
 from flask_security import roles_required
-from f1_fantasy.models import db, League, User, Team, LeagueMember
+from f1_fantasy.models import db, League, User, Team, LeagueMember, TeamStanding, LeagueOdds, ScoringRule
 from f1_fantasy.forms.league import LeagueForm, LeagueInviteForm
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+from markupsafe import Markup
 from ..utils.tokens import generate_invite_token
 from ..utils.email import send_invite_email
+from ..utils.scoring import parse_position_points, rules_fingerprint
+from ..utils.rescoring import rescore_league
+from ..utils.conditional import conditional_response
+from ..extensions import cache
 
 bp = Blueprint('league', __name__, url_prefix='/league')
 
+def apply_scoring_rule(league, form):
+    """Create or update a league's custom scoring rule from the form."""
+    if league.point_system != 'custom':
+        return
+    rule = league.scoring_rule or ScoringRule(league=league)
+    rule.position_points = ','.join(str(p) for p in parse_position_points(form.position_points.data))
+    rule.fastest_lap_bonus = form.fastest_lap_bonus.data or 0
+    rule.positions_gained_bonus = form.positions_gained_bonus.data or 0
+    rule.dnf_penalty = form.dnf_penalty.data or 0
+    db.session.add(rule)
+
 @bp.route('/')
 @login_required
 def index():
@@ -56,6 +73,7 @@ def create():
                 commissioner_id=current_user.id
             )
             db.session.add(league)
+            apply_scoring_rule(league, form)
             db.session.flush()  # flush so that league.id is available
             league_member = LeagueMember(league_id=league.id, user_id=current_user.id, role='commissioner',
                                         can_edit_name=True, can_edit_description=True, can_edit_is_public=True,
@@ -70,6 +88,23 @@ def create():
     
     return render_template('league/form.html', form=form, title='Create League')
 
+def league_members(league):
+    """Users of a league's member links, in one query."""
+    return (User.query.join(LeagueMember, LeagueMember.user_id == User.id)
+            .filter(LeagueMember.league_id == league.id).all())
+
+def league_fragment(league, name, context=None, cached=True):
+    """Render ``league/_<name>.html``, cached until the league changes (see League.touch).
+
+    ``context`` builds the template's variables and only runs on a miss.
+    """
+    def render():
+        return render_template(f'league/_{name}.html', league=league, **(context() if context else {}))
+    if not cached:
+        return Markup(render())
+    return Markup(cache.get_or_set(f'league:{league.id}:{league.version}:{name}', render,
+                                   function=f'league.{name}'))
+
 @bp.route('/<int:league_id>')
 @login_required
 def view(league_id):
@@ -78,17 +113,54 @@ def view(league_id):
     if not league.is_public and current_user not in league.members:
         abort(403)
     
-    teams = league.teams.all()
-    members = [link.user for link in league.member_links]
-    is_commissioner = league.is_commissioner(current_user)
-    is_owner = league.is_owner(current_user)
+    def render():
+        fragments = {
+            'header': league_fragment(league, 'header'),
+            # Managers' member list has per-user actions and CSRF tokens, so only viewers' is shared
+            'members': league_fragment(league, 'members', lambda: {'members': league_members(league)},
+                                       cached=not league.can_manage(current_user)),
+            # Odds are precomputed by the simulate-odds command; never simulate here
+            'teams': league_fragment(league, 'teams', lambda: {
+                'teams': league.teams.options(joinedload(Team.owner)).all(),
+                'odds': LeagueOdds.for_league(league.id)
+            })
+        }
+        return render_template('league/view.html',
+                             league=league,
+                             fragments=fragments,
+                             is_commissioner=league.is_commissioner(current_user),
+                             is_owner=league.is_owner(current_user))
+    
+    return conditional_response(render, league.version, last_modified=league.updated_at)
+
+@bp.route('/<int:league_id>/standings')
+@login_required
+def standings(league_id):
+    """View league standings, optionally as of a given round."""
+    league = League.query.get_or_404(league_id)
+    if not league.is_public and current_user not in league.members:
+        abort(403)
+    
+    def render():
+        season = request.args.get('season', type=int)
+        round = request.args.get('round', type=int)
+        rows = TeamStanding.for_league(league.id, season=season, round=round)
+        if rows:
+            season = rows[0].season
+            rounds = TeamStanding.rounds_for_league(league.id, season)
+        else:
+            rows = TeamStanding.provisional(league.id)
+            rounds = []
+        
+        return render_template('league/standings.html',
+                             league=league,
+                             standings=rows,
+                             season=season,
+                             rounds=rounds,
+                             current_round=rows[0].round if rounds else None)
     
-    return render_template('league/view.html',
-                         league=league,
-                         teams=teams,
-                         members=members,
-                         is_commissioner=is_commissioner,
-                         is_owner=is_owner)
+    # Standings rows bump League.version when written, as do team points
+    return conditional_response(render, league.version, last_modified=league.updated_at)
 
 @bp.route('/<int:league_id>/edit', methods=['GET', 'POST'])
 @login_required
@@ -101,7 +173,13 @@ def edit(league_id):
     can_edit = lambda field: is_owner or (is_commissioner and getattr(league_member, f'can_edit_{field}', False))
 
     form = LeagueForm(obj=league)
+    if not form.is_submitted() and league.scoring_rule:
+        form.position_points.data = league.scoring_rule.position_points
+        form.fastest_lap_bonus.data = league.scoring_rule.fastest_lap_bonus
+        form.positions_gained_bonus.data = league.scoring_rule.positions_gained_bonus
+        form.dnf_penalty.data = league.scoring_rule.dnf_penalty
     if form.validate_on_submit():
+        fingerprint = rules_fingerprint(league.compiled_scoring())
         try:
             if can_edit('name'):
                 league.name = form.name.data
@@ -115,7 +193,13 @@ def edit(league_id):
                 league.draft_type = form.draft_type.data
             if can_edit('point_system'):
                 league.point_system = form.point_system.data
+                apply_scoring_rule(league, form)
             db.session.commit()
+            if rules_fingerprint(league.compiled_scoring()) != fingerprint:
+                # Scoring changed mid-season: recompute points for past races
+                stats = rescore_league(league)
+                if stats['races']:
+                    flash(f'Rescored {stats["races"]} past race(s) with the new point system.', 'info')
             flash('League settings updated successfully!', 'success')
             return redirect(url_for('league.view', league_id=league.id))
         except IntegrityError:
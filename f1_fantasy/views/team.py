@@ -1,7 +1,8 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
 from flask_login import login_required, current_user
-from f1_fantasy.models import db, Team, League
+from f1_fantasy.models import db, Team, League, TeamStanding
 from f1_fantasy.forms.team import TeamForm
+from f1_fantasy.utils.conditional import conditional_response
 
 bp = Blueprint('team', __name__, url_prefix='/team')
 
@@ -51,7 +52,11 @@ def view(team_id):
     if not team.league.is_public and current_user not in team.league.members:
         abort(403)
     
-    # Get sorted teams for the standings table
-    sorted_teams = sorted(team.league.teams.all(), key=lambda t: t.points, reverse=True)
+    def render():
+        # Latest standings snapshot; fall back to Team.points before any race is applied
+        standings = TeamStanding.for_league(team.league_id) or TeamStanding.provisional(team.league_id)
+        return render_template('team/view.html', team=team, standings=standings)
     
-    return render_template('team/view.html', team=team, sorted_teams=sorted_teams) 
\ No newline at end of file
+    # Changes to the team, and to the standings it shows, bump its league's version
+    league = team.league
+    return conditional_response(render, league.version, last_modified=league.updated_at)
\ No newline at end of file
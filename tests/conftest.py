@@ -0,0 +1,60 @@
+"""Shared fixtures: a minimal app around the blueprints under test and an SQLite database."""
+import secrets
+from datetime import date
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+from f1_fantasy.models import db, User, League, Team, Driver
+from f1_fantasy.utils import draft, draft_events
+
+
+@pytest.fixture
+def app(tmp_path):
+    # Publisher threads use their own connections, so the database must be a file
+    app = Flask('f1_fantasy')
+    app.config.update(SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "test.db"}', SECRET_KEY='test',
+                      TESTING=True, WTF_CSRF_ENABLED=False, DRAFT_EVENTS_POLL_INTERVAL=0.05)
+    db.init_app(app)
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda fs_uniquifier: User.query.filter_by(fs_uniquifier=fs_uniquifier).first())
+    from f1_fantasy.views.draft import bp as draft_bp
+    app.register_blueprint(draft_bp)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+    # Worker-wide caches are keyed by id, which the next test's database reuses
+    draft._states.clear()
+    draft_events._publishers.clear()
+
+
+@pytest.fixture
+def user(app):
+    user = User(username='manager', email='manager@example.com', password='x',
+                fs_uniquifier=secrets.token_hex(16))
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = user.fs_uniquifier
+        session['_fresh'] = True
+    return client
+
+
+@pytest.fixture
+def league(user):
+    """A public league with three teams and six drivers for the season."""
+    league = League(name='Test League', owner_id=user.id, commissioner_id=user.id, is_public=True)
+    db.session.add(league)
+    db.session.flush()
+    db.session.add_all([Team(name=f'Team {i}', owner_id=user.id, league_id=league.id) for i in range(3)])
+    db.session.add_all([Driver(season=date.today().year, driver_number=number, first_name='Driver',
+                               last_name=str(number), nationality='GBR', constructor='Team')
+                        for number in range(1, 7)])
+    db.session.commit()
+    return league
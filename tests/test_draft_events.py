@@ -0,0 +1,34 @@
+"""Live draft event stream."""
+import json
+from f1_fantasy.utils.draft import start_draft, make_pick, get_state
+
+
+def complete_draft(league):
+    draft = start_draft(league, rounds=2, seed=1)
+    while not get_state(draft).is_complete:
+        state = get_state(draft)
+        make_pick(draft, state.on_clock, state.available_driver_ids()[0])
+    return draft
+
+
+def pick_ids(response):
+    return [json.loads(line[len('data: '):])['id']
+            for line in response.get_data(as_text=True).splitlines() if line.startswith('data: ')]
+
+
+def test_events_resume_after_query_arg(client, league):
+    complete_draft(league)
+    response = client.get(f'/draft/{league.id}/events?after=4')
+    assert response.status_code == 200
+    assert pick_ids(response) == [5, 6]
+
+
+def test_events_last_event_id_header_wins(client, league):
+    complete_draft(league)
+    response = client.get(f'/draft/{league.id}/events?after=1', headers={'Last-Event-ID': '5'})
+    assert pick_ids(response) == [6]
+
+
+def test_events_from_start(client, league):
+    complete_draft(league)
+    assert pick_ids(client.get(f'/draft/{league.id}/events')) == [1, 2, 3, 4, 5, 6]